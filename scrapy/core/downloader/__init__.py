@@ -4,12 +4,15 @@ import random
 import warnings
 from collections import deque
 from datetime import datetime
+from heapq import heappop, heappush
+from itertools import count
 from time import time
 from typing import TYPE_CHECKING, Any, cast
 
-from twisted.internet.defer import Deferred, inlineCallbacks
+from twisted.internet.defer import CancelledError, Deferred, inlineCallbacks
 
 from scrapy import Request, Spider, signals
+from scrapy.core.downloader.bandwidth import BandwidthLimiter
 from scrapy.core.downloader.handlers import DownloadHandlers
 from scrapy.core.downloader.middleware import DownloaderMiddlewareManager
 from scrapy.exceptions import ScrapyDeprecationWarning
@@ -36,6 +39,8 @@ if TYPE_CHECKING:
     from scrapy.http import Response
     from scrapy.settings import BaseSettings
     from scrapy.signalmanager import SignalManager
+    from scrapy.statscollectors import StatsCollector
+    from scrapy.utils.request import RequestFingerprinterProtocol
 
 
 class Slot:
@@ -46,16 +51,24 @@ class Slot:
         concurrency: int,
         delay: float,
         randomize_delay: bool,
+        *,
+        rate: float = 0,
+        burst: int = 1,
     ):
         self.concurrency: int = concurrency
         self.delay: float = delay
         self.randomize_delay: bool = randomize_delay
+        self.rate: float = rate
+        self.burst: int = burst
 
         self.active: set[Request] = set()
         self.queue: deque[tuple[Request, Deferred[Response]]] = deque()
         self.transferring: set[Request] = set()
         self.lastseen: float = 0
         self.latercall: CallLaterResult | None = None
+        self.tokens: float = burst
+        self.tokens_updated: float = 0
+        self.waiting_tokens: bool = False
 
     def free_transfer_slots(self) -> int:
         return self.concurrency - len(self.transferring)
@@ -65,6 +78,32 @@ class Slot:
             return random.uniform(0.5 * self.delay, 1.5 * self.delay)  # noqa: S311
         return self.delay
 
+    def take_token(
+        self, now: float, rate: float | None = None, burst: int | None = None
+    ) -> float:
+        """Take a token from the token bucket of the slot.
+
+        Return ``0`` if a token was taken, or the number of seconds until the
+        next token becomes available otherwise. Slots without a rate limit
+        always have tokens available.
+
+        *rate* and *burst*, if not ``None``, are used instead of those of the
+        slot, for a request that overrides them.
+        """
+        if rate is None:
+            rate = self.rate
+        if burst is None:
+            burst = self.burst
+        if rate <= 0:
+            return 0
+        elapsed = max(0, now - self.tokens_updated)
+        self.tokens = min(burst, self.tokens + elapsed * rate)
+        self.tokens_updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / rate
+
     def close(self) -> None:
         if self.latercall:
             self.latercall.cancel()
@@ -107,6 +146,7 @@ class Downloader:
     def __init__(self, crawler: Crawler):
         self.settings: BaseSettings = crawler.settings
         self.signals: SignalManager = crawler.signals
+        self.stats: StatsCollector | None = crawler.stats
         self.slots: dict[str, Slot] = {}
         self.active: set[Request] = set()
         self.handlers: DownloadHandlers = DownloadHandlers(crawler)
@@ -116,6 +156,8 @@ class Downloader:
         )
         self.ip_concurrency: int = self.settings.getint("CONCURRENT_REQUESTS_PER_IP")
         self.randomize_delay: bool = self.settings.getbool("RANDOMIZE_DOWNLOAD_DELAY")
+        self.rate: float = self.settings.getfloat("DOWNLOAD_RATE")
+        self.burst: int = self.settings.getint("DOWNLOAD_BURST")
         self.middleware: DownloaderMiddlewareManager = (
             DownloaderMiddlewareManager.from_crawler(crawler)
         )
@@ -126,6 +168,36 @@ class Downloader:
         self.per_slot_settings: dict[str, dict[str, Any]] = self.settings.getdict(
             "DOWNLOAD_SLOTS"
         )
+        self.bandwidth: BandwidthLimiter | None = self._build_bandwidth_limiter()
+        # Slots waiting for tokens, as a heap of (wake-up time, sequence
+        # number, slot, spider) tuples, all served by a single delayed call.
+        self._token_waits: list[tuple[float, int, Slot, Spider]] = []
+        self._token_seq = count()
+        self._token_call: CallLaterResult | None = None
+        self._token_call_time: float = 0
+        self.coalesce_requests: bool = self.settings.getbool(
+            "DOWNLOADER_COALESCE_REQUESTS"
+        )
+        self._fingerprinter: RequestFingerprinterProtocol | None = (
+            crawler.request_fingerprinter
+        )
+        # Coalescing keys of the requests being downloaded, mapped to the
+        # deferreds of the identical requests waiting for their response.
+        self._in_flight: dict[tuple[Any, ...], list[Deferred[Response | None]]] = {}
+
+    def _build_bandwidth_limiter(self) -> BandwidthLimiter | None:
+        limit = self.settings.getfloat("DOWNLOAD_BANDWIDTH_LIMIT")
+        slot_limit = self.settings.getfloat("DOWNLOAD_SLOT_BANDWIDTH_LIMIT")
+        slot_limits = {
+            key: float(slot_settings["bandwidth_limit"])
+            for key, slot_settings in self.per_slot_settings.items()
+            if "bandwidth_limit" in slot_settings
+        }
+        if limit <= 0 and slot_limit <= 0 and not slot_limits:
+            return None
+        return BandwidthLimiter(
+            limit, slot_limit, slot_limits=slot_limits, stats=self.stats
+        )
 
     @inlineCallbacks
     def fetch(
@@ -155,7 +227,13 @@ class Downloader:
                 slot_settings.get("delay", delay),
             )
             randomize_delay = slot_settings.get("randomize_delay", self.randomize_delay)
-            new_slot = Slot(conc, delay, randomize_delay)
+            new_slot = Slot(
+                conc,
+                delay,
+                randomize_delay,
+                rate=slot_settings.get("rate", self.rate),
+                burst=slot_settings.get("burst", self.burst),
+            )
             self.slots[key] = new_slot
 
         return key, self.slots[key]
@@ -188,13 +266,88 @@ class Downloader:
         self.signals.send_catch_log(
             signal=signals.request_reached_downloader, request=request, spider=spider
         )
+        try:
+            if self.coalesce_requests:
+                return (yield self._download_coalesced(slot, request, spider))
+            return (yield self._enqueue_in_slot(slot, request, spider))
+        finally:
+            slot.active.remove(request)
+
+    @inlineCallbacks
+    def _enqueue_in_slot(
+        self, slot: Slot, request: Request, spider: Spider
+    ) -> Generator[Deferred[Any], Any, Response]:
         d: Deferred[Response] = Deferred()
         slot.queue.append((request, d))
         self._process_queue(spider, slot)
         try:
             return (yield d)
-        finally:
-            slot.active.remove(request)
+        except CancelledError:
+            if (request, d) in slot.queue:
+                # Cancelled before its download started, so _download() will
+                # not send request_left_downloader.
+                slot.queue.remove((request, d))
+                self.signals.send_catch_log(
+                    signal=signals.request_left_downloader,
+                    request=request,
+                    spider=spider,
+                )
+            raise
+
+    @staticmethod
+    def _get_coalescing_key(
+        request: Request, fingerprinter: RequestFingerprinterProtocol
+    ) -> tuple[Any, ...]:
+        # Downloader middlewares have already set the headers (e.g. Cookie,
+        # Authorization, Proxy-Authorization) and the proxy of the request.
+        return (
+            fingerprinter.fingerprint(request),
+            tuple(
+                sorted(
+                    (name, tuple(values)) for name, values in request.headers.items()
+                )
+            ),
+            request.meta.get("proxy"),
+            request.meta.get("bindaddress"),
+        )
+
+    @inlineCallbacks
+    def _download_coalesced(
+        self, slot: Slot, request: Request, spider: Spider
+    ) -> Generator[Deferred[Any], Any, Response]:
+        assert self._fingerprinter
+        key = self._get_coalescing_key(request, self._fingerprinter)
+        waiters = self._in_flight.get(key)
+        if waiters is None:
+            waiters = self._in_flight[key] = []
+            response = None
+            try:
+                response = yield self._enqueue_in_slot(slot, request, spider)
+                return response
+            finally:
+                del self._in_flight[key]
+                for waiter in waiters:
+                    waiter.callback(response)
+
+        d: Deferred[Response | None] = Deferred()
+        waiters.append(d)
+        try:
+            response = yield d
+        except CancelledError:
+            waiters.remove(d)
+            self.signals.send_catch_log(
+                signal=signals.request_left_downloader, request=request, spider=spider
+            )
+            raise
+        if response is None:
+            # The download failed, so download this request separately.
+            return (yield self._download_coalesced(slot, request, spider))
+        if self.stats:
+            self.stats.inc_value("downloader/coalesced_request_count")
+        self.signals.send_catch_log(
+            signal=signals.request_left_downloader, request=request, spider=spider
+        )
+        return response.replace(request=request)
 
     def _process_queue(self, spider: Spider, slot: Slot) -> None:
         if slot.latercall:
@@ -212,6 +365,16 @@ class Downloader:
 
         # Process enqueued requests if there are free slots to transfer for this slot
         while slot.queue and slot.free_transfer_slots() > 0:
+            meta = slot.queue[0][0].meta
+            rate, burst = meta.get("download_rate"), meta.get("download_burst")
+            wait = slot.take_token(
+                now,
+                rate=None if rate is None else float(rate),
+                burst=None if burst is None else int(burst),
+            )
+            if wait:
+                self._wait_for_tokens(spider, slot, now + wait)
+                break
             slot.lastseen = now
             request, deferred = slot.queue.popleft()
             dfd = deferred_from_coro(self._download(slot, request, spider))
@@ -225,6 +388,30 @@ class Downloader:
         slot.latercall = None
         self._process_queue(spider, slot)
 
+    def _wait_for_tokens(self, spider: Spider, slot: Slot, when: float) -> None:
+        if slot.waiting_tokens:
+            return
+        slot.waiting_tokens = True
+        heappush(self._token_waits, (when, next(self._token_seq), slot, spider))
+        if self._token_call is None or when < self._token_call_time:
+            self._schedule_token_call(when)
+
+    def _schedule_token_call(self, when: float) -> None:
+        if self._token_call:
+            self._token_call.cancel()
+        self._token_call_time = when
+        self._token_call = call_later(max(0, when - time()), self._process_token_waits)
+
+    def _process_token_waits(self) -> None:
+        self._token_call = None
+        now = time()
+        while self._token_waits and self._token_waits[0][0] <= now:
+            _, _, slot, spider = heappop(self._token_waits)
+            slot.waiting_tokens = False
+            self._process_queue(spider, slot)
+        if self._token_waits and self._token_call is None:
+            self._schedule_token_call(self._token_waits[0][0])
+
     async def _download(self, slot: Slot, request: Request, spider: Spider) -> Response:
         # The order is very important for the following logic. Do not change!
         slot.transferring.add(request)
@@ -255,6 +442,10 @@ class Downloader:
 
     def close(self) -> None:
         self._slot_gc_loop.stop()
+        if self._token_call:
+            self._token_call.cancel()
+            self._token_call = None
+        self._token_waits.clear()
         for slot in self.slots.values():
             slot.close()
 
@@ -263,3 +454,5 @@ class Downloader:
         for key, slot in list(self.slots.items()):
             if not slot.active and slot.lastseen + slot.delay < mintime:
                 self.slots.pop(key).close()
+                if self.bandwidth:
+                    self.bandwidth.remove_slot(key)
@@ -0,0 +1,72 @@
+"""Response body buffering shared by the HTTP download handlers."""
+
+from __future__ import annotations
+
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from scrapy.utils._compression import _StreamDecompressor
+
+
+class ResponseBodyBuffer:
+    """Collects the chunks of a response body as they are received.
+
+    Chunks are kept as a list and joined only once, by :meth:`getvalue`. A
+    single chunk is returned as is, without a copy.
+
+    Once more than *spoolsize* bytes are received, the body is moved into a
+    temporary file, which :meth:`getvalue` reads back into memory. Spooling
+    therefore only limits memory usage while the body is being received.
+
+    If a *decompressor* is given, chunks are decompressed as they are
+    received, and only the decompressed body is kept. :attr:`size` is then
+    the decompressed size.
+    """
+
+    def __init__(
+        self, spoolsize: int = 0, decompressor: _StreamDecompressor | None = None
+    ):
+        self.spoolsize: int = spoolsize
+        self.decompressor: _StreamDecompressor | None = decompressor
+        self.size: int = 0
+        self._chunks: list[bytes] = []
+        self._file: IO[bytes] | None = None
+
+    @property
+    def spooled(self) -> bool:
+        return self._file is not None
+
+    def write(self, data: bytes) -> None:
+        if self.decompressor is not None:
+            data = self.decompressor.decompress(data)
+            if not data:
+                return
+        self.size += len(data)
+        if self._file is not None:
+            self._file.write(data)
+            return
+        self._chunks.append(data)
+        if self.spoolsize and self.size > self.spoolsize:
+            self._file = TemporaryFile()
+            self._file.writelines(self._chunks)
+            self._chunks = []
+
+    def getvalue(self) -> bytes:
+        if self._file is None:
+            if len(self._chunks) == 1:
+                return self._chunks[0]
+            return b"".join(self._chunks)
+        self._file.seek(0)
+        body = self._file.read()
+        self._file.close()
+        self._file = None
+        self._chunks = [body]
+        return body
+
+    def clear(self) -> None:
+        """Release the received data."""
+        self._chunks = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,102 @@
+"""Download bandwidth limits, enforced by the HTTP download handlers while
+they read response bodies."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from scrapy.crawler import Crawler
+    from scrapy.statscollectors import StatsCollector
+
+
+class _ByteBucket:
+    """Token bucket of bytes, refilled at *rate* bytes per second and holding
+    up to one second of traffic."""
+
+    def __init__(self, rate: float, now: float):
+        self.rate: float = rate
+        self.tokens: float = rate
+        self.updated: float = now
+
+    def consume(self, size: int, now: float) -> float:
+        if self.rate <= 0:
+            return 0
+        elapsed = max(0, now - self.updated)
+        self.tokens = min(self.rate, self.tokens + elapsed * self.rate)
+        self.updated = now
+        # The bytes have already been received, so the bucket can go into
+        # debt, which is paid back by waiting.
+        self.tokens -= size
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+
+class BandwidthLimiter:
+    """Limits the rate at which response bodies are downloaded, in bytes per
+    second, across all requests (*limit*) and per downloader slot
+    (*slot_limit*, overridden for specific slots by *slot_limits*). ``0``
+    disables a limit.
+
+    Download handlers call :meth:`consume` for every chunk of response body
+    they read, and stop reading the response for the returned number of
+    seconds.
+    """
+
+    def __init__(
+        self,
+        limit: float = 0,
+        slot_limit: float = 0,
+        *,
+        slot_limits: dict[str, float] | None = None,
+        stats: StatsCollector | None = None,
+    ):
+        self.limit: float = limit
+        self.slot_limit: float = slot_limit
+        self.slot_limits: dict[str, float] = slot_limits or {}
+        self.stats: StatsCollector | None = stats
+        self._bucket: _ByteBucket = _ByteBucket(limit, 0)
+        self._slot_buckets: dict[str, _ByteBucket] = {}
+        if self.stats:
+            self.stats.set_value("downloader/bandwidth/global/limit", limit)
+            self.stats.set_value("downloader/bandwidth/slot/limit", slot_limit)
+
+    def consume(self, slot: str | None, size: int, now: float) -> float:
+        """Take *size* bytes, received at *now* for a request of the *slot*
+        downloader slot, from the budgets.
+
+        Return ``0`` if the budgets allow reading more data right away, or the
+        number of seconds to wait before reading more data otherwise.
+        """
+        delay = self._bucket.consume(size, now)
+        if delay:
+            self._inc_stats("global", delay)
+        if slot is not None:
+            bucket = self._slot_buckets.get(slot)
+            if bucket is None:
+                rate = self.slot_limits.get(slot, self.slot_limit)
+                bucket = self._slot_buckets[slot] = _ByteBucket(rate, now)
+            slot_delay = bucket.consume(size, now)
+            if slot_delay:
+                self._inc_stats("slot", slot_delay)
+                delay = max(delay, slot_delay)
+        return delay
+
+    def remove_slot(self, slot: str) -> None:
+        """Forget the budget of a downloader slot that is no longer used."""
+        self._slot_buckets.pop(slot, None)
+
+    def _inc_stats(self, budget: str, delay: float) -> None:
+        if self.stats:
+            self.stats.inc_value(f"downloader/bandwidth/{budget}/pause_count")
+            self.stats.inc_value(
+                f"downloader/bandwidth/{budget}/pause_time_ms", round(delay * 1000)
+            )
+
+
+def _get_bandwidth_limiter(crawler: Crawler | None) -> BandwidthLimiter | None:
+    """Return the bandwidth limiter of the downloader of *crawler*, if any."""
+    if crawler is None or crawler.engine is None:
+        return None
+    return getattr(crawler.engine.downloader, "bandwidth", None)
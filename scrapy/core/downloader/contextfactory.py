@@ -19,6 +19,7 @@ from zope.interface.verify import verifyObject
 from scrapy.core.downloader.tls import (
     DEFAULT_CIPHERS,
     ScrapyClientTLSOptions,
+    TLSSessionCache,
     openssl_methods,
 )
 from scrapy.exceptions import ScrapyDeprecationWarning
@@ -53,6 +54,7 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
         tls_verbose_logging: bool = False,
         tls_ciphers: str | None = None,
         *args: Any,
+        tls_session_cache: bool = False,
         **kwargs: Any,
     ):
         super().__init__(*args, **kwargs)
@@ -63,6 +65,9 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
             self.tls_ciphers = AcceptableCiphers.fromOpenSSLCipherString(tls_ciphers)
         else:
             self.tls_ciphers = DEFAULT_CIPHERS
+        self.tls_session_cache: TLSSessionCache | None = (
+            TLSSessionCache() if tls_session_cache else None
+        )
         if method_is_overridden(type(self), ScrapyClientContextFactory, "getContext"):
             warnings.warn(
                 "Overriding ScrapyClientContextFactory.getContext() is deprecated and that method"
@@ -94,7 +99,10 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
         *args: Any,
         **kwargs: Any,
     ) -> Self:
-        return cls._from_settings(crawler.settings, method, *args, **kwargs)
+        context_factory = cls._from_settings(crawler.settings, method, *args, **kwargs)
+        if context_factory.tls_session_cache is not None:
+            context_factory.tls_session_cache.stats = crawler.stats
+        return context_factory
 
     @classmethod
     def _from_settings(
@@ -108,6 +116,8 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
             "DOWNLOADER_CLIENT_TLS_VERBOSE_LOGGING"
         )
         tls_ciphers: str | None = settings["DOWNLOADER_CLIENT_TLS_CIPHERS"]
+        if settings.getbool("DOWNLOADER_CLIENT_TLS_SESSION_CACHE"):
+            kwargs["tls_session_cache"] = True
         return cls(  # type: ignore[misc]
             method=method,
             tls_verbose_logging=tls_verbose_logging,
@@ -124,6 +134,7 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
             method=self._ssl_method,
             fixBrokenPeers=True,
             acceptableCiphers=self.tls_ciphers,
+            enableSessionTickets=self.tls_session_cache is not None,
         )
 
     # kept for old-style HTTP/1.0 downloader context twisted calls,
@@ -131,6 +142,10 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
     def getContext(self, hostname: Any = None, port: Any = None) -> SSL.Context:
         ctx: SSL.Context = self.getCertificateOptions().getContext()
         ctx.set_options(0x4)  # OP_LEGACY_SERVER_CONNECT
+        if self.tls_session_cache is not None:
+            # Twisted sets a random session ID context for each context,
+            # which prevents resuming sessions across contexts.
+            ctx.set_session_id(self.tls_session_cache.session_id_context)
         return ctx
 
     def creatorForNetloc(self, hostname: bytes, port: int) -> ClientTLSOptions:
@@ -138,6 +153,8 @@ class ScrapyClientContextFactory(BrowserLikePolicyForHTTPS):
             hostname.decode("ascii"),
             self.getContext(),
             verbose_logging=self.tls_verbose_logging,
+            session_cache=self.tls_session_cache,
+            port=port,
         )
 
 
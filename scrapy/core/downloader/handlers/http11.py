@@ -6,7 +6,6 @@ import ipaddress
 import logging
 import re
 from contextlib import suppress
-from io import BytesIO
 from time import time
 from typing import TYPE_CHECKING, Any, TypedDict, TypeVar, cast
 from urllib.parse import urldefrag, urlparse
@@ -31,23 +30,35 @@ from twisted.web.iweb import UNKNOWN_LENGTH, IBodyProducer, IPolicyForHTTPS, IRe
 from zope.interface import implementer
 
 from scrapy import Request, Spider, signals
+from scrapy.core.downloader._body import ResponseBodyBuffer
+from scrapy.core.downloader.bandwidth import _get_bandwidth_limiter
 from scrapy.core.downloader.contextfactory import load_context_factory_from_settings
+from scrapy.core.downloader.timings import _TimingEndpoint
 from scrapy.exceptions import StopDownload
 from scrapy.http import Headers, Response
 from scrapy.responsetypes import responsetypes
+from scrapy.utils._compression import (
+    _DECOMPRESSION_ERRORS,
+    _DecompressionMaxSizeExceeded,
+    _StreamDecompressor,
+)
+from scrapy.utils.asyncio import call_later
 from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.python import to_bytes, to_unicode
 from scrapy.utils.url import add_http_if_no_scheme
 
 if TYPE_CHECKING:
     from twisted.internet.base import ReactorBase
-    from twisted.internet.interfaces import IConsumer
+    from twisted.internet.interfaces import IConsumer, IStreamClientEndpoint
+    from twisted.web._newclient import HTTP11ClientProtocol
 
     # typing.NotRequired and typing.Self require Python 3.11
     from typing_extensions import NotRequired, Self
 
+    from scrapy.core.downloader.bandwidth import BandwidthLimiter
     from scrapy.crawler import Crawler
     from scrapy.settings import BaseSettings
+    from scrapy.utils.asyncio import CallLaterResult
 
 
 logger = logging.getLogger(__name__)
@@ -62,6 +73,7 @@ class _ResultT(TypedDict):
     certificate: ssl.Certificate | None
     ip_address: ipaddress.IPv4Address | ipaddress.IPv6Address | None
     failure: NotRequired[Failure | None]
+    decompressed: NotRequired[bool]
 
 
 class HTTP11DownloadHandler:
@@ -83,7 +95,12 @@ class HTTP11DownloadHandler:
         )
         self._default_maxsize: int = settings.getint("DOWNLOAD_MAXSIZE")
         self._default_warnsize: int = settings.getint("DOWNLOAD_WARNSIZE")
+        self._default_spoolsize: int = settings.getint("DOWNLOAD_SPOOLSIZE")
         self._fail_on_dataloss: bool = settings.getbool("DOWNLOAD_FAIL_ON_DATALOSS")
+        self._decompress: bool = settings.getbool(
+            "COMPRESSION_ENABLED"
+        ) and settings.getbool("COMPRESSION_STREAMING")
+        self._timings: bool = settings.getbool("DOWNLOAD_TIMINGS_ENABLED")
         self._disconnect_timeout: int = 1
 
     @classmethod
@@ -97,7 +114,10 @@ class HTTP11DownloadHandler:
             pool=self._pool,
             maxsize=getattr(spider, "download_maxsize", self._default_maxsize),
             warnsize=getattr(spider, "download_warnsize", self._default_warnsize),
+            spoolsize=self._default_spoolsize,
             fail_on_dataloss=self._fail_on_dataloss,
+            decompress=self._decompress,
+            timings=self._timings,
             crawler=self._crawler,
         )
         return agent.download_request(request)
@@ -346,6 +366,22 @@ class ScrapyProxyAgent(Agent):
         )
 
 
+class _TimingConnectionPool:
+    """Wraps the connection pool of an agent to record, in the
+    :reqmeta:`download_timings` of a request, the timings of the connection
+    opened for it, if any."""
+
+    def __init__(self, pool: HTTPConnectionPool, timings: dict[str, float]):
+        self._pool: HTTPConnectionPool = pool
+        self._timings: dict[str, float] = timings
+        self.persistent: bool = pool.persistent
+
+    def getConnection(
+        self, key: Any, endpoint: IStreamClientEndpoint
+    ) -> Deferred[HTTP11ClientProtocol]:
+        return self._pool.getConnection(key, _TimingEndpoint(endpoint, self._timings))
+
+
 class ScrapyAgent:
     _Agent = Agent
     _ProxyAgent = ScrapyProxyAgent
@@ -360,7 +396,10 @@ class ScrapyAgent:
         pool: HTTPConnectionPool | None = None,
         maxsize: int = 0,
         warnsize: int = 0,
+        spoolsize: int = 0,
         fail_on_dataloss: bool = True,
+        decompress: bool = False,
+        timings: bool = False,
         crawler: Crawler,
     ):
         self._contextFactory: IPolicyForHTTPS = contextFactory
@@ -369,7 +408,10 @@ class ScrapyAgent:
         self._pool: HTTPConnectionPool | None = pool
         self._maxsize: int = maxsize
         self._warnsize: int = warnsize
+        self._spoolsize: int = spoolsize
         self._fail_on_dataloss: bool = fail_on_dataloss
+        self._decompress: bool = decompress
+        self._timings: bool = timings
         self._txresponse: TxResponse | None = None
         self._crawler: Crawler = crawler
 
@@ -377,6 +419,12 @@ class ScrapyAgent:
         from twisted.internet import reactor
 
         bindaddress = request.meta.get("bindaddress") or self._bindAddress
+        pool = self._pool
+        if pool is not None and self._timings:
+            pool = cast(
+                HTTPConnectionPool,
+                _TimingConnectionPool(pool, request.meta["download_timings"]),
+            )
         proxy = request.meta.get("proxy")
         if proxy:
             proxy = add_http_if_no_scheme(proxy)
@@ -394,14 +442,14 @@ class ScrapyAgent:
                     contextFactory=self._contextFactory,
                     connectTimeout=timeout,
                     bindAddress=bindaddress,
-                    pool=self._pool,
+                    pool=pool,
                 )
             return self._ProxyAgent(
                 reactor=reactor,
                 proxyURI=to_bytes(proxy, encoding="ascii"),
                 connectTimeout=timeout,
                 bindAddress=bindaddress,
-                pool=self._pool,
+                pool=pool,
             )
 
         return self._Agent(
@@ -409,13 +457,15 @@ class ScrapyAgent:
             contextFactory=self._contextFactory,
             connectTimeout=timeout,
             bindAddress=bindaddress,
-            pool=self._pool,
+            pool=pool,
         )
 
     def download_request(self, request: Request) -> Deferred[Response]:
         from twisted.internet import reactor
 
         timeout = request.meta.get("download_timeout") or self._connectTimeout
+        if self._timings:
+            request.meta["download_timings"] = {"start": time()}
         agent = self._get_agent(request, timeout)
 
         # request details
@@ -454,7 +504,10 @@ class ScrapyAgent:
         raise TimeoutError(f"Getting {url} took longer than {timeout} seconds.")
 
     def _cb_latency(self, result: _T, request: Request, start_time: float) -> _T:
-        request.meta["download_latency"] = time() - start_time
+        now = time()
+        request.meta["download_latency"] = now - start_time
+        if self._timings:
+            request.meta["download_timings"]["headers"] = now
         return result
 
     @staticmethod
@@ -504,6 +557,7 @@ class ScrapyAgent:
 
         maxsize = request.meta.get("download_maxsize", self._maxsize)
         warnsize = request.meta.get("download_warnsize", self._warnsize)
+        spoolsize = request.meta.get("download_spoolsize", self._spoolsize)
         expected_size = txresponse.length if txresponse.length != UNKNOWN_LENGTH else -1
         fail_on_dataloss = request.meta.get(
             "download_fail_on_dataloss", self._fail_on_dataloss
@@ -532,6 +586,12 @@ class ScrapyAgent:
                 {"size": expected_size, "warnsize": warnsize, "request": request},
             )
 
+        decompressor = None
+        if self._decompress and request.method != "HEAD":
+            decompressor = _StreamDecompressor.from_content_encoding(
+                txresponse.headers.getRawHeaders(b"Content-Encoding", []), maxsize
+            )
+
         def _cancel(_: Any) -> None:
             # Abort connection immediately.
             txresponse._transport._producer.abortConnection()
@@ -544,8 +604,11 @@ class ScrapyAgent:
                 request=request,
                 maxsize=maxsize,
                 warnsize=warnsize,
+                spoolsize=spoolsize,
                 fail_on_dataloss=fail_on_dataloss,
                 crawler=self._crawler,
+                decompressor=decompressor,
+                bandwidth=_get_bandwidth_limiter(self._crawler),
             )
         )
 
@@ -557,7 +620,13 @@ class ScrapyAgent:
     def _cb_bodydone(
         self, result: _ResultT, request: Request, url: str
     ) -> Response | Failure:
+        if self._timings:
+            request.meta["download_timings"]["end"] = time()
         headers = self._headers_from_twisted_response(result["txresponse"])
+        flags = result["flags"]
+        if result.get("decompressed"):
+            del headers[b"Content-Encoding"]
+            flags = [*(flags or []), "decompressed"]
         respcls = responsetypes.from_args(headers=headers, url=url, body=result["body"])
         try:
             version = result["txresponse"].version
@@ -569,7 +638,7 @@ class ScrapyAgent:
             status=int(result["txresponse"].code),
             headers=headers,
             body=result["body"],
-            flags=result["flags"],
+            flags=flags,
             certificate=result["certificate"],
             ip_address=result["ip_address"],
             protocol=protocol,
@@ -608,11 +677,14 @@ class _ResponseReader(Protocol):
         warnsize: int,
         fail_on_dataloss: bool,
         crawler: Crawler,
+        spoolsize: int = 0,
+        decompressor: _StreamDecompressor | None = None,
+        bandwidth: BandwidthLimiter | None = None,
     ):
         self._finished: Deferred[_ResultT] = finished
         self._txresponse: TxResponse = txresponse
         self._request: Request = request
-        self._bodybuf: BytesIO = BytesIO()
+        self._bodybuf: ResponseBodyBuffer = ResponseBodyBuffer(spoolsize, decompressor)
         self._maxsize: int = maxsize
         self._warnsize: int = warnsize
         self._fail_on_dataloss: bool = fail_on_dataloss
@@ -622,6 +694,8 @@ class _ResponseReader(Protocol):
         self._certificate: ssl.Certificate | None = None
         self._ip_address: ipaddress.IPv4Address | ipaddress.IPv6Address | None = None
         self._crawler: Crawler = crawler
+        self._bandwidth: BandwidthLimiter | None = bandwidth
+        self._resume_call: CallLaterResult | None = None
 
     def _finish_response(
         self, flags: list[str] | None = None, failure: Failure | None = None
@@ -634,6 +708,7 @@ class _ResponseReader(Protocol):
                 "certificate": self._certificate,
                 "ip_address": self._ip_address,
                 "failure": failure,
+                "decompressed": self._bodybuf.decompressor is not None,
             }
         )
 
@@ -656,8 +731,25 @@ class _ResponseReader(Protocol):
             return
 
         assert self.transport
-        self._bodybuf.write(bodyBytes)
         self._bytes_received += len(bodyBytes)
+        try:
+            self._bodybuf.write(bodyBytes)
+        except _DecompressionMaxSizeExceeded:
+            logger.warning(
+                "Decompressed response body larger than download "
+                "max size (%(maxsize)s) in request %(request)s.",
+                {"maxsize": self._maxsize, "request": self._request},
+            )
+            self._bodybuf.clear()
+            self._finished.cancel()
+            return
+        except _DECOMPRESSION_ERRORS:
+            # Corrupt compressed data.
+            self._bodybuf.clear()
+            self.transport.stopProducing()
+            self.transport.loseConnection()
+            self._finished.errback()
+            return
 
         bytes_received_result = self._crawler.signals.send_catch_log(
             signal=signals.bytes_received,
@@ -687,12 +779,12 @@ class _ResponseReader(Protocol):
                 },
             )
             # Clear buffer earlier to avoid keeping data in memory for a long time.
-            self._bodybuf.truncate(0)
+            self._bodybuf.clear()
             self._finished.cancel()
 
         if (
             self._warnsize
-            and self._bytes_received > self._warnsize
+            and max(self._bytes_received, self._bodybuf.size) > self._warnsize
             and not self._reached_warnsize
         ):
             self._reached_warnsize = True
@@ -702,7 +794,25 @@ class _ResponseReader(Protocol):
                 {"warnsize": self._warnsize, "request": self._request},
             )
 
+        if self._bandwidth is not None and not self._finished.called:
+            delay = self._bandwidth.consume(
+                self._request.meta.get("download_slot"), len(bodyBytes), time()
+            )
+            if delay and self._resume_call is None:
+                self.transport.pauseProducing()
+                self._resume_call = call_later(delay, self._resume_producing)
+
+    def _resume_producing(self) -> None:
+        self._resume_call = None
+        if not self._finished.called:
+            assert self.transport
+            self.transport.resumeProducing()
+
     def connectionLost(self, reason: Failure = connectionDone) -> None:
+        if self._resume_call is not None:
+            self._resume_call.cancel()
+            self._resume_call = None
+
         if self._finished.called:
             return
 
@@ -0,0 +1,793 @@
+"""HTTP/1.1 download handler for http and https schemes built on asyncio
+streams"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import ssl
+from collections import deque
+from time import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import urldefrag, urlparse
+
+from twisted.internet import ssl as twisted_ssl
+from twisted.internet.defer import CancelledError
+from twisted.internet.error import ConnectionLost, TimeoutError
+from twisted.python.failure import Failure
+from twisted.web.client import ResponseFailed
+from twisted.web.http import _DataLoss
+
+from scrapy import Request, Spider, signals
+from scrapy.core.downloader._body import ResponseBodyBuffer
+from scrapy.core.downloader.bandwidth import _get_bandwidth_limiter
+from scrapy.core.downloader.handlers.http11 import TunnelError, tunnel_request_data
+from scrapy.core.downloader.tls import (
+    METHOD_TLS,
+    METHOD_TLSv10,
+    METHOD_TLSv11,
+    METHOD_TLSv12,
+)
+from scrapy.exceptions import NotConfigured, StopDownload
+from scrapy.http import Headers, Response
+from scrapy.responsetypes import responsetypes
+from scrapy.utils._compression import (
+    _DecompressionMaxSizeExceeded,
+    _StreamDecompressor,
+)
+from scrapy.utils.asyncio import is_asyncio_available
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.python import to_bytes, to_unicode
+from scrapy.utils.url import add_http_if_no_scheme
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from twisted.internet.defer import Deferred
+
+    # typing.Self requires Python 3.11
+    from typing_extensions import Self
+
+    from scrapy.crawler import Crawler
+    from scrapy.settings import BaseSettings
+
+
+logger = logging.getLogger(__name__)
+
+
+_READ_SIZE = 65536
+
+# Requests that can be sent again if a reused connection turns out to be
+# closed by the server, like twisted.web._newclient does.
+_RETRYABLE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+
+_TLS_VERSIONS: dict[str, tuple[ssl.TLSVersion, ssl.TLSVersion]] = {
+    METHOD_TLS: (ssl.TLSVersion.MINIMUM_SUPPORTED, ssl.TLSVersion.MAXIMUM_SUPPORTED),
+    METHOD_TLSv10: (ssl.TLSVersion.TLSv1, ssl.TLSVersion.TLSv1),
+    METHOD_TLSv11: (ssl.TLSVersion.TLSv1_1, ssl.TLSVersion.TLSv1_1),
+    METHOD_TLSv12: (ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_2),
+}
+
+
+class _ConnectionKey(NamedTuple):
+    scheme: str
+    host: str
+    port: int
+    proxy: tuple[str, int, bytes | None] | None
+    bindaddress: tuple[str, int] | None
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.certificate: twisted_ssl.Certificate | None = None
+        self.ip_address: ipaddress.IPv4Address | ipaddress.IPv6Address | None = None
+        self.reused: bool = False
+
+        ssl_object = writer.get_extra_info("ssl_object")
+        if ssl_object is not None:
+            der = ssl_object.getpeercert(binary_form=True)
+            if der:
+                self.certificate = twisted_ssl.Certificate.load(der)
+        peername = writer.get_extra_info("peername")
+        if peername:
+            self.ip_address = ipaddress.ip_address(peername[0])
+
+    @property
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _ConnectionPool:
+    """Keeps idle keep-alive connections, up to *maxsize* per key."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize: int = maxsize
+        self._idle: dict[_ConnectionKey, deque[_Connection]] = {}
+
+    def get(self, key: _ConnectionKey) -> _Connection | None:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn.usable:
+                conn.reused = True
+                return conn
+            conn.close()
+        return None
+
+    def put(self, key: _ConnectionKey, conn: _Connection) -> None:
+        idle = self._idle.setdefault(key, deque())
+        if len(idle) >= self.maxsize or not conn.usable:
+            conn.close()
+            return
+        idle.append(conn)
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+
+class _IncompleteBody(Exception):
+    pass
+
+
+class _ResponseHead(NamedTuple):
+    protocol: str
+    status: int
+    headers: Headers
+    keep_alive: bool
+
+
+class _BodySizeLimits:
+    """Enforces the download max size and warn size of a request on its
+    response body."""
+
+    def __init__(self, request: Request, *, maxsize: int, warnsize: int):
+        self.request: Request = request
+        self.maxsize: int = maxsize
+        self.warnsize: int = warnsize
+        self.bytes_received: int = 0
+        self._reached_warnsize: bool = False
+
+    def check_expected_size(self, expected_size: int) -> None:
+        if self.maxsize and expected_size > self.maxsize:
+            warning_msg = (
+                "Cancelling download of %(url)s: expected response "
+                "size (%(size)s) larger than download max size (%(maxsize)s)."
+            )
+            warning_args = {
+                "url": self.request.url,
+                "size": expected_size,
+                "maxsize": self.maxsize,
+            }
+            logger.warning(warning_msg, warning_args)
+            raise CancelledError(warning_msg % warning_args)
+
+        if self.warnsize and expected_size > self.warnsize:
+            logger.warning(
+                "Expected response size (%(size)s) larger than "
+                "download warn size (%(warnsize)s) in request %(request)s.",
+                {
+                    "size": expected_size,
+                    "warnsize": self.warnsize,
+                    "request": self.request,
+                },
+            )
+
+    def check_received(self, bodybuf: ResponseBodyBuffer, size: int) -> None:
+        """Account for *size* more received bytes, already written to
+        *bodybuf*."""
+        self.bytes_received += size
+        if self.maxsize and self.bytes_received > self.maxsize:
+            logger.warning(
+                "Received (%(bytes)s) bytes larger than download "
+                "max size (%(maxsize)s) in request %(request)s.",
+                {
+                    "bytes": self.bytes_received,
+                    "maxsize": self.maxsize,
+                    "request": self.request,
+                },
+            )
+            bodybuf.clear()
+            raise CancelledError
+
+        if (
+            self.warnsize
+            and max(self.bytes_received, bodybuf.size) > self.warnsize
+            and not self._reached_warnsize
+        ):
+            self._reached_warnsize = True
+            logger.warning(
+                "Received more bytes than download "
+                "warn size (%(warnsize)s) in request %(request)s.",
+                {"warnsize": self.warnsize, "request": self.request},
+            )
+
+
+def _stop_download_failure(
+    results: list[tuple[Any, Any]], request: Request
+) -> Failure | None:
+    """Return the StopDownload failure raised by a signal handler, if any."""
+    for handler, result in results:
+        if isinstance(result, Failure) and isinstance(result.value, StopDownload):
+            logger.debug(
+                "Download stopped for %(request)s from signal handler %(handler)s",
+                {"request": request, "handler": handler.__qualname__},
+            )
+            return result
+    return None
+
+
+class AsyncioHTTP11DownloadHandler:
+    """HTTP/1.1 download handler that uses asyncio streams instead of the
+    Twisted HTTP client. It requires the asyncio reactor."""
+
+    lazy = False
+
+    def __init__(self, settings: BaseSettings, crawler: Crawler):
+        if not is_asyncio_available():
+            raise NotConfigured(
+                f"{type(self).__name__} requires the asyncio Twisted reactor."
+            )
+        self._crawler = crawler
+        self._pool: _ConnectionPool = _ConnectionPool(
+            settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN")
+        )
+        self._ssl_context: ssl.SSLContext = self._get_ssl_context(settings)
+        self._default_maxsize: int = settings.getint("DOWNLOAD_MAXSIZE")
+        self._default_warnsize: int = settings.getint("DOWNLOAD_WARNSIZE")
+        self._default_spoolsize: int = settings.getint("DOWNLOAD_SPOOLSIZE")
+        self._fail_on_dataloss: bool = settings.getbool("DOWNLOAD_FAIL_ON_DATALOSS")
+        self._fail_on_dataloss_warned: bool = False
+        self._decompress: bool = settings.getbool(
+            "COMPRESSION_ENABLED"
+        ) and settings.getbool("COMPRESSION_STREAMING")
+        self._timings: bool = settings.getbool("DOWNLOAD_TIMINGS_ENABLED")
+        self._connect_timeout: float = 10
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        return cls(crawler.settings, crawler)
+
+    @staticmethod
+    def _get_ssl_context(settings: BaseSettings) -> ssl.SSLContext:
+        # Like ScrapyClientContextFactory, the peer certificate is not verified.
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        ctx.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
+        ctx.minimum_version, ctx.maximum_version = _TLS_VERSIONS[
+            settings["DOWNLOADER_CLIENT_TLS_METHOD"]
+        ]
+        ctx.set_ciphers(settings["DOWNLOADER_CLIENT_TLS_CIPHERS"])
+        return ctx
+
+    def download_request(self, request: Request, spider: Spider) -> Deferred[Response]:
+        """Return a deferred for the HTTP download"""
+        return deferred_from_coro(self._download_request(request, spider))
+
+    def close(self) -> None:
+        self._pool.close()
+
+    async def _download_request(self, request: Request, spider: Spider) -> Response:
+        timeout = request.meta.get("download_timeout") or self._connect_timeout
+        url = urldefrag(request.url)[0]
+        try:
+            return await asyncio.wait_for(self._download(request, spider, url), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Getting {url} took longer than {timeout} seconds.")
+
+    def _get_key(self, request: Request) -> _ConnectionKey:
+        parsed = urlparse_cached(request)
+        scheme = parsed.scheme
+        host = parsed.hostname or ""
+        port = parsed.port or (443 if scheme == "https" else 80)
+        bindaddress = request.meta.get("bindaddress")
+        if bindaddress:
+            bindaddress = tuple(bindaddress)
+        proxy = request.meta.get("proxy")
+        if not proxy:
+            return _ConnectionKey(scheme, host, port, None, bindaddress)
+        proxy_parsed = urlparse(add_http_if_no_scheme(proxy))
+        proxy_host = proxy_parsed.hostname or ""
+        proxy_port = proxy_parsed.port or (
+            443 if proxy_parsed.scheme == "https" else 80
+        )
+        if scheme == "https":
+            proxy_auth = request.headers.get(b"Proxy-Authorization", None)
+            return _ConnectionKey(
+                scheme, host, port, (proxy_host, proxy_port, proxy_auth), bindaddress
+            )
+        # Cache *all* connections under the same key, since we are only
+        # connecting to a single destination, the proxy
+        return _ConnectionKey(
+            proxy_parsed.scheme, proxy_host, proxy_port, None, bindaddress
+        )
+
+    async def _connect(
+        self, key: _ConnectionKey, timings: dict[str, float] | None = None
+    ) -> _Connection:
+        if key.proxy is not None:
+            return await self._connect_tunnel(key, timings)
+        sock = await self._open_socket(key.host, key.port, key.bindaddress, timings)
+        try:
+            reader, writer = await asyncio.open_connection(
+                sock=sock,
+                ssl=self._ssl_context if key.scheme == "https" else None,
+                server_hostname=key.host if key.scheme == "https" else None,
+                limit=_READ_SIZE,
+            )
+        except BaseException:
+            sock.close()
+            raise
+        if timings is not None and key.scheme == "https":
+            timings["tls"] = time()
+        return _Connection(reader, writer)
+
+    @staticmethod
+    async def _open_socket(
+        host: str,
+        port: int,
+        bindaddress: tuple[str, int] | None,
+        timings: dict[str, float] | None,
+    ) -> socket.socket:
+        """Resolve *host* and return a socket connected to the first of its
+        addresses that accepts the connection.
+
+        Names are resolved with the event loop, not with the Twisted resolver
+        configured by DNS_RESOLVER, so the DNS cache does not apply.
+        """
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        if timings is not None:
+            timings["dns"] = time()
+        error: OSError = OSError(f"Could not resolve {host}")
+        for family, type_, proto, _, address in infos:
+            sock = socket.socket(family, type_, proto)
+            try:
+                sock.setblocking(False)
+                if bindaddress:
+                    sock.bind(bindaddress)
+                await loop.sock_connect(sock, address)
+            except OSError as e:
+                sock.close()
+                error = e
+                continue
+            except BaseException:
+                sock.close()
+                raise
+            break
+        else:
+            raise error
+        if timings is not None:
+            timings["connect"] = time()
+        return sock
+
+    async def _connect_tunnel(
+        self, key: _ConnectionKey, timings: dict[str, float] | None = None
+    ) -> _Connection:
+        """Connect to the proxy, ask it to open a tunnel with an HTTP
+        CONNECT, and start TLS over that tunnel."""
+        assert key.proxy is not None
+        proxy_host, proxy_port, proxy_auth = key.proxy
+        loop = asyncio.get_running_loop()
+        sock = await self._open_socket(proxy_host, proxy_port, key.bindaddress, timings)
+        try:
+            await loop.sock_sendall(
+                sock, tunnel_request_data(key.host, key.port, proxy_auth)
+            )
+            # Nothing else is sent by the proxy until the TLS handshake
+            # starts, so reading past the end of the headers is not possible.
+            response = b""
+            while b"\r\n\r\n" not in response:
+                data = await loop.sock_recv(sock, _READ_SIZE)
+                if not data:
+                    break
+                response += data
+            status_line = response.split(b"\r\n", 1)[0]
+            parts = status_line.split(None, 2)
+            if (
+                len(parts) < 2
+                or not parts[0].startswith(b"HTTP/1.")
+                or parts[1] != b"200"
+            ):
+                raise TunnelError(
+                    "Could not open CONNECT tunnel with proxy "
+                    f"{proxy_host}:{proxy_port} [{status_line[:1000]!r}]"
+                )
+            if timings is not None:
+                timings["connect"] = time()
+            reader, writer = await asyncio.open_connection(
+                sock=sock,
+                ssl=self._ssl_context,
+                server_hostname=key.host,
+                limit=_READ_SIZE,
+            )
+        except BaseException:
+            sock.close()
+            raise
+        if timings is not None:
+            timings["tls"] = time()
+        return _Connection(reader, writer)
+
+    def _request_data(self, request: Request, key: _ConnectionKey, url: str) -> bytes:
+        parsed = urlparse_cached(request)
+        if request.meta.get("proxy") and parsed.scheme != "https":
+            # Requests sent to an HTTP proxy use the absolute URL
+            target = url
+        else:
+            target = parsed.path or "/"
+            if parsed.params:
+                target += ";" + parsed.params
+            if parsed.query:
+                target += "?" + parsed.query
+        headers = request.headers.copy()
+        if key.proxy is not None:
+            headers.pop(b"Proxy-Authorization", None)
+        if b"Host" not in headers:
+            host = parsed.hostname or ""
+            if ":" in host:
+                host = f"[{host}]"
+            if parsed.port:
+                host += f":{parsed.port}"
+            headers[b"Host"] = host
+        if request.body or request.method in ("POST", "PUT"):
+            # Like twisted.web._newclient, send "Content-Length: 0" for
+            # bodyless POST and PUT requests.
+            headers[b"Content-Length"] = str(len(request.body))
+        lines = [to_bytes(f"{request.method} {target} HTTP/1.1", encoding="ascii")]
+        for name, values in headers.items():
+            lines.extend(name + b": " + value for value in values)
+        return b"\r\n".join(lines) + b"\r\n\r\n" + request.body
+
+    async def _download(self, request: Request, spider: Spider, url: str) -> Response:
+        key = self._get_key(request)
+        data = self._request_data(request, key, url)
+        start_time = time()
+        timings: dict[str, float] | None = None
+        if self._timings:
+            timings = request.meta["download_timings"] = {"start": start_time}
+        while True:
+            conn = self._pool.get(key) or await self._connect(key, timings)
+            try:
+                conn.writer.write(data)
+                head = await self._read_head(conn.reader, request)
+            except (OSError, asyncio.IncompleteReadError) as e:
+                conn.close()
+                if (
+                    conn.reused
+                    and request.method in _RETRYABLE_METHODS
+                    and not request.body
+                ):
+                    continue
+                if isinstance(e, OSError):
+                    raise
+                raise ConnectionLost(
+                    "Connection was closed before the response was received."
+                )
+            except asyncio.LimitOverrunError as e:
+                # The status line or headers exceed the stream buffer limit
+                conn.close()
+                raise ResponseFailed([Failure(e)])
+            except BaseException:
+                conn.close()
+                raise
+            break
+        now = time()
+        request.meta["download_latency"] = now - start_time
+        if timings is not None:
+            timings["headers"] = now
+
+        try:
+            response = await self._read_response(
+                key, conn, head, request=request, spider=spider, url=url
+            )
+        except BaseException:
+            conn.close()
+            raise
+        if timings is not None:
+            timings["end"] = time()
+        return response
+
+    async def _read_head(
+        self, reader: asyncio.StreamReader, request: Request
+    ) -> _ResponseHead:
+        while True:
+            data = await reader.readuntil(b"\r\n\r\n")
+            status_line, _, header_data = data[:-4].partition(b"\r\n")
+            version, status, *_ = [*status_line.split(None, 2), b"", b""]
+            if not version.startswith(b"HTTP/") or not status.isdigit():
+                raise ResponseFailed(
+                    [Failure(ValueError(f"Invalid status line: {status_line!r}"))]
+                )
+            headers = Headers()
+            for line in header_data.split(b"\r\n"):
+                if not line:
+                    continue
+                name, _, value = line.partition(b":")
+                headers.appendlist(name.strip(), value.strip())
+            # Skip informational responses, e.g. 100 Continue
+            if not (100 <= int(status) < 200) or int(status) == 101:
+                break
+        connection = (headers.get(b"Connection") or b"").lower()
+        if version == b"HTTP/1.1":
+            keep_alive = connection != b"close"
+        else:
+            keep_alive = connection == b"keep-alive"
+        return _ResponseHead(
+            protocol=to_unicode(version),
+            status=int(status),
+            headers=headers,
+            keep_alive=keep_alive,
+        )
+
+    async def _iter_body(
+        self,
+        reader: asyncio.StreamReader,
+        headers: Headers,
+        expected_size: int,
+    ) -> AsyncIterator[bytes]:
+        """Yield the chunks of the response body, raising _IncompleteBody if
+        the connection is closed before the end of the body."""
+        if b"chunked" in (headers.get(b"Transfer-Encoding") or b"").lower():
+            try:
+                while True:
+                    line = await reader.readuntil(b"\r\n")
+                    size = int(line.split(b";", 1)[0].strip(), 16)
+                    if size == 0:
+                        # Trailer section
+                        while await reader.readuntil(b"\r\n") != b"\r\n":
+                            pass
+                        return
+                    while size:
+                        chunk = await reader.read(min(size, _READ_SIZE))
+                        if not chunk:
+                            raise _IncompleteBody
+                        size -= len(chunk)
+                        yield chunk
+                    await reader.readexactly(2)
+            except (
+                asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError,
+                ValueError,
+                OSError,
+            ):
+                raise _IncompleteBody
+        remaining = expected_size
+        while remaining:
+            try:
+                chunk = await reader.read(
+                    _READ_SIZE if remaining < 0 else min(remaining, _READ_SIZE)
+                )
+            except OSError:
+                raise _IncompleteBody
+            if not chunk:
+                if remaining < 0:
+                    return
+                raise _IncompleteBody
+            remaining -= len(chunk) if remaining > 0 else 0
+            yield chunk
+
+    async def _read_response(
+        self,
+        key: _ConnectionKey,
+        conn: _Connection,
+        head: _ResponseHead,
+        *,
+        request: Request,
+        spider: Spider,
+        url: str,
+    ) -> Response:
+        headers = head.headers
+        has_body = request.method != "HEAD" and head.status not in (204, 304)
+        chunked = b"chunked" in (headers.get(b"Transfer-Encoding") or b"").lower()
+        content_length = headers.get(b"Content-Length")
+        if not has_body:
+            expected_size = 0
+        elif chunked:
+            expected_size = -1
+        elif content_length is not None and content_length.isdigit():
+            expected_size = int(content_length)
+        else:
+            expected_size = -1
+        # The body of responses without Content-Length or chunked encoding
+        # ends when the connection is closed.
+        delimited = not has_body or chunked or expected_size >= 0
+
+        stop_failure = _stop_download_failure(
+            self._crawler.signals.send_catch_log(
+                signal=signals.headers_received,
+                headers=headers,
+                body_length=expected_size,
+                request=request,
+                spider=spider,
+            ),
+            request,
+        )
+        if stop_failure is not None:
+            conn.close()
+            return self._build_response(
+                head,
+                url,
+                b"",
+                ["download_stopped"],
+                conn=conn,
+                failure=stop_failure if stop_failure.value.fail else None,
+            )
+
+        if expected_size == 0:
+            self._release(key, conn, head, delimited)
+            return self._build_response(head, url, b"", None, conn=conn)
+
+        limits = _BodySizeLimits(
+            request,
+            maxsize=request.meta.get(
+                "download_maxsize",
+                getattr(spider, "download_maxsize", self._default_maxsize),
+            ),
+            warnsize=request.meta.get(
+                "download_warnsize",
+                getattr(spider, "download_warnsize", self._default_warnsize),
+            ),
+        )
+        limits.check_expected_size(expected_size)
+
+        decompressor = None
+        if self._decompress:
+            decompressor = _StreamDecompressor.from_content_encoding(
+                headers.getlist(b"Content-Encoding"), limits.maxsize
+            )
+        bodybuf = ResponseBodyBuffer(
+            request.meta.get("download_spoolsize", self._default_spoolsize),
+            decompressor,
+        )
+        flags: list[str] | None = None
+        try:
+            stop_failure = await self._read_body(
+                conn, head, expected_size, bodybuf, limits, spider=spider
+            )
+        except _IncompleteBody:
+            conn.close()
+            flags = self._handle_dataloss(request, url, bodybuf)
+        else:
+            if stop_failure is not None:
+                conn.close()
+                flags = ["download_stopped"]
+            else:
+                if not delimited:
+                    flags = ["partial"]
+                self._release(key, conn, head, delimited)
+        return self._build_response(
+            head,
+            url,
+            bodybuf.getvalue(),
+            flags,
+            conn=conn,
+            failure=(
+                stop_failure
+                if stop_failure is not None and stop_failure.value.fail
+                else None
+            ),
+            decompressed=decompressor is not None,
+        )
+
+    async def _read_body(
+        self,
+        conn: _Connection,
+        head: _ResponseHead,
+        expected_size: int,
+        bodybuf: ResponseBodyBuffer,
+        limits: _BodySizeLimits,
+        *,
+        spider: Spider,
+    ) -> Failure | None:
+        """Read the response body into *bodybuf*.
+
+        Return the StopDownload failure of the :signal:`bytes_received`
+        handler that stopped the download, if any.
+        """
+        request = limits.request
+        bandwidth = _get_bandwidth_limiter(self._crawler)
+        slot = request.meta.get("download_slot")
+        async for chunk in self._iter_body(conn.reader, head.headers, expected_size):
+            try:
+                bodybuf.write(chunk)
+            except _DecompressionMaxSizeExceeded:
+                logger.warning(
+                    "Decompressed response body larger than download "
+                    "max size (%(maxsize)s) in request %(request)s.",
+                    {"maxsize": limits.maxsize, "request": request},
+                )
+                bodybuf.clear()
+                raise CancelledError
+
+            stop_failure = _stop_download_failure(
+                self._crawler.signals.send_catch_log(
+                    signal=signals.bytes_received,
+                    data=chunk,
+                    request=request,
+                    spider=spider,
+                ),
+                request,
+            )
+            if stop_failure is not None:
+                return stop_failure
+
+            limits.check_received(bodybuf, len(chunk))
+
+            if bandwidth is not None:
+                delay = bandwidth.consume(slot, len(chunk), time())
+                if delay:
+                    await asyncio.sleep(delay)
+        return None
+
+    def _handle_dataloss(
+        self, request: Request, url: str, bodybuf: ResponseBodyBuffer
+    ) -> list[str]:
+        """Return the flags of a response whose body was cut short, or raise
+        ResponseFailed if data loss is not allowed for *request*."""
+        if not request.meta.get("download_fail_on_dataloss", self._fail_on_dataloss):
+            return ["dataloss"]
+        if not self._fail_on_dataloss_warned:
+            logger.warning(
+                "Got data loss in %s. If you want to process broken "
+                "responses set the setting DOWNLOAD_FAIL_ON_DATALOSS = False"
+                " -- This message won't be shown in further requests",
+                url,
+            )
+            self._fail_on_dataloss_warned = True
+        bodybuf.clear()
+        raise ResponseFailed([Failure(_DataLoss())])
+
+    def _release(
+        self,
+        key: _ConnectionKey,
+        conn: _Connection,
+        head: _ResponseHead,
+        delimited: bool,
+    ) -> None:
+        if head.keep_alive and delimited:
+            self._pool.put(key, conn)
+        else:
+            conn.close()
+
+    @staticmethod
+    def _build_response(
+        head: _ResponseHead,
+        url: str,
+        body: bytes,
+        flags: list[str] | None,
+        *,
+        conn: _Connection,
+        failure: Failure | None = None,
+        decompressed: bool = False,
+    ) -> Response:
+        headers = head.headers
+        if decompressed:
+            headers = headers.copy()
+            del headers[b"Content-Encoding"]
+            flags = [*(flags or []), "decompressed"]
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        response = respcls(
+            url=url,
+            status=head.status,
+            headers=headers,
+            body=body,
+            flags=flags,
+            certificate=conn.certificate,
+            ip_address=conn.ip_address,
+            protocol=head.protocol,
+        )
+        if failure:
+            failure.value.response = response
+            failure.raiseException()
+        return response
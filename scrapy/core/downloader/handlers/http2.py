@@ -7,6 +7,7 @@ from urllib.parse import urldefrag
 from twisted.internet.error import TimeoutError
 from twisted.web.client import URI
 
+from scrapy.core.downloader.bandwidth import _get_bandwidth_limiter
 from scrapy.core.downloader.contextfactory import load_context_factory_from_settings
 from scrapy.core.http2.agent import H2Agent, H2ConnectionPool, ScrapyProxyH2Agent
 from scrapy.utils.httpobj import urlparse_cached
@@ -34,6 +35,7 @@ class H2DownloadHandler:
 
         self._pool = H2ConnectionPool(reactor, settings)
         self._context_factory = load_context_factory_from_settings(settings, crawler)
+        self._timings: bool = settings.getbool("DOWNLOAD_TIMINGS_ENABLED")
 
     @classmethod
     def from_crawler(cls, crawler: Crawler) -> Self:
@@ -43,6 +45,7 @@ class H2DownloadHandler:
         agent = ScrapyH2Agent(
             context_factory=self._context_factory,
             pool=self._pool,
+            timings=self._timings,
             crawler=self._crawler,
         )
         return agent.download_request(request, spider)
@@ -62,17 +65,21 @@ class ScrapyH2Agent:
         connect_timeout: int = 10,
         bind_address: bytes | None = None,
         crawler: Crawler | None = None,
+        *,
+        timings: bool = False,
     ) -> None:
         self._context_factory = context_factory
         self._connect_timeout = connect_timeout
         self._bind_address = bind_address
         self._pool = pool
         self._crawler = crawler
+        self._timings = timings
 
     def _get_agent(self, request: Request, timeout: float | None) -> H2Agent:
         from twisted.internet import reactor
 
         bind_address = request.meta.get("bindaddress") or self._bind_address
+        bandwidth = _get_bandwidth_limiter(self._crawler)
         proxy = request.meta.get("proxy")
         if proxy:
             if urlparse_cached(request).scheme == "https":
@@ -87,6 +94,7 @@ class ScrapyH2Agent:
                 connect_timeout=timeout,
                 bind_address=bind_address,
                 pool=self._pool,
+                bandwidth=bandwidth,
             )
 
         return self._Agent(
@@ -95,6 +103,7 @@ class ScrapyH2Agent:
             connect_timeout=timeout,
             bind_address=bind_address,
             pool=self._pool,
+            bandwidth=bandwidth,
         )
 
     def download_request(self, request: Request, spider: Spider) -> Deferred[Response]:
@@ -104,6 +113,8 @@ class ScrapyH2Agent:
         agent = self._get_agent(request, timeout)
 
         start_time = time()
+        if self._timings:
+            request.meta["download_timings"] = {"start": start_time}
         d = agent.request(request, spider)
         d.addCallback(self._cb_latency, request, start_time)
 
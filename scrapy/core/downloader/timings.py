@@ -0,0 +1,84 @@
+"""Per-request download timings, recorded by the HTTP download handlers in the
+:reqmeta:`download_timings` request meta key when
+:setting:`DOWNLOAD_TIMINGS_ENABLED` is ``True``."""
+
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING
+
+from twisted.internet.interfaces import IHandshakeListener, IStreamClientEndpoint
+from zope.interface import alsoProvides, implementer
+
+if TYPE_CHECKING:
+    from twisted.internet.defer import Deferred
+    from twisted.internet.interfaces import IProtocol, IProtocolFactory
+
+
+#: Download phases, in the order in which they happen, with the
+#: :reqmeta:`download_timings` key of the timestamp at which each one ends.
+PHASES: tuple[tuple[str, str], ...] = (
+    ("dns", "dns"),
+    ("connect", "connect"),
+    ("tls", "tls"),
+    ("ttfb", "headers"),
+    ("transfer", "end"),
+)
+
+
+def get_phase_durations(timings: dict[str, float]) -> dict[str, float]:
+    """Return the duration, in seconds, of each phase of a download from its
+    :reqmeta:`download_timings`.
+
+    Each phase starts when the previous one ended, so that the durations add
+    up to the download time. Phases that the download did not wait for, e.g.
+    the connection phases when reusing a connection, are left out.
+    """
+    durations: dict[str, float] = {}
+    previous = timings.get("start")
+    if previous is None:
+        return durations
+    for phase, key in PHASES:
+        end = timings.get(key)
+        if end is None or end < previous:
+            continue
+        durations[phase] = end - previous
+        previous = end
+    return durations
+
+
+@implementer(IStreamClientEndpoint)
+class _TimingEndpoint:
+    """Wraps the endpoint used to open a new connection, to record in
+    *timings* when its TCP connection and TLS handshake complete.
+
+    The name resolution of Twisted endpoints is not timed separately, and is
+    part of "connect".
+    """
+
+    def __init__(self, endpoint: IStreamClientEndpoint, timings: dict[str, float]):
+        self._endpoint: IStreamClientEndpoint = endpoint
+        self._timings: dict[str, float] = timings
+
+    def connect(self, protocolFactory: IProtocolFactory) -> Deferred[IProtocol]:
+        d = self._endpoint.connect(protocolFactory)
+        d.addCallback(self._connected)
+        return d
+
+    def _connected(self, protocol: IProtocol) -> IProtocol:
+        self._timings["connect"] = time()
+        # The TLS handshake, if any, completes after the connection is made.
+        handshake_completed = (
+            getattr(protocol, "handshakeCompleted", None)
+            if IHandshakeListener.providedBy(protocol)
+            else None
+        )
+
+        def _handshake_completed() -> None:
+            self._timings["tls"] = time()
+            if handshake_completed is not None:
+                handshake_completed()
+
+        alsoProvides(protocol, IHandshakeListener)
+        protocol.handshakeCompleted = _handshake_completed  # type: ignore[attr-defined]
+        return protocol
@@ -1,5 +1,7 @@
+from __future__ import annotations
+
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from OpenSSL import SSL
 from service_identity.exceptions import CertificateError
@@ -10,7 +12,17 @@ from twisted.internet._sslverify import (
 )
 from twisted.internet.ssl import AcceptableCiphers
 
-from scrapy.utils.ssl import get_temp_key_info, x509name_to_string
+from scrapy.utils.datatypes import LocalCache
+from scrapy.utils.ssl import (
+    get_session_reused,
+    get_temp_key_info,
+    x509name_to_string,
+)
+
+if TYPE_CHECKING:
+    from twisted.protocols.tls import TLSMemoryBIOProtocol
+
+    from scrapy.statscollectors import StatsCollector
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +41,47 @@ openssl_methods: dict[str, int] = {
 }
 
 
+class TLSSessionCache:
+    """
+    Per-server cache of TLS sessions, keyed by hostname and port, used to
+    resume the session of a previous connection to a server instead of doing
+    a full handshake.
+
+    The session of a connection is stored when its handshake is done, and
+    updated afterwards, since TLS 1.3 servers send session tickets after the
+    handshake.
+    """
+
+    #: Session ID context shared by the contexts that use the cache, as
+    #: OpenSSL refuses to resume a session in a different context.
+    session_id_context: bytes = b"scrapy"
+
+    def __init__(self, limit: int = 10000, stats: StatsCollector | None = None):
+        self.stats: StatsCollector | None = stats
+        self._sessions: LocalCache[tuple[str, int | None], SSL.Session] = LocalCache(
+            limit=limit
+        )
+
+    def get(self, hostname: str, port: int | None = None) -> SSL.Session | None:
+        return self._sessions.get((hostname, port))
+
+    def update(
+        self, hostname: str, port: int | None, connection: SSL.Connection
+    ) -> None:
+        session = connection.get_session()
+        if session is not None:
+            self._sessions[hostname, port] = session
+
+    def handshake_done(
+        self, hostname: str, port: int | None, connection: SSL.Connection
+    ) -> None:
+        self.update(hostname, port, connection)
+        reused = get_session_reused(connection._ssl)
+        if self.stats is not None and reused is not None:
+            handshake = "resumed" if reused else "full"
+            self.stats.inc_value(f"downloader/tls_handshake/{handshake}")
+
+
 class ScrapyClientTLSOptions(ClientTLSOptions):
     """
     SSL Client connection creator ignoring certificate verification errors
@@ -37,12 +90,34 @@ class ScrapyClientTLSOptions(ClientTLSOptions):
     Same as Twisted's private _sslverify.ClientTLSOptions,
     except that VerificationError, CertificateError and ValueError
     exceptions are caught, so that the connection is not closed, only
-    logging warnings. Also, HTTPS connection parameters logging is added.
+    logging warnings. Also, HTTPS connection parameters logging is added,
+    and TLS sessions are resumed from the *session_cache*, if given, for
+    the *port* of the connection.
     """
 
-    def __init__(self, hostname: str, ctx: SSL.Context, verbose_logging: bool = False):
+    def __init__(
+        self,
+        hostname: str,
+        ctx: SSL.Context,
+        verbose_logging: bool = False,
+        session_cache: TLSSessionCache | None = None,
+        port: int | None = None,
+    ):
         super().__init__(hostname, ctx)
         self.verbose_logging: bool = verbose_logging
+        self.session_cache: TLSSessionCache | None = session_cache
+        self.port: int | None = port
+        self._handshake_done: bool = False
+
+    def clientConnectionForTLS(
+        self, tlsProtocol: TLSMemoryBIOProtocol
+    ) -> SSL.Connection:
+        connection: SSL.Connection = super().clientConnectionForTLS(tlsProtocol)
+        if self.session_cache is not None:
+            session = self.session_cache.get(self._hostnameASCII, self.port)
+            if session is not None:
+                connection.set_session(session)
+        return connection
 
     def _identityVerifyingInfoCallback(
         self, connection: SSL.Connection, where: int, ret: Any
@@ -50,6 +125,12 @@ class ScrapyClientTLSOptions(ClientTLSOptions):
         if where & SSL.SSL_CB_HANDSHAKE_START:
             connection.set_tlsext_host_name(self._hostnameBytes)
         elif where & SSL.SSL_CB_HANDSHAKE_DONE:
+            self._handshake_done = True
+            if self.session_cache is not None:
+                self.session_cache.handshake_done(
+                    self._hostnameASCII, self.port, connection
+                )
+
             if self.verbose_logging:
                 logger.debug(
                     "SSL connection to %s using protocol %s, cipher %s",
@@ -84,6 +165,9 @@ class ScrapyClientTLSOptions(ClientTLSOptions):
                     self._hostnameASCII,
                     e,
                 )
+        elif self._handshake_done and self.session_cache is not None:
+            # Session tickets received after the handshake
+            self.session_cache.update(self._hostnameASCII, self.port, connection)
 
 
 DEFAULT_CIPHERS: AcceptableCiphers = AcceptableCiphers.fromOpenSSLCipherString(
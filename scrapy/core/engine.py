@@ -255,6 +255,17 @@ class ExecutionEngine:
             or self.scraper.slot.needs_backout()
         )
 
+    def wake_up(self) -> None:
+        """Make the engine ask the scheduler for requests again soon.
+
+        Schedulers whose :meth:`~scrapy.core.scheduler.BaseScheduler.next_request`
+        returns ``None`` while they still have pending requests, e.g. because
+        those requests must wait for some time, can call it once their
+        requests are ready, instead of waiting for the next periodic check.
+        """
+        if self._slot is not None:
+            self._slot.nextcall.schedule()
+
     def _start_scheduled_request(self) -> bool:
         assert self._slot is not None  # typing
         assert self.spider is not None  # typing
@@ -15,12 +15,14 @@ from twisted.web.client import (
 from twisted.web.error import SchemeNotSupported
 
 from scrapy.core.downloader.contextfactory import AcceptableProtocolsContextFactory
+from scrapy.core.downloader.timings import _TimingEndpoint
 from scrapy.core.http2.protocol import H2ClientFactory, H2ClientProtocol
 
 if TYPE_CHECKING:
     from twisted.internet.base import ReactorBase
     from twisted.internet.endpoints import HostnameEndpoint
 
+    from scrapy.core.downloader.bandwidth import BandwidthLimiter
     from scrapy.http import Request, Response
     from scrapy.settings import Settings
     from scrapy.spiders import Spider
@@ -34,11 +36,20 @@ class H2ConnectionPool:
         self._reactor = reactor
         self.settings = settings
 
+        # Maximum number of HTTP/2 connections opened to the same remote.
+        # Additional connections are only opened when every existing
+        # connection already uses all the streams allowed by the remote.
+        self.max_connections: int = max(settings.getint("H2_MAX_CONNECTIONS"), 1)
+
+        # Whether to record the timings of new connections, see
+        # DOWNLOAD_TIMINGS_ENABLED
+        self._timings: bool = settings.getbool("DOWNLOAD_TIMINGS_ENABLED")
+
         # Store a dictionary which is used to get the respective
-        # H2ClientProtocolInstance using the  key as Tuple(scheme, hostname, port)
-        self._connections: dict[ConnectionKeyT, H2ClientProtocol] = {}
+        # H2ClientProtocol instances using the key as Tuple(scheme, hostname, port)
+        self._connections: dict[ConnectionKeyT, list[H2ClientProtocol]] = {}
 
-        # Save all requests that arrive before the connection is established
+        # Save all requests that arrive while a connection is being established
         self._pending_requests: dict[
             ConnectionKeyT, deque[Deferred[H2ClientProtocol]]
         ] = {}
@@ -46,6 +57,13 @@ class H2ConnectionPool:
     def get_connection(
         self, key: ConnectionKeyT, uri: URI, endpoint: HostnameEndpoint
     ) -> Deferred[H2ClientProtocol]:
+        # Check if we already have a connection to the remote which can
+        # take one more stream
+        conn = self._select_connection(key)
+        if conn is not None:
+            # Return this connection instance wrapped inside a deferred
+            return defer.succeed(conn)
+
         if key in self._pending_requests:
             # Received a request while connecting to remote
             # Create a deferred which will fire with the H2ClientProtocol
@@ -54,35 +72,64 @@ class H2ConnectionPool:
             self._pending_requests[key].append(d)
             return d
 
-        # Check if we already have a connection to the remote
-        conn = self._connections.get(key, None)
-        if conn:
-            # Return this connection instance wrapped inside a deferred
-            return defer.succeed(conn)
-
-        # No connection is established for the given URI
+        # No connection with free streams is established for the given URI
         return self._new_connection(key, uri, endpoint)
 
+    def _select_connection(self, key: ConnectionKeyT) -> H2ClientProtocol | None:
+        """Return the connection to *key* with the fewest open streams.
+
+        ``None`` is returned if there is no connection, or if all of them
+        are using as many streams as the remote allows and a new
+        connection can still be opened. Once :attr:`max_connections` is
+        reached, the least busy connection is returned and the request is
+        queued by that connection until one of its streams is closed.
+        """
+        connections = self._connections.get(key)
+        if not connections:
+            return None
+        conn = min(connections, key=lambda c: c.open_streams)
+        if (
+            conn.open_streams < conn.allowed_max_concurrent_streams
+            or len(connections) >= self.max_connections
+        ):
+            return conn
+        return None
+
     def _new_connection(
         self, key: ConnectionKeyT, uri: URI, endpoint: HostnameEndpoint
     ) -> Deferred[H2ClientProtocol]:
-        self._pending_requests[key] = deque()
+        pending_requests: deque[Deferred[H2ClientProtocol]] = deque()
+        self._pending_requests[key] = pending_requests
 
         conn_lost_deferred: Deferred[list[BaseException]] = Deferred()
-        conn_lost_deferred.addCallback(self._remove_connection, key)
+        conn_lost_deferred.addCallback(self._remove_connection, key, pending_requests)
 
         factory = H2ClientFactory(uri, self.settings, conn_lost_deferred)
-        conn_d = endpoint.connect(factory)
+        if self._timings:
+            connection_timings: dict[str, float] = {}
+            conn_d = _TimingEndpoint(endpoint, connection_timings).connect(factory)
+            conn_d.addCallback(self._set_connection_timings, connection_timings)
+        else:
+            conn_d = endpoint.connect(factory)
         conn_d.addCallback(self.put_connection, key)
+        conn_d.addCallback(self._watch_connection, key, conn_lost_deferred)
+        conn_d.addErrback(self._connection_failed, key, pending_requests)
 
         d: Deferred[H2ClientProtocol] = Deferred()
-        self._pending_requests[key].append(d)
+        pending_requests.append(d)
         return d
 
+    @staticmethod
+    def _set_connection_timings(
+        conn: H2ClientProtocol, connection_timings: dict[str, float]
+    ) -> H2ClientProtocol:
+        conn.metadata["connection_timings"] = connection_timings
+        return conn
+
     def put_connection(
         self, conn: H2ClientProtocol, key: ConnectionKeyT
     ) -> H2ClientProtocol:
-        self._connections[key] = conn
+        self._connections.setdefault(key, []).append(conn)
 
         # Now as we have established a proper HTTP/2 connection
         # we fire all the deferred's with the connection instance
@@ -93,16 +140,54 @@ class H2ConnectionPool:
 
         return conn
 
+    def _watch_connection(
+        self,
+        conn: H2ClientProtocol,
+        key: ConnectionKeyT,
+        conn_lost_deferred: Deferred[list[BaseException]],
+    ) -> None:
+        conn_lost_deferred.addCallback(self._discard_connection, key, conn)
+
+    def _connection_failed(
+        self,
+        failure: Failure,
+        key: ConnectionKeyT,
+        pending_requests: deque[Deferred[H2ClientProtocol]],
+    ) -> None:
+        self._fail_pending_requests(key, pending_requests, ResponseFailed([failure]))
+
     def _remove_connection(
-        self, errors: list[BaseException], key: ConnectionKeyT
+        self,
+        errors: list[BaseException],
+        key: ConnectionKeyT,
+        pending_requests: deque[Deferred[H2ClientProtocol]],
+    ) -> list[BaseException]:
+        # Requests can only be waiting for the connection if it was lost
+        # before being added to the pool
+        self._fail_pending_requests(key, pending_requests, ResponseFailed(errors))
+        return errors
+
+    def _discard_connection(
+        self, errors: list[BaseException], key: ConnectionKeyT, conn: H2ClientProtocol
     ) -> None:
-        self._connections.pop(key)
+        connections = self._connections.get(key, [])
+        if conn in connections:
+            connections.remove(conn)
+        if not connections:
+            self._connections.pop(key, None)
 
-        # Call the errback of all the pending requests for this connection
-        pending_requests = self._pending_requests.pop(key, None)
+    def _fail_pending_requests(
+        self,
+        key: ConnectionKeyT,
+        pending_requests: deque[Deferred[H2ClientProtocol]],
+        error: ResponseFailed,
+    ) -> None:
+        # Call the errback of all the requests waiting for this connection
+        if self._pending_requests.get(key) is pending_requests:
+            del self._pending_requests[key]
         while pending_requests:
             d = pending_requests.popleft()
-            d.errback(ResponseFailed(errors))
+            d.errback(error)
 
     def close_connections(self) -> None:
         """Close all the HTTP/2 connections and remove them from pool
@@ -110,9 +195,20 @@ class H2ConnectionPool:
         Returns:
             Deferred that fires when all connections have been closed
         """
-        for conn in self._connections.values():
-            assert conn.transport is not None  # typing
-            conn.transport.abortConnection()
+        for connections in list(self._connections.values()):
+            for conn in list(connections):
+                assert conn.transport is not None  # typing
+                conn.transport.abortConnection()
+
+    def get_stats(self) -> dict[ConnectionKeyT, list[dict[str, int]]]:
+        """Return the stream statistics of every open connection, see
+        :attr:`H2ClientProtocol.stream_stats
+        <scrapy.core.http2.protocol.H2ClientProtocol.stream_stats>`.
+        """
+        return {
+            key: [conn.stream_stats for conn in connections]
+            for key, connections in self._connections.items()
+        }
 
 
 class H2Agent:
@@ -123,9 +219,11 @@ class H2Agent:
         context_factory: BrowserLikePolicyForHTTPS = BrowserLikePolicyForHTTPS(),
         connect_timeout: float | None = None,
         bind_address: bytes | None = None,
+        bandwidth: BandwidthLimiter | None = None,
     ) -> None:
         self._reactor = reactor
         self._pool = pool
+        self._bandwidth = bandwidth
         self._context_factory = AcceptableProtocolsContextFactory(
             context_factory, acceptable_protocols=[b"h2"]
         )
@@ -153,7 +251,7 @@ class H2Agent:
         key = self.get_key(uri)
         d: Deferred[H2ClientProtocol] = self._pool.get_connection(key, uri, endpoint)
         d2: Deferred[Response] = d.addCallback(
-            lambda conn: conn.request(request, spider)
+            lambda conn: conn.request(request, spider, self._bandwidth)
         )
         return d2
 
@@ -167,6 +265,7 @@ class ScrapyProxyH2Agent(H2Agent):
         context_factory: BrowserLikePolicyForHTTPS = BrowserLikePolicyForHTTPS(),
         connect_timeout: float | None = None,
         bind_address: bytes | None = None,
+        bandwidth: BandwidthLimiter | None = None,
     ) -> None:
         super().__init__(
             reactor=reactor,
@@ -174,6 +273,7 @@ class ScrapyProxyH2Agent(H2Agent):
             context_factory=context_factory,
             connect_timeout=connect_timeout,
             bind_address=bind_address,
+            bandwidth=bandwidth,
         )
         self._proxy_uri = proxy_uri
 
@@ -21,6 +21,7 @@ from h2.events import (
     WindowUpdated,
 )
 from h2.exceptions import FrameTooLargeError, H2Error
+from h2.settings import SettingCodes
 from twisted.internet.error import TimeoutError
 from twisted.internet.interfaces import (
     IAddress,
@@ -42,6 +43,7 @@ if TYPE_CHECKING:
     from twisted.python.failure import Failure
     from twisted.web.client import URI
 
+    from scrapy.core.downloader.bandwidth import BandwidthLimiter
     from scrapy.settings import Settings
     from scrapy.spiders import Spider
 
@@ -136,14 +138,24 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
             # Variables taken from Project Settings
             "default_download_maxsize": settings.getint("DOWNLOAD_MAXSIZE"),
             "default_download_warnsize": settings.getint("DOWNLOAD_WARNSIZE"),
+            "default_download_spoolsize": settings.getint("DOWNLOAD_SPOOLSIZE"),
+            "decompress": settings.getbool("COMPRESSION_ENABLED")
+            and settings.getbool("COMPRESSION_STREAMING"),
+            "window_size": settings.getint("H2_WINDOW_SIZE"),
             # Counter to keep track of opened streams. This counter
             # is used to make sure that not more than MAX_CONCURRENT_STREAMS
             # streams are opened which leads to ProtocolError
             # We use simple FIFO policy to handle pending requests
             "active_streams": 0,
+            # Total number of streams created on this connection
+            "total_streams": 0,
             # Flag to keep track if settings were acknowledged by the remote
             # This ensures that we have established a HTTP/2 connection
             "settings_acknowledged": False,
+            # Times at which the name resolution, TCP connection and TLS
+            # handshake of this connection completed, recorded by the pool
+            # when DOWNLOAD_TIMINGS_ENABLED is True
+            "connection_timings": {},
         }
 
     @property
@@ -167,6 +179,27 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
             self.conn.remote_settings.max_concurrent_streams,
         )
 
+    @property
+    def open_streams(self) -> int:
+        """Number of streams of this connection which are either active or
+        waiting for a free stream slot.
+        """
+        return len(self.streams)
+
+    @property
+    def stream_stats(self) -> dict[str, int]:
+        """Stream counters of this connection: the number of ``active``
+        streams, of ``pending`` streams waiting for a free stream slot,
+        of streams created over the lifetime of the connection (``total``),
+        and the ``max_concurrent`` streams currently allowed.
+        """
+        return {
+            "active": self.metadata["active_streams"],
+            "pending": len(self._pending_request_stream_pool),
+            "total": self.metadata["total_streams"],
+            "max_concurrent": self.allowed_max_concurrent_streams,
+        }
+
     def _send_pending_requests(self) -> None:
         """Initiate all pending requests from the deque following FIFO
         We make sure that at any time {allowed_max_concurrent_streams}
@@ -189,7 +222,12 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         self._send_pending_requests()
         return stream
 
-    def _new_stream(self, request: Request, spider: Spider) -> Stream:
+    def _new_stream(
+        self,
+        request: Request,
+        spider: Spider,
+        bandwidth: BandwidthLimiter | None = None,
+    ) -> Stream:
         """Instantiates a new Stream object"""
         stream = Stream(
             stream_id=next(self._stream_id_generator),
@@ -201,8 +239,12 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
             download_warnsize=getattr(
                 spider, "download_warnsize", self.metadata["default_download_warnsize"]
             ),
+            download_spoolsize=self.metadata["default_download_spoolsize"],
+            decompress=self.metadata["decompress"],
+            bandwidth=bandwidth,
         )
         self.streams[stream.stream_id] = stream
+        self.metadata["total_streams"] += 1
         return stream
 
     def _write_to_transport(self) -> None:
@@ -216,13 +258,27 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         data = self.conn.data_to_send()
         self.transport.write(data)
 
-    def request(self, request: Request, spider: Spider) -> Deferred[Response]:
+    def acknowledge_received_data(self, size: int, stream_id: int) -> None:
+        """Acknowledge data received on a stream, when the acknowledgement was
+        delayed to limit the bandwidth"""
+        assert self.transport is not None  # typing
+        if not self.transport.connected:
+            return
+        self.conn.acknowledge_received_data(size, stream_id)
+        self._write_to_transport()
+
+    def request(
+        self,
+        request: Request,
+        spider: Spider,
+        bandwidth: BandwidthLimiter | None = None,
+    ) -> Deferred[Response]:
         if not isinstance(request, Request):
             raise TypeError(
                 f"Expected scrapy.http.Request, received {request.__class__.__qualname__}"
             )
 
-        stream = self._new_stream(request, spider)
+        stream = self._new_stream(request, spider, bandwidth)
         d: Deferred[Response] = stream.get_response()
 
         # Add the stream to the request pool
@@ -246,8 +302,22 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
 
         # Initiate H2 Connection
         self.conn.initiate_connection()
+        self._update_window_size()
         self._write_to_transport()
 
+    def _update_window_size(self) -> None:
+        """Grow the flow control windows of the connection and of its streams
+        to the configured window size, so that the remote can send more data
+        before waiting for a WINDOW_UPDATE frame.
+        """
+        window_size = self.metadata["window_size"]
+        if window_size <= self.conn.local_settings.initial_window_size:
+            return
+        self.conn.update_settings({SettingCodes.INITIAL_WINDOW_SIZE: window_size})
+        self.conn.increment_flow_control_window(
+            window_size - self.conn.inbound_flow_control_window
+        )
+
     def _lose_connection_with_error(self, errors: list[BaseException]) -> None:
         """Helper function to lose the connection with the error sent as a
         reason"""
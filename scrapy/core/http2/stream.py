@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from enum import Enum
-from io import BytesIO
+from time import time
 from typing import TYPE_CHECKING, Any
 
 from h2.errors import ErrorCodes
@@ -12,15 +12,24 @@ from twisted.internet.error import ConnectionClosed
 from twisted.python.failure import Failure
 from twisted.web.client import ResponseFailed
 
+from scrapy.core.downloader._body import ResponseBodyBuffer
 from scrapy.http.headers import Headers
 from scrapy.responsetypes import responsetypes
+from scrapy.utils._compression import (
+    _DECOMPRESSION_ERRORS,
+    _DecompressionMaxSizeExceeded,
+    _StreamDecompressor,
+)
+from scrapy.utils.asyncio import call_later
 from scrapy.utils.httpobj import urlparse_cached
 
 if TYPE_CHECKING:
     from hpack import HeaderTuple
 
+    from scrapy.core.downloader.bandwidth import BandwidthLimiter
     from scrapy.core.http2.protocol import H2ClientProtocol
     from scrapy.http import Request, Response
+    from scrapy.utils.asyncio import CallLaterResult
 
 
 logger = logging.getLogger(__name__)
@@ -74,6 +83,9 @@ class StreamCloseReason(Enum):
     # As a result sending this request will the end the connection
     INVALID_HOSTNAME = 7
 
+    # The compressed response body could not be decompressed
+    DECOMPRESSION_FAILED = 8
+
 
 class Stream:
     """Represents a single HTTP/2 Stream.
@@ -93,6 +105,9 @@ class Stream:
         protocol: H2ClientProtocol,
         download_maxsize: int = 0,
         download_warnsize: int = 0,
+        download_spoolsize: int = 0,
+        decompress: bool = False,
+        bandwidth: BandwidthLimiter | None = None,
     ) -> None:
         """
         Arguments:
@@ -110,6 +125,19 @@ class Stream:
         self._download_warnsize = self._request.meta.get(
             "download_warnsize", download_warnsize
         )
+        self._download_spoolsize = self._request.meta.get(
+            "download_spoolsize", download_spoolsize
+        )
+        self._decompress = decompress and self._request.method != "HEAD"
+        self._bandwidth = bandwidth
+        # Data received but not acknowledged yet to limit the bandwidth, and
+        # the delayed call that acknowledges it
+        self._delayed_ack_size: int = 0
+        self._delayed_ack: CallLaterResult | None = None
+        # Set by the download handler when DOWNLOAD_TIMINGS_ENABLED is True
+        self._timings: dict[str, float] | None = self._request.meta.get(
+            "download_timings"
+        )
 
         # Metadata of an HTTP/2 connection stream
         # initialized when stream is instantiated
@@ -137,7 +165,7 @@ class Stream:
         self._response: dict[str, Any] = {
             # Data received frame by frame from the server is appended
             # and passed to the response Deferred when completely received.
-            "body": BytesIO(),
+            "body": ResponseBodyBuffer(self._download_spoolsize),
             # The amount of data received that counts against the
             # flow control window
             "flow_controlled_size": 0,
@@ -175,6 +203,7 @@ class Stream:
             self._download_warnsize
             and (
                 self._response["flow_controlled_size"] > self._download_warnsize
+                or self._response["body"].size > self._download_warnsize
                 or content_length_header > self._download_warnsize
             )
             and not self.metadata["reached_warnsize"]
@@ -325,8 +354,16 @@ class Stream:
             self.send_data()
 
     def receive_data(self, data: bytes, flow_controlled_length: int) -> None:
-        self._response["body"].write(data)
         self._response["flow_controlled_size"] += flow_controlled_length
+        try:
+            self._response["body"].write(data)
+        except _DecompressionMaxSizeExceeded:
+            self.reset_stream(StreamCloseReason.MAXSIZE_EXCEEDED)
+            return
+        except _DECOMPRESSION_ERRORS as e:
+            # Corrupt compressed data
+            self.reset_stream(StreamCloseReason.DECOMPRESSION_FAILED, [e])
+            return
 
         # We check maxsize here in case the Content-Length header was not received
         if (
@@ -344,15 +381,51 @@ class Stream:
             )
             logger.warning(warning_msg)
 
-        # Acknowledge the data received
+        # Acknowledge the data received. When the bandwidth budget is
+        # exhausted, the acknowledgement is delayed, so that the remote stops
+        # sending data on this stream once the flow control window is full.
+        if self._bandwidth is not None:
+            delay = self._bandwidth.consume(
+                self._request.meta.get("download_slot"),
+                flow_controlled_length,
+                time(),
+            )
+            if delay:
+                # The delay covers all the data received so far, so the data
+                # of a pending acknowledgement is acknowledged with it.
+                if self._delayed_ack is not None:
+                    self._delayed_ack.cancel()
+                self._delayed_ack_size += flow_controlled_length
+                self._delayed_ack = call_later(delay, self._acknowledge_data)
+                return
         self._protocol.conn.acknowledge_received_data(
-            self._response["flow_controlled_size"], self.stream_id
+            flow_controlled_length, self.stream_id
         )
 
+    def _acknowledge_data(self) -> None:
+        size, self._delayed_ack_size = self._delayed_ack_size, 0
+        self._delayed_ack = None
+        self._protocol.acknowledge_received_data(size, self.stream_id)
+
     def receive_headers(self, headers: list[HeaderTuple]) -> None:
+        if self._timings is not None:
+            self._timings["headers"] = time()
+            connection_timings = self._protocol.metadata["connection_timings"]
+            # Requests sent before the connection was made waited for it
+            if connection_timings.get("connect", 0) >= self._timings["start"]:
+                self._timings.update(connection_timings)
+
         for name, value in headers:
             self._response["headers"].appendlist(name, value)
 
+        if self._decompress and self._response["body"].decompressor is None:
+            self._response[
+                "body"
+            ].decompressor = _StreamDecompressor.from_content_encoding(
+                self._response["headers"].getlist(b"Content-Encoding"),
+                self._download_maxsize,
+            )
+
         # Check if we exceed the allowed max data size which can be received
         expected_size = int(self._response["headers"].get(b"Content-Length", -1))
         if self._download_maxsize and expected_size > self._download_maxsize:
@@ -367,17 +440,21 @@ class Stream:
             )
             logger.warning(warning_msg)
 
-    def reset_stream(self, reason: StreamCloseReason = StreamCloseReason.RESET) -> None:
+    def reset_stream(
+        self,
+        reason: StreamCloseReason = StreamCloseReason.RESET,
+        errors: list[BaseException] | None = None,
+    ) -> None:
         """Close this stream by sending a RST_FRAME to the remote peer"""
         if self.metadata["stream_closed_local"]:
             raise StreamClosedError(self.stream_id)
 
         # Clear buffer earlier to avoid keeping data in memory for a long time
-        self._response["body"].truncate(0)
+        self._response["body"].clear()
 
         self.metadata["stream_closed_local"] = True
         self._protocol.conn.reset_stream(self.stream_id, ErrorCodes.REFUSED_STREAM)
-        self.close(reason)
+        self.close(reason, errors)
 
     def close(
         self,
@@ -398,6 +475,10 @@ class Stream:
         # some cases can add a list of exceptions
         errors = errors or []
 
+        if self._delayed_ack is not None:
+            self._delayed_ack.cancel()
+            self._delayed_ack = None
+
         if not from_protocol:
             self._protocol.pop_stream(self.stream_id)
 
@@ -452,7 +533,10 @@ class Stream:
                 )
             )
 
-        elif reason is StreamCloseReason.CONNECTION_LOST:
+        elif reason in (
+            StreamCloseReason.CONNECTION_LOST,
+            StreamCloseReason.DECOMPRESSION_FAILED,
+        ):
             self._deferred_response.errback(ResponseFailed(errors))
 
         elif reason is StreamCloseReason.INACTIVE:
@@ -474,7 +558,14 @@ class Stream:
         and fires the response deferred callback with the
         generated response instance"""
 
+        if self._timings is not None:
+            self._timings["end"] = time()
+
         body = self._response["body"].getvalue()
+        flags = None
+        if self._response["body"].decompressor is not None:
+            del self._response["headers"][b"Content-Encoding"]
+            flags = ["decompressed"]
         response_cls = responsetypes.from_args(
             headers=self._response["headers"],
             url=self._request.url,
@@ -486,6 +577,7 @@ class Stream:
             status=int(self._response["headers"][":status"]),
             headers=self._response["headers"],
             body=body,
+            flags=flags,
             request=self._request,
             certificate=self._protocol.metadata["certificate"],
             ip_address=self._protocol.metadata["ip_address"],
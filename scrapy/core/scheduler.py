@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import logging
+import shutil
 from abc import abstractmethod
 from pathlib import Path
+from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any, cast
 from warnings import warn
 
@@ -148,6 +150,15 @@ class Scheduler(BaseScheduler):
     :ref:`Start requests <start-requests>` are stored into separate internal
     queues by default, and :ref:`ordered differently <start-request-order>`.
 
+    If :setting:`SCHEDULER_MEMORY_WINDOW_SIZE` is set, the scheduler works in
+    a hybrid mode instead: up to that many requests are kept in the
+    memory-based priority queue, and the rest are spilled to the disk-based
+    priority queue, which uses a temporary directory if :setting:`JOBDIR` is
+    not set. Whenever the memory-based priority queue falls to half its size
+    limit, it is refilled with requests from the disk-based priority queue.
+    When the scheduler is closed and :setting:`JOBDIR` is set, requests in
+    memory are moved to disk so that the crawl can be resumed.
+
     Duplicate requests are filtered out with an instance of
     :setting:`DUPEFILTER_CLASS`.
 
@@ -219,6 +230,12 @@ class Scheduler(BaseScheduler):
     order. Lowering those settings to ``1`` enforces the desired order except
     for the very first request, but it significantly slows down the crawl as a
     whole.
+
+    In hybrid mode (:setting:`SCHEDULER_MEMORY_WINDOW_SIZE`), priority order
+    across the memory-based and the disk-based priority queues is only kept
+    with the default :setting:`SCHEDULER_PRIORITY_QUEUE`. With other priority
+    queues, a request spilled to disk may be sent after lower-priority
+    requests that were already in memory.
     """
 
     @classmethod
@@ -296,6 +313,14 @@ class Scheduler(BaseScheduler):
         self._smqclass: type[BaseQueue] | None = self._get_start_queue_cls(
             crawler, "MEMORY"
         )
+        self._window_size: int = (
+            crawler.settings.getint("SCHEDULER_MEMORY_WINDOW_SIZE") if crawler else 0
+        )
+        self._window_bytes: int = (
+            crawler.settings.getint("SCHEDULER_MEMORY_WINDOW_BYTES") if crawler else 0
+        )
+        self._mq_bytes: int = 0
+        self._spilldir: str | None = None
 
     def _get_start_queue_cls(
         self, crawler: Crawler | None, queue: str
@@ -318,6 +343,8 @@ class Scheduler(BaseScheduler):
         """
         self.spider: Spider = spider
         self.mqs: ScrapyPriorityQueue = self._mq()
+        if self._window_size and not self.dqdir:
+            self._spilldir = self.dqdir = mkdtemp(prefix="scrapy-spill-")
         self.dqs: ScrapyPriorityQueue | None = self._dq() if self.dqdir else None
         return self.df.open()
 
@@ -326,29 +353,42 @@ class Scheduler(BaseScheduler):
         (1) dump pending requests to disk if there is a disk queue
         (2) return the result of the dupefilter's ``close`` method
         """
+        if self._window_size and not self._spilldir:
+            while (request := self.mqs.pop()) is not None:
+                if self._dqpush(request):
+                    assert self.stats is not None
+                    self.stats.inc_value("scheduler/spilled", spider=self.spider)
         if self.dqs is not None:
             state = self.dqs.close()
             assert isinstance(self.dqdir, str)
             self._write_dqs_state(self.dqdir, state)
+        if self._spilldir:
+            shutil.rmtree(self._spilldir, ignore_errors=True)
+            self._spilldir = self.dqdir = None
         return self.df.close(reason)
 
     def enqueue_request(self, request: Request) -> bool:
         """
         Unless the received request is filtered out by the Dupefilter, attempt to push
         it into the disk queue, falling back to pushing it into the memory queue.
+        In hybrid mode, the request is pushed into the memory queue instead
+        while the memory queue is not full.
 
         Increment the appropriate stats, such as: ``scheduler/enqueued``,
-        ``scheduler/enqueued/disk``, ``scheduler/enqueued/memory``.
+        ``scheduler/enqueued/disk``, ``scheduler/enqueued/memory``,
+        ``scheduler/spilled``.
 
         Return ``True`` if the request was stored successfully, ``False`` otherwise.
         """
         if not request.dont_filter and self.df.request_seen(request):
             self.df.log(request, self.spider)
             return False
-        dqok = self._dqpush(request)
         assert self.stats is not None
+        dqok = (not self._window_size or self._window_full()) and self._dqpush(request)
         if dqok:
             self.stats.inc_value("scheduler/enqueued/disk", spider=self.spider)
+            if self._window_size:
+                self.stats.inc_value("scheduler/spilled", spider=self.spider)
         else:
             self._mqpush(request)
             self.stats.inc_value("scheduler/enqueued/memory", spider=self.spider)
@@ -361,10 +401,16 @@ class Scheduler(BaseScheduler):
         falling back to the disk queue if the memory queue is empty.
         Return ``None`` if there are no more enqueued requests.
 
+        In hybrid mode, the memory queue is first refilled from the disk queue
+        if it is at or below half its size limit.
+
         Increment the appropriate stats, such as: ``scheduler/dequeued``,
-        ``scheduler/dequeued/disk``, ``scheduler/dequeued/memory``.
+        ``scheduler/dequeued/disk``, ``scheduler/dequeued/memory``,
+        ``scheduler/refilled``.
         """
-        request: Request | None = self.mqs.pop()
+        if self._window_size and len(self.mqs) <= self._window_size // 2:
+            self._refill()
+        request: Request | None = None if self._dqs_take_precedence() else self._mqpop()
         assert self.stats is not None
         if request is not None:
             self.stats.inc_value("scheduler/dequeued/memory", spider=self.spider)
@@ -408,6 +454,47 @@ class Scheduler(BaseScheduler):
 
     def _mqpush(self, request: Request) -> None:
         self.mqs.push(request)
+        if self._window_bytes:
+            self._mq_bytes += self._request_size(request)
+
+    def _mqpop(self) -> Request | None:
+        request = self.mqs.pop()
+        if request is not None and self._window_bytes:
+            self._mq_bytes -= self._request_size(request)
+        return request
+
+    @staticmethod
+    def _request_size(request: Request) -> int:
+        """Return a cheap estimate of the memory used by a request."""
+        return len(request.url) + len(request.body)
+
+    def _window_full(self) -> bool:
+        return len(self.mqs) >= self._window_size or bool(
+            self._window_bytes and self._mq_bytes >= self._window_bytes
+        )
+
+    def _dqs_take_precedence(self) -> bool:
+        """Return ``True`` in hybrid mode if the disk queue holds a request
+        with a higher priority than any request in the memory queue."""
+        if not self._window_size or self.dqs is None:
+            return False
+        dqprio = getattr(self.dqs, "curprio", None)
+        mqprio = getattr(self.mqs, "curprio", None)
+        return dqprio is not None and mqprio is not None and dqprio < mqprio
+
+    def _refill(self) -> None:
+        """Move requests from the disk queue into the memory queue until the
+        memory queue is full or the disk queue is empty."""
+        refilled = 0
+        while not self._window_full():
+            request = self._dqpop()
+            if request is None:
+                break
+            self._mqpush(request)
+            refilled += 1
+        if refilled:
+            assert self.stats is not None
+            self.stats.inc_value("scheduler/refilled", refilled, spider=self.spider)
 
     def _dqpop(self) -> Request | None:
         if self.dqs is not None:
@@ -41,6 +41,7 @@ from scrapy.utils.reactor import (
     verify_installed_asyncio_event_loop,
     verify_installed_reactor,
 )
+from scrapy.utils.url import _configure_canonicalize_url_cache_size
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Generator, Iterable
@@ -109,6 +110,14 @@ class Crawler:
         lf_cls: type[LogFormatter] = load_object(self.settings["LOG_FORMATTER"])
         self.logformatter = lf_cls.from_crawler(self)
 
+        url_cache_size = self.settings.getint("CANONICALIZE_URL_CACHE_SIZE")
+        if not _configure_canonicalize_url_cache_size(url_cache_size):
+            logger.warning(
+                "Ignoring CANONICALIZE_URL_CACHE_SIZE=%(size)s: the URL "
+                "canonicalization cache is shared by all crawlers of the "
+                "process and its size was already set by another crawler.",
+                {"size": url_cache_size},
+            )
         self.request_fingerprinter = build_from_crawler(
             load_object(self.settings["REQUEST_FINGERPRINTER_CLASS"]),
             self,
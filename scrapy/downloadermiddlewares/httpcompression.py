@@ -89,6 +89,14 @@ class HttpCompressionMiddleware:
     ) -> Request | Response:
         if request.method == "HEAD":
             return response
+        if "decompressed" in response.flags:
+            # Decompressed by the download handler, see COMPRESSION_STREAMING.
+            if self.stats:
+                self.stats.inc_value(
+                    "httpcompression/response_bytes", len(response.body), spider=spider
+                )
+                self.stats.inc_value("httpcompression/response_count", spider=spider)
+            return response
         if isinstance(response, Response):
             content_encoding = response.headers.getlist("Content-Encoding")
             if content_encoding:
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from typing import TYPE_CHECKING
 
 from twisted.web import http
 
+from scrapy.core.downloader.timings import get_phase_durations
 from scrapy.exceptions import NotConfigured
 from scrapy.utils.python import global_object_name, to_bytes
 from scrapy.utils.request import request_httprepr
@@ -18,6 +20,23 @@ if TYPE_CHECKING:
     from scrapy.statscollectors import StatsCollector
 
 
+# Upper bounds, in seconds, of the buckets of the download phase histograms,
+# and the names of those buckets, which include an unbounded last one.
+_TIMING_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_TIMING_BUCKET_NAMES = (
+    "<10ms",
+    "<50ms",
+    "<100ms",
+    "<250ms",
+    "<500ms",
+    "<1s",
+    "<2.5s",
+    "<5s",
+    "<10s",
+    ">=10s",
+)
+
+
 def get_header_size(
     headers: dict[str, list[str | bytes] | tuple[str | bytes, ...]],
 ) -> int:
@@ -48,6 +67,10 @@ class DownloaderStats:
     def process_request(
         self, request: Request, spider: Spider
     ) -> Request | Response | None:
+        # Timings of a previous download, copied with the meta of a retried or
+        # redirected request, must not be counted again if the response does
+        # not come from a download handler, e.g. from the HTTP cache.
+        request.meta.pop("download_timings", None)
         self.stats.inc_value("downloader/request_count", spider=spider)
         self.stats.inc_value(
             f"downloader/request_method_count/{request.method}", spider=spider
@@ -71,8 +94,22 @@ class DownloaderStats:
         )
         # response.body + b"\r\n"+ response.header + b"\r\n" + response.status
         self.stats.inc_value("downloader/response_bytes", reslen, spider=spider)
+        timings = request.meta.get("download_timings")
+        if timings is not None:
+            self._inc_timing_stats(request.meta.get("download_slot"), timings, spider)
         return response
 
+    def _inc_timing_stats(
+        self, slot: str | None, timings: dict[str, float], spider: Spider
+    ) -> None:
+        for phase, duration in get_phase_durations(timings).items():
+            prefix = f"downloader/timings/{slot}/{phase}"
+            bucket = _TIMING_BUCKET_NAMES[bisect_right(_TIMING_BUCKETS, duration)]
+            self.stats.inc_value(f"{prefix}/{bucket}", spider=spider)
+            self.stats.inc_value(
+                f"{prefix}/time_ms", round(duration * 1000), spider=spider
+            )
+
     def process_exception(
         self, request: Request, exception: Exception, spider: Spider
     ) -> Request | Response | None:
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
 import logging
+import math
+import mmap
+import shutil
+import struct
 import warnings
+from bisect import bisect_left
 from pathlib import Path
+from tempfile import mkdtemp
+from time import time
 from typing import TYPE_CHECKING
 from warnings import warn
 
+from twisted.internet.defer import succeed
+from twisted.internet.threads import deferToThread
+
 from scrapy.exceptions import ScrapyDeprecationWarning
+from scrapy.utils.defer import deferred_from_coro, maybe_deferred_to_future
 from scrapy.utils.job import job_dir
+from scrapy.utils.log import failure_to_exc_info
 from scrapy.utils.request import (
     RequestFingerprinter,
     RequestFingerprinterProtocol,
@@ -15,6 +29,8 @@ from scrapy.utils.request import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
     from twisted.internet.defer import Deferred
 
     # typing.Self requires Python 3.11
@@ -24,6 +40,7 @@ if TYPE_CHECKING:
     from scrapy.http.request import Request
     from scrapy.settings import BaseSettings
     from scrapy.spiders import Spider
+    from scrapy.statscollectors import StatsCollector
 
 
 class BaseDupeFilter:
@@ -61,6 +78,146 @@ class BaseDupeFilter:
         )
 
 
+def _fingerprint_key(fingerprint: str) -> bytes:
+    """Return the fixed-size binary form of a request fingerprint as returned
+    by :meth:`RFPDupeFilter.request_fingerprint`."""
+    try:
+        key = bytes.fromhex(fingerprint)
+    except ValueError:
+        key = fingerprint.encode()
+    if len(key) != _FingerprintTable.record_size:
+        key = hashlib.sha1(key).digest()  # noqa: S324
+    return key
+
+
+class _FingerprintTable:
+    """Set of 20-byte fingerprints stored as an open-addressing hash table in
+    a memory-mapped file.
+
+    Lookups and insertions only read a few records, so resuming a job does not
+    require loading the whole file into memory.
+    """
+
+    record_size = 20
+    _header = struct.Struct("<4sBB?xQQ")
+    _magic = b"SRFP"
+    _version = 1
+    _empty = bytes(record_size)
+    _initial_slots = 1 << 16
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        if not path.exists():
+            self._create(path, self._initial_slots)
+        self._open()
+        magic, version, record_size, self._has_empty, self.slots, self.count = (
+            self._header.unpack_from(self.mm)
+        )
+        if (
+            magic != self._magic
+            or version != self._version
+            or record_size != self.record_size
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a fingerprint table file")
+
+    def _create(self, path: Path, slots: int) -> None:
+        with path.open("wb") as file:
+            file.write(
+                self._header.pack(
+                    self._magic, self._version, self.record_size, False, slots, 0
+                )
+            )
+            file.truncate(self._header.size + slots * self.record_size)
+
+    def _open(self) -> None:
+        self.file = self.path.open("r+b")
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+
+    def _write_header(self) -> None:
+        self._header.pack_into(
+            self.mm,
+            0,
+            self._magic,
+            self._version,
+            self.record_size,
+            self._has_empty,
+            self.slots,
+            self.count,
+        )
+
+    def _find(self, key: bytes) -> tuple[int, bool]:
+        """Return the offset of the record holding *key* or, if missing, of
+        the empty record where it would go, and whether it was found."""
+        mm, size, start, empty = (
+            self.mm,
+            self.record_size,
+            self._header.size,
+            self._empty,
+        )
+        mask = self.slots - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            offset = start + slot * size
+            record = mm[offset : offset + size]
+            if record == key:
+                return offset, True
+            if record == empty:
+                return offset, False
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key: bytes) -> bool:
+        if key == self._empty:
+            return self._has_empty
+        return self._find(key)[1]
+
+    def add(self, key: bytes) -> None:
+        if key == self._empty:
+            self._has_empty = True
+            self._write_header()
+            return
+        offset, found = self._find(key)
+        if found:
+            return
+        self.mm[offset : offset + self.record_size] = key
+        self.count += 1
+        if self.count * 2 > self.slots:
+            self._grow()
+        else:
+            self._write_header()
+
+    def _grow(self) -> None:
+        """Rehash every record into a new file with twice as many slots."""
+        size, start = self.record_size, self._header.size
+        old_mm, old_file, path = self.mm, self.file, self.path
+        self.path = path.with_name(path.name + ".tmp")
+        self.slots *= 2
+        self._create(self.path, self.slots)
+        self._open()
+        for offset in range(start, len(old_mm), size):
+            record = old_mm[offset : offset + size]
+            if record != self._empty:
+                new_offset = self._find(record)[0]
+                self.mm[new_offset : new_offset + size] = record
+        self._write_header()
+        self.mm.flush()
+        old_mm.close()
+        old_file.close()
+        self.path = self.path.replace(path)
+
+    def __len__(self) -> int:
+        return self.count + self._has_empty
+
+    def flush(self) -> None:
+        self._write_header()
+        self.mm.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.mm.close()
+        self.file.close()
+
+
 class RFPDupeFilter(BaseDupeFilter):
     """Duplicate request filtering class (:setting:`DUPEFILTER_CLASS`) that
     filters out requests with the canonical
@@ -133,9 +290,10 @@ class RFPDupeFilter(BaseDupeFilter):
         """Returns a string that uniquely identifies the specified request."""
         return self.fingerprinter.fingerprint(request).hex()
 
-    def close(self, reason: str) -> None:
+    def close(self, reason: str) -> Deferred[None] | None:
         if self.file:
             self.file.close()
+        return None
 
     def log(self, request: Request, spider: Spider) -> None:
         if self.debug:
@@ -153,3 +311,635 @@ class RFPDupeFilter(BaseDupeFilter):
 
         assert spider.crawler.stats
         spider.crawler.stats.inc_value("dupefilter/filtered", spider=spider)
+
+
+class MmapDupeFilter(RFPDupeFilter):
+    """Duplicate request filtering class (:setting:`DUPEFILTER_CLASS`) that,
+    when :setting:`JOBDIR` is set, keeps request fingerprints in
+    ``requests.seen.bin``, a hash table of binary fingerprints that is
+    memory-mapped instead of loaded into memory on resume.
+
+    The first time it is used in a job directory, the fingerprints of an
+    existing ``requests.seen`` file written by
+    :class:`~scrapy.dupefilters.RFPDupeFilter` are imported into the table.
+    ``requests.seen`` is left in place, but it is not updated afterwards.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        debug: bool = False,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+    ) -> None:
+        super().__init__(debug=debug, fingerprinter=fingerprinter)
+        self.table: set[bytes] | _FingerprintTable = set()
+        if path:
+            table_path = Path(path, "requests.seen.bin")
+            is_new = not table_path.exists()
+            self.table = _FingerprintTable(table_path)
+            if is_new:
+                self._import(Path(path, "requests.seen"))
+
+    def _import(self, path: Path) -> None:
+        """Import the fingerprints of a ``requests.seen`` text file."""
+        if not path.exists():
+            return
+        assert isinstance(self.table, _FingerprintTable)
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                self.table.add(_fingerprint_key(line.rstrip()))
+        self.table.flush()
+
+    def request_seen(self, request: Request) -> bool:
+        fp = _fingerprint_key(self.request_fingerprint(request))
+        if fp in self.table:
+            return True
+        self.table.add(fp)
+        return False
+
+    def close(self, reason: str) -> None:
+        if isinstance(self.table, _FingerprintTable):
+            self.table.close()
+
+
+class _BloomFilter:
+    """Fixed-capacity Bloom filter whose bit array lives either in memory or,
+    when *path* is given, in a memory-mapped file that is reused on resume."""
+
+    _header = struct.Struct("<4sBBxxQQQ")
+    _magic = b"SBLM"
+    _version = 1
+
+    def __init__(
+        self, capacity: int, error_rate: float, path: Path | None = None
+    ) -> None:
+        self.file = None
+        self.bits: bytearray | mmap.mmap
+        if path is not None and path.exists():
+            self.file = path.open("r+b")
+            self.bits = mmap.mmap(self.file.fileno(), 0)
+            (
+                magic,
+                version,
+                self.num_hashes,
+                self.num_bits,
+                self.capacity,
+                self.count,
+            ) = self._header.unpack_from(self.bits)
+            if magic != self._magic or version != self._version:
+                self.close()
+                raise ValueError(f"{path} is not a Bloom filter file")
+            return
+        self.capacity = capacity
+        self.count = 0
+        num_bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.num_bits = max(8, math.ceil(num_bits / 8) * 8)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = self._header.size + self.num_bits // 8
+        if path is None:
+            self.bits = bytearray(size)
+        else:
+            self.file = path.open("w+b")
+            self.file.truncate(size)
+            self.bits = mmap.mmap(self.file.fileno(), 0)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        self._header.pack_into(
+            self.bits,
+            0,
+            self._magic,
+            self._version,
+            self.num_hashes,
+            self.num_bits,
+            self.capacity,
+            self.count,
+        )
+
+    @staticmethod
+    def hashes(key: bytes) -> tuple[int, int]:
+        """Return the two hashes that bit positions are derived from, taken
+        from a binary fingerprint (see :func:`_fingerprint_key`)."""
+        return int.from_bytes(key[:8], "little"), int.from_bytes(
+            key[8:16], "little"
+        ) | 1
+
+    def _positions(self, h1: int, h2: int) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing: k positions out of 2 hashes.
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def __contains__(self, hashes: tuple[int, int]) -> bool:
+        bits, offset = self.bits, self._header.size
+        return all(
+            bits[offset + (pos >> 3)] & (1 << (pos & 7))
+            for pos in self._positions(*hashes)
+        )
+
+    def add(self, hashes: tuple[int, int]) -> None:
+        bits, offset = self.bits, self._header.size
+        for pos in self._positions(*hashes):
+            bits[offset + (pos >> 3)] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def fill_ratio(self) -> float:
+        """Expected fraction of bits set for the current item count."""
+        return 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+
+    @property
+    def error_rate(self) -> float:
+        """Expected false positive rate for the current item count."""
+        return self.fill_ratio**self.num_hashes
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self._write_header()
+        assert isinstance(self.bits, mmap.mmap)
+        self.bits.flush()
+        self.bits.close()
+        self.file.close()
+        self.file = None
+
+
+class BloomDupeFilter(RFPDupeFilter):
+    """Duplicate request filtering class (:setting:`DUPEFILTER_CLASS`) that
+    keeps request fingerprints in a scalable Bloom filter instead of a set.
+
+    Memory usage stays at a few bits per request, at the cost of filtering out
+    a small, configurable fraction of new requests as false positives (see
+    :setting:`DUPEFILTER_BLOOM_ERROR_RATE`). When :setting:`JOBDIR` is set, the
+    filter is stored in memory-mapped files inside ``requests.bloom``.
+    """
+
+    #: Capacity growth factor of each new filter.
+    growth = 2
+    #: Error rate tightening ratio of each new filter.
+    tightening = 0.5
+    #: Number of new fingerprints between stats updates.
+    stats_interval = 10_000
+
+    def __init__(
+        self,
+        path: str | None = None,
+        debug: bool = False,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        stats: StatsCollector | None = None,
+    ) -> None:
+        super().__init__(debug=debug, fingerprinter=fingerprinter)
+        if capacity < 1:
+            raise ValueError(f"Bloom filter capacity must be positive, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"Bloom filter error rate must be between 0 and 1, got {error_rate}"
+            )
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.stats = stats
+        self.path: Path | None = None
+        self.filters: list[_BloomFilter] = []
+        if path:
+            self.path = Path(path, "requests.bloom")
+            self.path.mkdir(parents=True, exist_ok=True)
+            for file in sorted(self.path.glob("*.bloom")):
+                self.filters.append(_BloomFilter(capacity, error_rate, file))
+        if not self.filters:
+            self._add_filter()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        assert crawler.request_fingerprinter
+        settings = crawler.settings
+        return cls(
+            job_dir(settings),
+            settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+            capacity=settings.getint("DUPEFILTER_BLOOM_CAPACITY"),
+            error_rate=settings.getfloat("DUPEFILTER_BLOOM_ERROR_RATE"),
+            stats=crawler.stats,
+        )
+
+    def _add_filter(self) -> None:
+        # Each new filter is larger and stricter than the previous one, so
+        # that the compound error rate stays below self.error_rate.
+        n = len(self.filters)
+        capacity = self.capacity * self.growth**n
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening**n
+        path = None if self.path is None else self.path / f"{n:05d}.bloom"
+        self.filters.append(_BloomFilter(capacity, error_rate, path))
+        self._update_stats()
+
+    def request_seen(self, request: Request) -> bool:
+        hashes = _BloomFilter.hashes(
+            _fingerprint_key(self.request_fingerprint(request))
+        )
+        if any(hashes in bloom for bloom in self.filters):
+            return True
+        bloom = self.filters[-1]
+        if bloom.count >= bloom.capacity:
+            self._add_filter()
+            bloom = self.filters[-1]
+        bloom.add(hashes)
+        if bloom.count % self.stats_interval == 0:
+            self._update_stats()
+        return False
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """Probability that a new request is wrongly reported as seen."""
+        p = 1.0
+        for bloom in self.filters:
+            p *= 1 - bloom.error_rate
+        return 1 - p
+
+    @property
+    def fill_ratio(self) -> float:
+        """Expected fraction of set bits across all filters."""
+        total = sum(bloom.num_bits for bloom in self.filters)
+        return sum(bloom.fill_ratio * bloom.num_bits for bloom in self.filters) / total
+
+    def _update_stats(self) -> None:
+        if self.stats is None:
+            return
+        self.stats.set_value("dupefilter/bloom/filters", len(self.filters))
+        self.stats.set_value(
+            "dupefilter/bloom/count", sum(bloom.count for bloom in self.filters)
+        )
+        self.stats.set_value("dupefilter/bloom/fill_ratio", self.fill_ratio)
+        self.stats.set_value(
+            "dupefilter/bloom/estimated_error_rate", self.estimated_error_rate
+        )
+
+    def close(self, reason: str) -> None:
+        self._update_stats()
+        for bloom in self.filters:
+            bloom.close()
+
+
+class _SortedRun:
+    """Immutable file of sorted binary fingerprints, with a Bloom filter that
+    answers most negative lookups without touching the file."""
+
+    size = _FingerprintTable.record_size
+
+    def __init__(self, path: Path, level: int) -> None:
+        self.path = path
+        self.level = level
+        self.bloom = _BloomFilter(1, 0.5, path.with_suffix(".bloom"))
+        self.file = path.open("rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def write(
+        cls,
+        path: Path,
+        level: int,
+        keys: Iterable[bytes],
+        count: int,
+        error_rate: float,
+    ) -> Self:
+        """Write *keys*, which must be sorted, to a new run at *path*.
+        *count* is an upper bound of the number of keys, used to size the
+        Bloom filter."""
+        bloom = _BloomFilter(count, error_rate, path.with_suffix(".bloom"))
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as file:
+            chunk: list[bytes] = []
+            previous = None
+            for key in keys:
+                if key == previous:
+                    continue
+                previous = key
+                chunk.append(key)
+                bloom.add(bloom.hashes(key))
+                if len(chunk) == 65536:
+                    file.write(b"".join(chunk))
+                    chunk.clear()
+            file.write(b"".join(chunk))
+        bloom.close()
+        tmp_path.replace(path)
+        return cls(path, level)
+
+    def __len__(self) -> int:
+        return len(self.mm) // self.size
+
+    def __getitem__(self, index: int) -> bytes:
+        offset = index * self.size
+        return self.mm[offset : offset + self.size]
+
+    def __iter__(self) -> Iterator[bytes]:
+        mm, size = self.mm, self.size
+        for offset in range(0, len(mm), size):
+            yield mm[offset : offset + size]
+
+    def __contains__(self, key: bytes) -> bool:
+        if self.bloom.hashes(key) not in self.bloom:
+            return False
+        index = bisect_left(self, key)
+        return index < len(self) and self[index] == key
+
+    def close(self) -> None:
+        self.bloom.close()
+        self.mm.close()
+        self.file.close()
+
+    def remove(self) -> None:
+        self.close()
+        self.path.unlink()
+        self.path.with_suffix(".bloom").unlink()
+
+
+class LSMDupeFilter(RFPDupeFilter):
+    """Duplicate request filtering class (:setting:`DUPEFILTER_CLASS`) that
+    keeps request fingerprints on disk, for crawls with more requests than
+    fit in memory.
+
+    New fingerprints go into an in-memory table of up to
+    :setting:`DUPEFILTER_LSM_MEMTABLE_SIZE` fingerprints, which is then
+    written to disk as a sorted run in a thread. Each run has a Bloom filter
+    (see :setting:`DUPEFILTER_BLOOM_ERROR_RATE`) that avoids most disk lookups.
+    Whenever :setting:`DUPEFILTER_LSM_FANOUT` runs of the same size exist,
+    they are merged in a thread into a single larger run.
+
+    Runs are stored in ``requests.lsm`` inside :setting:`JOBDIR` or, if it is
+    not set, in a temporary directory removed on close.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        debug: bool = False,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+        memtable_size: int = 1_000_000,
+        fanout: int = 8,
+        error_rate: float = 0.001,
+        stats: StatsCollector | None = None,
+    ) -> None:
+        super().__init__(debug=debug, fingerprinter=fingerprinter)
+        if memtable_size < 1:
+            raise ValueError(f"LSM memtable size must be positive, got {memtable_size}")
+        if fanout < 2:
+            raise ValueError(f"LSM fanout must be at least 2, got {fanout}")
+        self.memtable_size = memtable_size
+        self.fanout = fanout
+        self.error_rate = error_rate
+        self.stats = stats
+        self._tmpdir: str | None = None
+        if path:
+            self.path = Path(path, "requests.lsm")
+        else:
+            self._tmpdir = mkdtemp(prefix="scrapy-lsm-")
+            self.path = Path(self._tmpdir)
+        self.memtable: set[bytes] = set()
+        self.flushing: list[set[bytes]] = []
+        self.runs: list[_SortedRun] = []
+        self._seq = 0
+        self._tasks: Deferred[None] = succeed(None)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        assert crawler.request_fingerprinter
+        settings = crawler.settings
+        return cls(
+            job_dir(settings),
+            settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+            memtable_size=settings.getint("DUPEFILTER_LSM_MEMTABLE_SIZE"),
+            fanout=settings.getint("DUPEFILTER_LSM_FANOUT"),
+            error_rate=settings.getfloat("DUPEFILTER_BLOOM_ERROR_RATE"),
+            stats=crawler.stats,
+        )
+
+    def open(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        for tmp_path in self.path.glob("*.tmp"):
+            tmp_path.unlink()
+        for run_path in sorted(self.path.glob("*.run")):
+            level, seq = run_path.stem.split("-")
+            self.runs.append(_SortedRun(run_path, int(level)))
+            self._seq = max(self._seq, int(seq))
+        self._set_stats()
+
+    def request_seen(self, request: Request) -> bool:
+        fp = _fingerprint_key(self.request_fingerprint(request))
+        if (
+            fp in self.memtable
+            or any(fp in table for table in self.flushing)
+            or any(fp in run for run in self.runs)
+        ):
+            return True
+        self.memtable.add(fp)
+        if len(self.memtable) >= self.memtable_size:
+            self._flush()
+        return False
+
+    def _run_path(self, level: int) -> Path:
+        self._seq += 1
+        return self.path / f"{level}-{self._seq:08d}.run"
+
+    def _schedule(self, task: Callable[[], Deferred[None] | None]) -> None:
+        """Run *task* after every previously scheduled task."""
+        self._tasks.addCallback(lambda _: task())
+        self._tasks.addErrback(
+            lambda failure: self.logger.error(
+                "Error writing duplicate filter runs",
+                exc_info=failure_to_exc_info(failure),
+            )
+        )
+
+    def _flush(self) -> None:
+        """Write the memory table to a new run in a thread."""
+        table, self.memtable = self.memtable, set()
+        self.flushing.append(table)
+
+        def write(path: Path, keys: list[bytes]) -> _SortedRun:
+            keys.sort()
+            return _SortedRun.write(path, 0, keys, len(keys), self.error_rate)
+
+        def flush() -> Deferred[None]:
+            # The table is still read by request_seen() meanwhile, so the
+            # thread sorts a copy of it.
+            dfd = deferToThread(write, self._run_path(0), list(table))
+            dfd.addCallback(flushed)
+            return dfd
+
+        def flushed(run: _SortedRun) -> Deferred[None] | None:
+            self.flushing.remove(table)
+            self.runs.append(run)
+            self._inc_stat("flushes")
+            return self._merge()
+
+        self._schedule(flush)
+
+    def _merge(self) -> Deferred[None] | None:
+        """Merge, in a thread, the runs of the first level that has
+        :attr:`fanout` runs into a run of the next level.
+
+        It must only be called from a scheduled task, so that no other task
+        changes :attr:`runs` meanwhile.
+        """
+        for level in sorted({run.level for run in self.runs}):
+            runs = [run for run in self.runs if run.level == level]
+            if len(runs) >= self.fanout:
+                break
+        else:
+            self._set_stats()
+            return None
+
+        def merged(run: _SortedRun) -> Deferred[None] | None:
+            self.runs = [r for r in self.runs if r not in runs]
+            self.runs.append(run)
+            for old_run in runs:
+                old_run.remove()
+            self._inc_stat("merges")
+            return self._merge()
+
+        dfd = deferToThread(
+            _SortedRun.write,
+            self._run_path(level + 1),
+            level + 1,
+            heapq.merge(*runs),
+            sum(len(run) for run in runs),
+            self.error_rate,
+        )
+        dfd.addCallback(merged)
+        return dfd
+
+    def _inc_stat(self, key: str) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"dupefilter/lsm/{key}")
+
+    def _set_stats(self) -> None:
+        if self.stats is not None:
+            self.stats.set_value("dupefilter/lsm/runs", len(self.runs))
+
+    async def _close(self) -> None:
+        if self.memtable:
+            self._flush()
+        await maybe_deferred_to_future(self._tasks)
+        for run in self.runs:
+            run.close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def close(self, reason: str) -> Deferred[None]:
+        return deferred_from_coro(self._close())
+
+
+class ExpiringDupeFilter(RFPDupeFilter):
+    """Duplicate request filtering class (:setting:`DUPEFILTER_CLASS`) that
+    forgets requests after some time, for spiders that revisit pages
+    periodically.
+
+    A request is filtered out only if an equivalent request was seen less than
+    :setting:`DUPEFILTER_TTL` seconds ago, or :reqmeta:`dupefilter_ttl`
+    seconds for requests that set that meta key. Expired fingerprints are
+    evicted a few at a time on each call to :meth:`request_seen`, so memory
+    usage depends on the number of requests seen within the TTL, not on the
+    total number of requests.
+
+    When :setting:`JOBDIR` is set, unexpired fingerprints are saved to
+    ``requests.expiring`` on close.
+    """
+
+    _record = struct.Struct("<20sQ")
+    #: Maximum number of expired fingerprints evicted per request.
+    evict_batch = 100
+
+    def __init__(
+        self,
+        path: str | None = None,
+        debug: bool = False,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+        ttl: float = 0,
+        stats: StatsCollector | None = None,
+    ) -> None:
+        super().__init__(debug=debug, fingerprinter=fingerprinter)
+        self.ttl = ttl
+        self.stats = stats
+        #: Expiration time of each fingerprint, in whole seconds since the
+        #: epoch, 0 meaning it never expires.
+        self.expiration: dict[bytes, int] = {}
+        self._heap: list[tuple[int, bytes]] = []
+        self.path = Path(path, "requests.expiring") if path else None
+        if self.path and self.path.exists():
+            self._load(self.path)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        assert crawler.request_fingerprinter
+        settings = crawler.settings
+        return cls(
+            job_dir(settings),
+            settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+            ttl=settings.getfloat("DUPEFILTER_TTL"),
+            stats=crawler.stats,
+        )
+
+    def _load(self, path: Path) -> None:
+        now = time()
+        data = path.read_bytes()
+        for fp, expiration in self._record.iter_unpack(data):
+            if not expiration or expiration > now:
+                self._add(fp, expiration)
+
+    def _add(self, fp: bytes, expiration: int) -> None:
+        self.expiration[fp] = expiration
+        if expiration:
+            heapq.heappush(self._heap, (expiration, fp))
+
+    def _evict(self, now: float) -> None:
+        heap = self._heap
+        evicted = 0
+        for _ in range(self.evict_batch):
+            if not heap or heap[0][0] > now:
+                break
+            expiration, fp = heapq.heappop(heap)
+            # Skip heap entries of fingerprints that were seen again.
+            if self.expiration.get(fp) == expiration:
+                del self.expiration[fp]
+                evicted += 1
+        if evicted:
+            self._inc_expired(evicted)
+
+    def _inc_expired(self, count: int) -> None:
+        if self.stats is not None:
+            self.stats.inc_value("dupefilter/expired", count)
+
+    def request_seen(self, request: Request) -> bool:
+        now = time()
+        self._evict(now)
+        fp = _fingerprint_key(self.request_fingerprint(request))
+        expiration = self.expiration.get(fp)
+        if expiration is not None:
+            if not expiration or expiration > now:
+                return True
+            self._inc_expired(1)
+        ttl = request.meta.get("dupefilter_ttl", self.ttl)
+        self._add(fp, self._expiration(now, ttl))
+        return False
+
+    def _expiration(self, now: float, ttl: float) -> int:
+        if not ttl:
+            return 0
+        expiration = now + ttl
+        # Expiration times that cannot be saved are too far in the future
+        # to ever be reached.
+        if expiration >= 2**64:
+            return 0
+        return max(1, math.ceil(expiration))
+
+    def close(self, reason: str) -> None:
+        if self.path is None:
+            return
+        with self.path.open("wb") as file:
+            for fp, expiration in self.expiration.items():
+                file.write(self._record.pack(fp, expiration))
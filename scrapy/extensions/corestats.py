@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
 from scrapy import Spider, signals
+from scrapy.utils.url import canonicalize_url_cache_info
 
 if TYPE_CHECKING:
     # typing.Self requires Python 3.11
@@ -21,6 +22,8 @@ class CoreStats:
     def __init__(self, stats: StatsCollector):
         self.stats: StatsCollector = stats
         self.start_time: datetime | None = None
+        self._url_cache_hits: int = 0
+        self._url_cache_misses: int = 0
 
     @classmethod
     def from_crawler(cls, crawler: Crawler) -> Self:
@@ -36,6 +39,9 @@ class CoreStats:
     def spider_opened(self, spider: Spider) -> None:
         self.start_time = datetime.now(tz=timezone.utc)
         self.stats.set_value("start_time", self.start_time, spider=spider)
+        cache_info = canonicalize_url_cache_info()
+        self._url_cache_hits = cache_info.hits
+        self._url_cache_misses = cache_info.misses
 
     def spider_closed(self, spider: Spider, reason: str) -> None:
         assert self.start_time is not None
@@ -47,6 +53,19 @@ class CoreStats:
         )
         self.stats.set_value("finish_time", finish_time, spider=spider)
         self.stats.set_value("finish_reason", reason, spider=spider)
+        # The cache is shared by every crawler of the process, so these stats
+        # also count lookups from other crawlers running at the same time.
+        cache_info = canonicalize_url_cache_info()
+        self.stats.set_value(
+            "canonicalize_url/cache_hits",
+            cache_info.hits - self._url_cache_hits,
+            spider=spider,
+        )
+        self.stats.set_value(
+            "canonicalize_url/cache_misses",
+            cache_info.misses - self._url_cache_misses,
+            spider=spider,
+        )
 
     def item_scraped(self, item: Any, spider: Spider) -> None:
         self.stats.inc_value("item_scraped_count", spider=spider)
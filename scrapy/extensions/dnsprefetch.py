@@ -0,0 +1,144 @@
+"""
+DNS prefetch extension
+
+See documentation in docs/topics/extensions.rst
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from ipaddress import ip_address
+from typing import TYPE_CHECKING, Any
+
+from scrapy import Request, Spider, signals
+from scrapy.exceptions import NotConfigured
+from scrapy.resolver import _in_dnscache
+from scrapy.utils.httpobj import urlparse_cached
+
+if TYPE_CHECKING:
+    # typing.Self requires Python 3.11
+    from typing_extensions import Self
+
+    from scrapy.crawler import Crawler
+    from scrapy.statscollectors import StatsCollector
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_ip_address(hostname: str) -> bool:
+    try:
+        ip_address(hostname)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSPrefetch:
+    """Resolve the hostnames of scheduled requests in the background, so that
+    their first download finds them in the DNS cache."""
+
+    def __init__(self, crawler: Crawler):
+        settings = crawler.settings
+        if not settings.getbool("DNS_PREFETCH_ENABLED"):
+            raise NotConfigured
+        if not settings.getbool("DNSCACHE_ENABLED"):
+            raise NotConfigured("DNS_PREFETCH_ENABLED requires DNSCACHE_ENABLED")
+        self.concurrency: int = settings.getint("DNS_PREFETCH_CONCURRENCY")
+        if self.concurrency < 1:
+            raise NotConfigured(
+                f"DNS_PREFETCH_CONCURRENCY ({self.concurrency!r}) must be at least 1."
+            )
+        self.queue_size: int = settings.getint("DNS_PREFETCH_QUEUE_SIZE")
+        if self.queue_size < 1:
+            raise NotConfigured(
+                f"DNS_PREFETCH_QUEUE_SIZE ({self.queue_size!r}) must be at least 1."
+            )
+        assert crawler.stats
+        self.stats: StatsCollector = crawler.stats
+        self._queue: deque[str] = deque()
+        # Hostnames that are queued or being resolved.
+        self._pending: set[str] = set()
+        # Hostnames resolved by this extension that no request has reached
+        # the downloader for yet.
+        self._prefetched: set[str] = set()
+        self._active: int = 0
+        crawler.signals.connect(self._request_scheduled, signals.request_scheduled)
+        crawler.signals.connect(
+            self._request_reached_downloader, signals.request_reached_downloader
+        )
+        crawler.signals.connect(self._spider_closed, signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        return cls(crawler)
+
+    def _request_scheduled(self, request: Request, spider: Spider) -> None:
+        parsed = urlparse_cached(request)
+        hostname = parsed.hostname
+        if (
+            not hostname
+            or parsed.scheme not in ("http", "https")
+            or _in_dnscache(hostname)
+            or hostname in self._pending
+            or _is_ip_address(hostname)
+        ):
+            return
+        if len(self._pending) + len(self._prefetched) >= self.queue_size:
+            # Prefetching further ahead would only evict earlier prefetched
+            # hostnames from the DNS cache before they are used.
+            self.stats.inc_value("dnsprefetch/skipped")
+            return
+        self._pending.add(hostname)
+        self._queue.append(hostname)
+        self._process_queue()
+
+    def _process_queue(self) -> None:
+        from twisted.internet import reactor
+
+        while self._queue and self._active < self.concurrency:
+            hostname = self._queue.popleft()
+            if _in_dnscache(hostname):
+                # Resolved by a download meanwhile.
+                self._pending.discard(hostname)
+                continue
+            self._active += 1
+            self.stats.inc_value("dnsprefetch/requests")
+            d = reactor.resolve(hostname)
+            d.addCallbacks(
+                self._resolved,
+                self._failed,
+                callbackArgs=(hostname,),
+                errbackArgs=(hostname,),
+            )
+            d.addBoth(self._done, hostname)
+
+    def _resolved(self, result: Any, hostname: str) -> None:
+        self._prefetched.add(hostname)
+        self.stats.inc_value("dnsprefetch/resolved")
+
+    def _failed(self, failure: Any, hostname: str) -> None:
+        logger.debug(
+            "Could not prefetch the DNS records of %(hostname)s: %(error)s",
+            {"hostname": hostname, "error": failure.value},
+        )
+        self.stats.inc_value("dnsprefetch/failed")
+
+    def _done(self, _: Any, hostname: str) -> None:
+        self._pending.discard(hostname)
+        self._active -= 1
+        self._process_queue()
+
+    def _request_reached_downloader(self, request: Request, spider: Spider) -> None:
+        hostname = urlparse_cached(request).hostname
+        if hostname not in self._prefetched:
+            return
+        self._prefetched.discard(hostname)
+        if _in_dnscache(hostname):
+            self.stats.inc_value("dnsprefetch/hits")
+
+    def _spider_closed(self, spider: Spider) -> None:
+        self._queue.clear()
+        self._pending.clear()
+        self._prefetched.clear()
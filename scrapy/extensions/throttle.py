@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary, WeakSet
 
 from scrapy import Request, Spider, signals
 from scrapy.exceptions import NotConfigured
@@ -127,3 +129,165 @@ class AutoThrottle:
             return
 
         slot.delay = new_delay
+
+
+class _SlotStats:
+    """Recent download outcomes of a download slot, for
+    :class:`AdaptiveConcurrency`."""
+
+    def __init__(self, window: int):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.samples: int = 0
+        self.baseline: float | None = None
+        self.since_decrease: int = 0
+        self.concurrency: float = 0.0
+
+
+class AdaptiveConcurrency:
+    """Adjust the concurrency of each download slot at runtime, using
+    additive-increase/multiplicative-decrease (AIMD).
+
+    Every :attr:`window` responses, the concurrency of a slot grows by 1 if
+    the slot had requests waiting and its 90th percentile latency stayed
+    within :setting:`ADAPTIVE_CONCURRENCY_LATENCY_FACTOR` times its baseline
+    latency, and shrinks by :attr:`decrease_factor` otherwise. Responses with
+    a status code in :attr:`backoff_http_codes` and failed downloads, such as
+    timeouts, shrink it immediately.
+    """
+
+    #: Number of latency samples per adjustment.
+    window = 20
+    #: Factor applied to the concurrency of an overloaded slot.
+    decrease_factor = 0.5
+    #: Relative increase of the baseline latency per window, so that it
+    #: follows lasting latency changes.
+    baseline_drift = 0.05
+    backoff_http_codes = frozenset((429, 503))
+
+    def __init__(self, crawler: Crawler):
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_CONCURRENCY_ENABLED"):
+            raise NotConfigured
+        self.crawler: Crawler = crawler
+        self.debug: bool = settings.getbool("ADAPTIVE_CONCURRENCY_DEBUG")
+        self.min_concurrency: int = settings.getint("ADAPTIVE_CONCURRENCY_MIN")
+        self.max_concurrency: int = settings.getint("ADAPTIVE_CONCURRENCY_MAX")
+        self.latency_factor: float = settings.getfloat(
+            "ADAPTIVE_CONCURRENCY_LATENCY_FACTOR"
+        )
+        if not 1 <= self.min_concurrency <= self.max_concurrency:
+            raise NotConfigured(
+                f"ADAPTIVE_CONCURRENCY_MIN ({self.min_concurrency!r}) must be at "
+                f"least 1 and at most ADAPTIVE_CONCURRENCY_MAX "
+                f"({self.max_concurrency!r})."
+            )
+        self._stats: WeakKeyDictionary[Slot, _SlotStats] = WeakKeyDictionary()
+        self._downloaded: WeakSet[Request] = WeakSet()
+        crawler.signals.connect(
+            self._response_downloaded, signal=signals.response_downloaded
+        )
+        crawler.signals.connect(
+            self._request_left_downloader, signal=signals.request_left_downloader
+        )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        return cls(crawler)
+
+    def _get_slot(self, request: Request) -> tuple[str | None, Slot | None]:
+        key: str | None = request.meta.get("download_slot")
+        if key is None:
+            return None, None
+        assert self.crawler.engine
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _slot_stats(self, slot: Slot) -> _SlotStats:
+        stats = self._stats.get(slot)
+        if stats is None:
+            stats = self._stats[slot] = _SlotStats(self.window)
+            stats.since_decrease = slot.concurrency
+            stats.concurrency = min(
+                max(slot.concurrency, self.min_concurrency), self.max_concurrency
+            )
+        return stats
+
+    def _response_downloaded(
+        self, response: Response, request: Request, spider: Spider
+    ) -> None:
+        self._downloaded.add(request)
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return
+        stats = self._slot_stats(slot)
+        stats.since_decrease += 1
+        if response.status in self.backoff_http_codes:
+            self._decrease(key, slot, stats, f"HTTP {response.status}")
+            return
+        latency = request.meta.get("download_latency")
+        if latency is None:
+            return
+        stats.latencies.append(latency)
+        stats.samples += 1
+        if stats.samples < self.window:
+            return
+        stats.samples = 0
+        latencies = sorted(stats.latencies)
+        p50 = latencies[len(latencies) // 2]
+        p90 = latencies[int(0.9 * (len(latencies) - 1))]
+        if stats.baseline is None:
+            stats.baseline = p50
+        else:
+            stats.baseline = min(p50, stats.baseline * (1 + self.baseline_drift))
+        if p90 > stats.baseline * self.latency_factor:
+            self._decrease(key, slot, stats, f"p90 latency {p90 * 1000:.0f} ms")
+        elif slot.queue:
+            self._set_concurrency(
+                key, slot, stats, stats.concurrency + 1, "slot saturated"
+            )
+
+    def _request_left_downloader(self, request: Request, spider: Spider) -> None:
+        if request in self._downloaded:
+            self._downloaded.discard(request)
+            return
+        # Only failed downloads, e.g. timeouts, leave without a response.
+        key, slot = self._get_slot(request)
+        if slot is not None:
+            stats = self._slot_stats(slot)
+            stats.since_decrease += 1
+            self._decrease(key, slot, stats, "download error")
+
+    def _decrease(
+        self, key: str | None, slot: Slot, stats: _SlotStats, reason: str
+    ) -> None:
+        # Decrease at most once per round of concurrent requests, since
+        # requests sent before the last decrease do not reflect it yet.
+        if stats.since_decrease < slot.concurrency:
+            return
+        stats.since_decrease = 0
+        self._set_concurrency(
+            key, slot, stats, stats.concurrency * self.decrease_factor, reason
+        )
+
+    def _set_concurrency(
+        self,
+        key: str | None,
+        slot: Slot,
+        stats: _SlotStats,
+        concurrency: float,
+        reason: str,
+    ) -> None:
+        stats.concurrency = min(
+            max(concurrency, self.min_concurrency), self.max_concurrency
+        )
+        old_concurrency = slot.concurrency
+        slot.concurrency = int(stats.concurrency)
+        if self.debug and slot.concurrency != old_concurrency:
+            logger.info(
+                "slot: %(slot)s | concurrency: %(old)d -> %(new)d (%(reason)s)",
+                {
+                    "slot": key,
+                    "old": old_concurrency,
+                    "new": slot.concurrency,
+                    "reason": reason,
+                },
+            )
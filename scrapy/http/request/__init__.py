@@ -343,6 +343,11 @@ def _find_method(obj: Any, func: Callable[..., Any]) -> str:
     """Helper function for Request.to_dict"""
     # Only instance methods contain ``__func__``
     if obj and hasattr(func, "__func__"):
+        # Fast path: methods are usually found under their own name.
+        name = func.__name__
+        obj_func = getattr(obj, name, None)
+        if inspect.ismethod(obj_func) and obj_func.__func__ is func.__func__:
+            return name
         members = inspect.getmembers(obj, predicate=inspect.ismethod)
         for name, obj_func in members:
             # We need to use __func__ to access the original function object because instance
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import logging
+from heapq import heapify, heappop, heappush
+from time import time
 from typing import TYPE_CHECKING, Protocol, cast
 
-from scrapy import Request
+from scrapy import Request, signals
+from scrapy.utils.asyncio import call_later
 from scrapy.utils.misc import build_from_crawler
 
 if TYPE_CHECKING:
@@ -13,8 +16,10 @@ if TYPE_CHECKING:
     # typing.Self requires Python 3.11
     from typing_extensions import Self
 
+    from scrapy import Spider
     from scrapy.core.downloader import Downloader
     from scrapy.crawler import Crawler
+    from scrapy.utils.asyncio import CallLaterResult
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +77,9 @@ class ScrapyPriorityQueue:
     startprios is a sequence of priorities to start with. If the queue was
     previously closed leaving some priority buckets non-empty, those priorities
     should be passed in startprios.
+
+    Non-empty priorities are tracked in a heap, so finding the next priority
+    to dequeue from does not require scanning all the internal queues.
     """
 
     @classmethod
@@ -107,6 +115,10 @@ class ScrapyPriorityQueue:
         self.key: str = key
         self.queues: dict[int, QueueProtocol] = {}
         self._start_queues: dict[int, QueueProtocol] = {}
+        # Heap of the priorities of non-empty internal queues. It may contain
+        # stale entries (priorities whose queues are gone) and duplicates,
+        # which are discarded lazily when they reach the top of the heap.
+        self._prios: list[int] = []
         self.curprio: int | None = None
         self.init_prios(startprios)
 
@@ -118,11 +130,14 @@ class ScrapyPriorityQueue:
             q = self.qfactory(priority)
             if q:
                 self.queues[priority] = q
+                self._prios.append(priority)
             if self._start_queue_cls:
                 q = self._sqfactory(priority)
                 if q:
                     self._start_queues[priority] = q
+                    self._prios.append(priority)
 
+        heapify(self._prios)
         self.curprio = min(startprios)
 
     def qfactory(self, key: int) -> QueueProtocol:
@@ -155,6 +170,8 @@ class ScrapyPriorityQueue:
                 self.queues[priority] = self.qfactory(priority)
             q = self.queues[priority]
         q.push(request)  # this may fail (eg. serialization error)
+        if len(q) == 1:
+            heappush(self._prios, priority)
         if self.curprio is None or priority < self.curprio:
             self.curprio = priority
 
@@ -169,8 +186,7 @@ class ScrapyPriorityQueue:
                 if not q:
                     del self.queues[self.curprio]
                     q.close()
-                    if not self._start_queues:
-                        self._update_curprio()
+                    self._update_curprio()
                 return m
             if self._start_queues:
                 try:
@@ -189,13 +205,12 @@ class ScrapyPriorityQueue:
         return None
 
     def _update_curprio(self) -> None:
-        prios = {
-            p
-            for queues in (self.queues, self._start_queues)
-            for p, q in queues.items()
-            if q
-        }
-        self.curprio = min(prios) if prios else None
+        prios = self._prios
+        while prios and not (
+            self.queues.get(prios[0]) or self._start_queues.get(prios[0])
+        ):
+            heappop(prios)
+        self.curprio = prios[0] if prios else None
 
     def peek(self) -> Request | None:
         """Returns the next object to be returned by :meth:`pop`,
@@ -237,6 +252,7 @@ class DownloaderInterface:
     def __init__(self, crawler: Crawler):
         assert crawler.engine
         self.downloader: Downloader = crawler.engine.downloader
+        self._crawler: Crawler = crawler
 
     def stats(self, possible_slots: Iterable[str]) -> list[tuple[int, str]]:
         return [(self._active_downloads(slot), slot) for slot in possible_slots]
@@ -250,11 +266,44 @@ class DownloaderInterface:
             return 0
         return len(self.downloader.slots[slot].active)
 
+    def _download_delay(self, slot: str) -> float:
+        """Return the download delay of a given slot"""
+        if slot in self.downloader.slots:
+            return self.downloader.slots[slot].delay
+        settings = self._crawler.settings
+        delay = getattr(
+            self._crawler.spider, "download_delay", settings.getfloat("DOWNLOAD_DELAY")
+        )
+        slot_settings = settings.getdict("DOWNLOAD_SLOTS").get(slot, {})
+        return cast(float, slot_settings.get("delay", delay))
+
+    def _last_download(self, slot: str) -> float:
+        """Return the time when the Downloader last started a download for a
+        given slot"""
+        if slot not in self.downloader.slots:
+            return 0
+        return self.downloader.slots[slot].lastseen
+
+    def _all_active_downloads(self) -> dict[str, int]:
+        """Return the number of requests in a Downloader for every slot with
+        active requests"""
+        return {
+            slot: len(downloader_slot.active)
+            for slot, downloader_slot in self.downloader.slots.items()
+            if downloader_slot.active
+        }
+
 
 class DownloaderAwarePriorityQueue:
     """PriorityQueue which takes Downloader activity into account:
     domains (slots) with the least amount of active downloads are dequeued
     first.
+
+    Active downloads per slot are counted through the
+    :signal:`request_reached_downloader` and :signal:`request_left_downloader`
+    signals, and slots with pending requests are kept in a heap sorted by
+    their active downloads, so that selecting the next slot does not require
+    checking every slot.
     """
 
     @classmethod
@@ -307,8 +356,195 @@ class DownloaderAwarePriorityQueue:
         self.crawler: Crawler = crawler
 
         self.pqueues: dict[str, ScrapyPriorityQueue] = {}  # slot -> priority queue
+        # slot -> number of active downloads, for slots with active downloads
+        self._active: dict[str, int] = (
+            self._downloader_interface._all_active_downloads()
+        )
+        # Heap of (active downloads, slot) for slots in self.pqueues. Entries
+        # that no longer match self.pqueues or self._active are stale, and
+        # discarded when they reach the top of the heap.
+        self._slots: list[tuple[int, str]] = []
+        for slot, startprios in (slot_startprios or {}).items():
+            self.pqueues[slot] = self.pqfactory(slot, startprios)
+            self._slots.append((self._active.get(slot, 0), slot))
+        heapify(self._slots)
+        crawler.signals.connect(
+            self._request_reached_downloader, signals.request_reached_downloader
+        )
+        crawler.signals.connect(
+            self._request_left_downloader, signals.request_left_downloader
+        )
+
+    def pqfactory(
+        self, slot: str, startprios: Iterable[int] = ()
+    ) -> ScrapyPriorityQueue:
+        return ScrapyPriorityQueue(
+            self.crawler,
+            self.downstream_queue_cls,
+            self.key + "/" + _path_safe(slot),
+            startprios,
+            start_queue_cls=self._start_queue_cls,
+        )
+
+    def _request_reached_downloader(self, request: Request, spider: Spider) -> None:
+        self._update_active(self._downloader_interface.get_slot_key(request), 1)
+
+    def _request_left_downloader(self, request: Request, spider: Spider) -> None:
+        self._update_active(self._downloader_interface.get_slot_key(request), -1)
+
+    def _update_active(self, slot: str, delta: int) -> None:
+        active = max(self._active.get(slot, 0) + delta, 0)
+        if active:
+            self._active[slot] = active
+        else:
+            self._active.pop(slot, None)
+        if slot in self.pqueues:
+            self._push_slot(slot)
+
+    def _push_slot(self, slot: str) -> None:
+        heappush(self._slots, (self._active.get(slot, 0), slot))
+        if len(self._slots) > 2 * len(self.pqueues) + 64:
+            # Too many stale entries, rebuild the heap.
+            self._slots = [(self._active.get(slot, 0), slot) for slot in self.pqueues]
+            heapify(self._slots)
+
+    def _next_slot(self) -> str | None:
+        """Return the slot with the least amount of active downloads, or
+        ``None`` if there are no pending requests."""
+        slots = self._slots
+        while slots:
+            active, slot = slots[0]
+            if slot in self.pqueues and active == self._active.get(slot, 0):
+                return slot
+            heappop(slots)
+        return None
+
+    def pop(self) -> Request | None:
+        slot = self._next_slot()
+
+        if slot is None:
+            return None
+
+        queue = self.pqueues[slot]
+        request = queue.pop()
+        if len(queue) == 0:
+            del self.pqueues[slot]
+        return request
+
+    def push(self, request: Request) -> None:
+        slot = self._downloader_interface.get_slot_key(request)
+        if slot not in self.pqueues:
+            self.pqueues[slot] = self.pqfactory(slot)
+            self._push_slot(slot)
+        queue = self.pqueues[slot]
+        queue.push(request)
+
+    def peek(self) -> Request | None:
+        """Returns the next object to be returned by :meth:`pop`,
+        but without removing it from the queue.
+
+        Raises :exc:`NotImplementedError` if the underlying queue class does
+        not implement a ``peek`` method, which is optional for queues.
+        """
+        slot = self._next_slot()
+        if slot is None:
+            return None
+        queue = self.pqueues[slot]
+        return queue.peek()
+
+    def close(self) -> dict[str, list[int]]:
+        self.crawler.signals.disconnect(
+            self._request_reached_downloader, signals.request_reached_downloader
+        )
+        self.crawler.signals.disconnect(
+            self._request_left_downloader, signals.request_left_downloader
+        )
+        active = {slot: queue.close() for slot, queue in self.pqueues.items()}
+        self.pqueues.clear()
+        self._slots.clear()
+        return active
+
+    def __len__(self) -> int:
+        return sum(len(x) for x in self.pqueues.values()) if self.pqueues else 0
+
+    def __contains__(self, slot: str) -> bool:
+        return slot in self.pqueues
+
+
+class DelayAwarePriorityQueue:
+    """PriorityQueue which takes download delays into account: requests are
+    only dequeued for domains (slots) whose download delay (see
+    :setting:`DOWNLOAD_DELAY` and :ref:`topics-autothrottle`) has elapsed,
+    so that the Downloader does not hold requests that cannot be sent yet.
+
+    Slots with pending requests are kept in a heap sorted by the time when
+    their next request can be sent. When no slot can send a request yet, a
+    single timer wakes up the engine when the earliest one can.
+    """
+
+    @classmethod
+    def from_crawler(
+        cls,
+        crawler: Crawler,
+        downstream_queue_cls: type[QueueProtocol],
+        key: str,
+        startprios: dict[str, Iterable[int]] | None = None,
+        *,
+        start_queue_cls: type[QueueProtocol] | None = None,
+    ) -> Self:
+        return cls(
+            crawler,
+            downstream_queue_cls,
+            key,
+            startprios,
+            start_queue_cls=start_queue_cls,
+        )
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        downstream_queue_cls: type[QueueProtocol],
+        key: str,
+        slot_startprios: dict[str, Iterable[int]] | None = None,
+        *,
+        start_queue_cls: type[QueueProtocol] | None = None,
+    ):
+        if crawler.settings.getint("CONCURRENT_REQUESTS_PER_IP") != 0:
+            raise ValueError(
+                f'"{self.__class__}" does not support CONCURRENT_REQUESTS_PER_IP'
+            )
+
+        if slot_startprios and not isinstance(slot_startprios, dict):
+            raise ValueError(
+                "DelayAwarePriorityQueue accepts "
+                "``slot_startprios`` as a dict; "
+                f"{slot_startprios.__class__!r} instance "
+                "is passed. Most likely, it means the state is "
+                "created by an incompatible priority queue. "
+                "Only a crawl started with the same priority "
+                "queue class can be resumed."
+            )
+
+        self._downloader_interface: DownloaderInterface = DownloaderInterface(crawler)
+        self.downstream_queue_cls: type[QueueProtocol] = downstream_queue_cls
+        self._start_queue_cls: type[QueueProtocol] | None = start_queue_cls
+        self.key: str = key
+        self.crawler: Crawler = crawler
+
+        self.pqueues: dict[str, ScrapyPriorityQueue] = {}  # slot -> priority queue
+        # slot -> time when a request was last dequeued for that slot
+        self._dequeued: dict[str, float] = {}
+        # slot -> time when the next request can be dequeued for that slot,
+        # for slots in self.pqueues
+        self._ready: dict[str, float] = {}
+        # Heap of (ready time, slot). Entries that do not match self._ready
+        # are stale, and discarded when they reach the top of the heap.
+        self._slots: list[tuple[float, str]] = []
+        self._wakeup: CallLaterResult | None = None
+        self._wakeup_time: float = 0.0
         for slot, startprios in (slot_startprios or {}).items():
             self.pqueues[slot] = self.pqfactory(slot, startprios)
+            self._push_slot(slot, 0.0)
 
     def pqfactory(
         self, slot: str, startprios: Iterable[int] = ()
@@ -321,23 +557,86 @@ class DownloaderAwarePriorityQueue:
             start_queue_cls=self._start_queue_cls,
         )
 
+    def _ready_time(self, slot: str) -> float:
+        delay = self._downloader_interface._download_delay(slot)
+        # With no delay, this still gives precedence to the slots that have
+        # gone the longest without a request.
+        last = max(
+            self._dequeued.get(slot, 0.0),
+            self._downloader_interface._last_download(slot),
+        )
+        return last + delay
+
+    def _push_slot(self, slot: str, ready: float) -> None:
+        self._ready[slot] = ready
+        heappush(self._slots, (ready, slot))
+
+    def _next_slot(self) -> str | None:
+        """Return a slot that can send a request now, or ``None`` if there is
+        none, in which case the engine will be woken up once there is one."""
+        slots = self._slots
+        now = time()
+        while slots:
+            ready, slot = slots[0]
+            if self._ready.get(slot) != ready:
+                heappop(slots)
+                continue
+            current_ready = self._ready_time(slot)
+            if current_ready != ready:
+                # The slot delay has changed, e.g. because of AutoThrottle, or
+                # the Downloader sent a request for this slot since.
+                heappop(slots)
+                self._push_slot(slot, current_ready)
+                continue
+            if ready > now:
+                self._schedule_wakeup(ready)
+                return None
+            return slot
+        return None
+
+    def _schedule_wakeup(self, when: float) -> None:
+        if self._wakeup is not None and self._wakeup_time <= when:
+            return
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup_time = when
+        self._wakeup = call_later(max(when - time(), 0), self._wake_up_engine)
+
+    def _wake_up_engine(self) -> None:
+        self._wakeup = None
+        if self.crawler.engine is not None:
+            self.crawler.engine.wake_up()
+
     def pop(self) -> Request | None:
-        stats = self._downloader_interface.stats(self.pqueues)
+        slot = self._next_slot()
 
-        if not stats:
+        if slot is None:
             return None
 
-        slot = min(stats)[1]
+        heappop(self._slots)
+        del self._ready[slot]
         queue = self.pqueues[slot]
         request = queue.pop()
+        now = time()
+        self._dequeued[slot] = now
         if len(queue) == 0:
             del self.pqueues[slot]
+        else:
+            self._push_slot(slot, self._ready_time(slot))
+        if len(self._dequeued) > 2 * len(self.pqueues) + 1024:
+            self._dequeued = {
+                slot: dequeued
+                for slot, dequeued in self._dequeued.items()
+                if slot in self.pqueues
+                or dequeued + self._downloader_interface._download_delay(slot) > now
+            }
         return request
 
     def push(self, request: Request) -> None:
         slot = self._downloader_interface.get_slot_key(request)
         if slot not in self.pqueues:
             self.pqueues[slot] = self.pqfactory(slot)
+            self._push_slot(slot, self._ready_time(slot))
         queue = self.pqueues[slot]
         queue.push(request)
 
@@ -348,16 +647,20 @@ class DownloaderAwarePriorityQueue:
         Raises :exc:`NotImplementedError` if the underlying queue class does
         not implement a ``peek`` method, which is optional for queues.
         """
-        stats = self._downloader_interface.stats(self.pqueues)
-        if not stats:
+        slot = self._next_slot()
+        if slot is None:
             return None
-        slot = min(stats)[1]
         queue = self.pqueues[slot]
         return queue.peek()
 
     def close(self) -> dict[str, list[int]]:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
         active = {slot: queue.close() for slot, queue in self.pqueues.items()}
         self.pqueues.clear()
+        self._ready.clear()
+        self._slots.clear()
         return active
 
     def __len__(self) -> int:
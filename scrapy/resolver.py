@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from time import time
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 from twisted.internet import defer
+from twisted.internet.abstract import isIPAddress, isIPv6Address
 from twisted.internet.base import ReactorBase, ThreadedResolver
+from twisted.internet.error import DNSLookupError
 from twisted.internet.interfaces import (
     IAddress,
     IHostnameResolver,
@@ -11,6 +15,8 @@ from twisted.internet.interfaces import (
     IResolutionReceiver,
     IResolverSimple,
 )
+from twisted.names import client, dns
+from twisted.python.failure import Failure
 from zope.interface.declarations import implementer, provider
 
 from scrapy.utils.datatypes import LocalCache
@@ -19,6 +25,7 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from twisted.internet.defer import Deferred
+    from twisted.internet.interfaces import IResolver
 
     # typing.Self requires Python 3.11
     from typing_extensions import Self
@@ -27,6 +34,22 @@ if TYPE_CHECKING:
 
 # TODO: cache misses
 dnscache: LocalCache[str, Any] = LocalCache(10000)
+# Expiration times, in seconds since the epoch, of the dnscache entries that
+# expire with the TTL of their DNS records.
+_dnscache_expiration: LocalCache[str, float] = LocalCache(10000)
+
+
+def _in_dnscache(name: str) -> bool:
+    """Return whether *name* has an unexpired address in :data:`dnscache`,
+    evicting it if it expired."""
+    if name not in dnscache:
+        return False
+    expiration = _dnscache_expiration.get(name)
+    if expiration is not None and expiration <= time():
+        dnscache.pop(name, None)
+        del _dnscache_expiration[name]
+        return False
+    return True
 
 
 @implementer(IResolverSimple)
@@ -70,6 +93,125 @@ class CachingThreadedResolver(ThreadedResolver):
         return result
 
 
+def _parse_dns_server(server: str) -> tuple[str, int]:
+    parsed = urlparse(f"//{server}")
+    if not parsed.hostname:
+        raise ValueError(f"Invalid DNS server: {server!r}")
+    return parsed.hostname, parsed.port or dns.PORT
+
+
+@implementer(IResolverSimple)
+class CachingAsyncResolver:
+    """
+    Experimental caching resolver. IPv4 only, supports setting a timeout value
+    for DNS requests.
+
+    DNS queries are sent from the reactor thread instead of blocking a thread
+    pool thread, concurrent lookups of the same name share a single query,
+    cached addresses expire with the TTL of their DNS records, and failed
+    lookups are cached for ``negative_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        reactor: ReactorBase,
+        cache_size: int,
+        timeout: float,
+        servers: Sequence[tuple[str, int]] | None = None,
+        negative_ttl: float = 0,
+    ):
+        self.reactor: ReactorBase = reactor
+        dnscache.limit = cache_size
+        _dnscache_expiration.limit = cache_size
+        self.timeout: float = timeout
+        self.negative_ttl: float = negative_ttl
+        self.resolver: IResolver
+        if servers:
+            self.resolver = client.Resolver(servers=list(servers), reactor=reactor)
+        else:
+            # The hosts file and name servers of the platform.
+            self.resolver = client.createResolver()
+        self._failures: LocalCache[str, tuple[Failure, float]] = LocalCache(cache_size)
+        self._lookups: dict[str, list[Deferred[str]]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, reactor: ReactorBase) -> Self:
+        if crawler.settings.getbool("DNSCACHE_ENABLED"):
+            cache_size = crawler.settings.getint("DNSCACHE_SIZE")
+        else:
+            cache_size = 0
+        servers = [
+            _parse_dns_server(server)
+            for server in crawler.settings.getlist("DNS_SERVERS")
+        ]
+        return cls(
+            reactor,
+            cache_size,
+            crawler.settings.getfloat("DNS_TIMEOUT"),
+            servers=servers,
+            negative_ttl=crawler.settings.getfloat("DNSCACHE_NEGATIVE_TTL"),
+        )
+
+    def install_on_reactor(self) -> None:
+        self.reactor.installResolver(self)
+
+    def getHostByName(self, name: str, timeout: Sequence[int] = ()) -> Deferred[str]:
+        if isIPAddress(name) or isIPv6Address(name):
+            return defer.succeed(name)
+        if _in_dnscache(name):
+            return defer.succeed(dnscache[name])
+        if name in self._failures:
+            failure, expiration = self._failures[name]
+            if expiration > time():
+                return defer.fail(failure)
+            del self._failures[name]
+        d: Deferred[str] = defer.Deferred()
+        if name in self._lookups:
+            self._lookups[name].append(d)
+            return d
+        self._lookups[name] = [d]
+        # The timeout arg is typed as Sequence[int] but supports floats.
+        timeout = (self.timeout,)  # type: ignore[assignment]
+        lookup = self.resolver.lookupAddress(name, timeout=timeout)
+        lookup.addCallback(self._get_address, name)
+        lookup.addBoth(self._lookup_done, name)
+        return d
+
+    def _get_address(
+        self, result: tuple[list[dns.RRHeader], Any, Any], name: str
+    ) -> str:
+        answers = result[0]
+        for answer in answers:
+            if answer.type == dns.A and isinstance(answer.payload, dns.Record_A):
+                address: str = answer.payload.dottedQuad()
+                break
+        else:
+            raise DNSLookupError(f"address {name!r} not found: no A records")
+        # The answers may include a CNAME chain, which expires with its
+        # shortest-lived record.
+        ttl = min(answer.ttl for answer in answers)
+        if dnscache.limit and ttl > 0:
+            dnscache[name] = address
+            _dnscache_expiration[name] = time() + ttl
+        return address
+
+    def _lookup_done(self, result: str | Failure, name: str) -> None:
+        waiters = self._lookups.pop(name)
+        if not isinstance(result, Failure):
+            for d in waiters:
+                d.callback(result)
+            return
+        if not result.check(DNSLookupError):
+            result = Failure(
+                DNSLookupError(f"address {name!r} not found: {result.value}")
+            )
+        if dnscache.limit and self.negative_ttl > 0:
+            expiration = time() + self.negative_ttl
+            self._failures[name] = (result, expiration)
+        for d in waiters:
+            d.errback(result)
+
+
 @implementer(IHostResolution)
 class HostResolution:
     def __init__(self, name: str):
@@ -17,6 +17,12 @@ import sys
 from importlib import import_module
 from pathlib import Path
 
+ADAPTIVE_CONCURRENCY_DEBUG = False
+ADAPTIVE_CONCURRENCY_ENABLED = False
+ADAPTIVE_CONCURRENCY_LATENCY_FACTOR = 2.0
+ADAPTIVE_CONCURRENCY_MAX = 32
+ADAPTIVE_CONCURRENCY_MIN = 1
+
 ADDONS = {}
 
 AJAXCRAWL_ENABLED = False
@@ -32,6 +38,8 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 
 BOT_NAME = "scrapybot"
 
+CANONICALIZE_URL_CACHE_SIZE = 10_000
+
 CLOSESPIDER_ERRORCOUNT = 0
 CLOSESPIDER_ITEMCOUNT = 0
 CLOSESPIDER_PAGECOUNT = 0
@@ -40,6 +48,7 @@ CLOSESPIDER_TIMEOUT = 0
 COMMANDS_MODULE = ""
 
 COMPRESSION_ENABLED = True
+COMPRESSION_STREAMING = False
 
 CONCURRENT_ITEMS = 100
 
@@ -66,10 +75,19 @@ DEPTH_PRIORITY = 0
 DEPTH_STATS_VERBOSE = False
 
 DNSCACHE_ENABLED = True
+DNSCACHE_NEGATIVE_TTL = 10
 DNSCACHE_SIZE = 10000
+DNS_PREFETCH_CONCURRENCY = 16
+DNS_PREFETCH_ENABLED = False
+DNS_PREFETCH_QUEUE_SIZE = 1000
 DNS_RESOLVER = "scrapy.resolver.CachingThreadedResolver"
+DNS_SERVERS = []
 DNS_TIMEOUT = 60
 
+DOWNLOAD_BANDWIDTH_LIMIT = 0
+
+DOWNLOAD_BURST = 1
+
 DOWNLOAD_DELAY = 0
 
 DOWNLOAD_FAIL_ON_DATALOSS = True
@@ -85,10 +103,17 @@ DOWNLOAD_HANDLERS_BASE = {
 }
 
 DOWNLOAD_MAXSIZE = 1024 * 1024 * 1024  # 1024m
+DOWNLOAD_SPOOLSIZE = 0
 DOWNLOAD_WARNSIZE = 32 * 1024 * 1024  # 32m
 
+DOWNLOAD_RATE = 0
+
+DOWNLOAD_SLOT_BANDWIDTH_LIMIT = 0
+
 DOWNLOAD_TIMEOUT = 180  # 3mins
 
+DOWNLOAD_TIMINGS_ENABLED = False
+
 DOWNLOADER = "scrapy.core.downloader.Downloader"
 
 DOWNLOADER_CLIENTCONTEXTFACTORY = (
@@ -97,8 +122,11 @@ DOWNLOADER_CLIENTCONTEXTFACTORY = (
 DOWNLOADER_CLIENT_TLS_CIPHERS = "DEFAULT"
 # Use highest TLS/SSL protocol version supported by the platform, also allowing negotiation:
 DOWNLOADER_CLIENT_TLS_METHOD = "TLS"
+DOWNLOADER_CLIENT_TLS_SESSION_CACHE = False
 DOWNLOADER_CLIENT_TLS_VERBOSE_LOGGING = False
 
+DOWNLOADER_COALESCE_REQUESTS = False
+
 DOWNLOADER_HTTPCLIENTFACTORY = (
     "scrapy.core.downloader.webclient.ScrapyHTTPClientFactory"
 )
@@ -126,8 +154,16 @@ DOWNLOADER_MIDDLEWARES_BASE = {
 
 DOWNLOADER_STATS = True
 
+DUPEFILTER_BLOOM_CAPACITY = 1_000_000
+DUPEFILTER_BLOOM_ERROR_RATE = 0.001
+
 DUPEFILTER_CLASS = "scrapy.dupefilters.RFPDupeFilter"
 
+DUPEFILTER_LSM_FANOUT = 8
+DUPEFILTER_LSM_MEMTABLE_SIZE = 1_000_000
+
+DUPEFILTER_TTL = 0
+
 EDITOR = "vi"
 if sys.platform == "win32":
     EDITOR = "%s -m idlelib.idle"
@@ -143,6 +179,8 @@ EXTENSIONS_BASE = {
     "scrapy.extensions.logstats.LogStats": 0,
     "scrapy.extensions.spiderstate.SpiderState": 0,
     "scrapy.extensions.throttle.AutoThrottle": 0,
+    "scrapy.extensions.throttle.AdaptiveConcurrency": 0,
+    "scrapy.extensions.dnsprefetch.DNSPrefetch": 0,
 }
 
 FEEDS = {}
@@ -189,6 +227,9 @@ FTP_PASSWORD = "guest"  # noqa: S105
 
 GCS_PROJECT_ID = None
 
+H2_MAX_CONNECTIONS = 1
+H2_WINDOW_SIZE = 65535
+
 HTTPCACHE_ENABLED = False
 HTTPCACHE_ALWAYS_STORE = False
 HTTPCACHE_DBM_MODULE = "dbm"
@@ -276,6 +317,7 @@ REDIRECT_PRIORITY_ADJUST = +2
 REFERER_ENABLED = True
 REFERRER_POLICY = "scrapy.spidermiddlewares.referer.DefaultReferrerPolicy"
 
+REQUEST_FINGERPRINTER_ALGORITHM = "sha1"
 REQUEST_FINGERPRINTER_CLASS = "scrapy.utils.request.RequestFingerprinter"
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "SENTINEL"
 
@@ -306,7 +348,13 @@ ROBOTSTXT_USER_AGENT = None
 SCHEDULER = "scrapy.core.scheduler.Scheduler"
 SCHEDULER_DEBUG = False
 SCHEDULER_DISK_QUEUE = "scrapy.squeues.PickleLifoDiskQueue"
+SCHEDULER_DISK_QUEUE_BUFFER_BYTES = 1024 * 1024  # 1 MiB
+SCHEDULER_DISK_QUEUE_BUFFER_SIZE = 0
+SCHEDULER_DISK_QUEUE_BUFFER_TIME = 5.0
+SCHEDULER_DISK_QUEUE_COMPRESSION = None
 SCHEDULER_MEMORY_QUEUE = "scrapy.squeues.LifoMemoryQueue"
+SCHEDULER_MEMORY_WINDOW_BYTES = 0
+SCHEDULER_MEMORY_WINDOW_SIZE = 0
 SCHEDULER_PRIORITY_QUEUE = "scrapy.pqueues.ScrapyPriorityQueue"
 SCHEDULER_START_DISK_QUEUE = "scrapy.squeues.PickleFifoDiskQueue"
 SCHEDULER_START_MEMORY_QUEUE = "scrapy.squeues.FifoMemoryQueue"
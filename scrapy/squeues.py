@@ -4,15 +4,24 @@ Scheduler queues
 
 from __future__ import annotations
 
+import contextlib
 import marshal
 import pickle
+import sys
+import zlib
+from collections import deque
 from pathlib import Path
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from queuelib import queue
 
+from scrapy.utils.asyncio import call_later
 from scrapy.utils.request import request_from_dict
 
+with contextlib.suppress(ImportError):
+    import zstandard
+
 if TYPE_CHECKING:
     from collections.abc import Callable
     from os import PathLike
@@ -22,6 +31,7 @@ if TYPE_CHECKING:
 
     from scrapy import Request
     from scrapy.crawler import Crawler
+    from scrapy.utils.asyncio import CallLaterResult
 
 
 def _with_mkdir(queue_class: type[queue.BaseQueue]) -> type[queue.BaseQueue]:
@@ -35,6 +45,119 @@ def _with_mkdir(queue_class: type[queue.BaseQueue]) -> type[queue.BaseQueue]:
     return DirectoriesCreated
 
 
+def _write_behind(queue_class: type[queue.BaseQueue]) -> type[queue.BaseQueue]:
+    """Return a subclass of a queuelib disk queue that can keep pushed
+    strings in memory and write them to disk in groups.
+
+    Buffering is disabled unless ``buffer_size`` is a positive number. The
+    buffer is flushed when it holds ``buffer_size`` strings, ``buffer_bytes``
+    bytes, or strings pushed more than ``buffer_time`` seconds ago, and always
+    before the queue is closed, so that the state saved on close covers every
+    string pushed.
+    """
+    is_fifo = issubclass(queue_class, queue.FifoDiskQueue)
+
+    class WriteBehindQueue(queue_class):  # type: ignore[valid-type,misc]
+        def __init__(
+            self,
+            path: str | PathLike,
+            *args: Any,
+            buffer_size: int = 0,
+            buffer_bytes: int = 0,
+            buffer_time: float = 0,
+            **kwargs: Any,
+        ):
+            self._buffer: deque[bytes] = deque()
+            self._buffer_bytes: int = 0
+            self._buffer_since: float = 0.0
+            self._flush_call: CallLaterResult | None = None
+            self.buffer_size: int = buffer_size
+            self.buffer_bytes: int = buffer_bytes
+            self.buffer_time: float = buffer_time
+            super().__init__(path, *args, **kwargs)
+
+        def push(self, string: bytes) -> None:
+            if self.buffer_size <= 0:
+                super().push(string)
+                return
+            if not isinstance(string, bytes):
+                raise TypeError(f"Unsupported type: {type(string).__name__}")
+            if not self._buffer:
+                self._buffer_since = monotonic()
+                if self.buffer_time > 0:
+                    self._flush_call = call_later(self.buffer_time, self.flush)
+            self._buffer.append(string)
+            self._buffer_bytes += len(string)
+            if len(self._buffer) >= self.buffer_size or (
+                self.buffer_bytes > 0 and self._buffer_bytes >= self.buffer_bytes
+            ):
+                self.flush()
+            else:
+                self._flush_expired()
+
+        def pop(self) -> bytes | None:
+            self._flush_expired()
+            if self._buffer and not (is_fifo and super().__len__()):
+                # Buffered strings are the newest ones: they are the next
+                # ones for a LIFO queue, and the last ones for a FIFO queue.
+                string = self._buffer.pop() if not is_fifo else self._buffer.popleft()
+                self._buffer_bytes -= len(string)
+                if not self._buffer:
+                    self._cancel_flush_call()
+                return string
+            return super().pop()
+
+        def peek(self) -> bytes | None:
+            if self._buffer and not (is_fifo and super().__len__()):
+                return self._buffer[0] if is_fifo else self._buffer[-1]
+            return super().peek()
+
+        def flush(self) -> None:
+            """Write all buffered strings to disk."""
+            self._cancel_flush_call()
+            for string in self._buffer:
+                super().push(string)
+            self._buffer.clear()
+            self._buffer_bytes = 0
+
+        def _flush_expired(self) -> None:
+            if (
+                self._buffer
+                and self.buffer_time > 0
+                and monotonic() - self._buffer_since >= self.buffer_time
+            ):
+                self.flush()
+
+        def _cancel_flush_call(self) -> None:
+            if self._flush_call is not None:
+                self._flush_call.cancel()
+                self._flush_call = None
+
+        def clear(self) -> None:
+            self._cancel_flush_call()
+            self._buffer.clear()
+            self._buffer_bytes = 0
+            super().clear()
+
+        def close(self) -> None:
+            self.flush()
+            super().close()
+
+        def __len__(self) -> int:
+            return super().__len__() + len(self._buffer)
+
+    return WriteBehindQueue
+
+
+def _write_behind_kwargs(crawler: Crawler) -> dict[str, Any]:
+    settings = crawler.settings
+    return {
+        "buffer_size": settings.getint("SCHEDULER_DISK_QUEUE_BUFFER_SIZE"),
+        "buffer_bytes": settings.getint("SCHEDULER_DISK_QUEUE_BUFFER_BYTES"),
+        "buffer_time": settings.getfloat("SCHEDULER_DISK_QUEUE_BUFFER_TIME"),
+    }
+
+
 def _serializable_queue(
     queue_class: type[queue.BaseQueue],
     serialize: Callable[[Any], bytes],
@@ -77,7 +200,7 @@ def _scrapy_serialization_queue(
     class ScrapyRequestQueue(queue_class):  # type: ignore[valid-type,misc]
         def __init__(self, crawler: Crawler, key: str):
             self.spider = crawler.spider
-            super().__init__(key)
+            super().__init__(key, **_write_behind_kwargs(crawler))
 
         @classmethod
         def from_crawler(
@@ -136,6 +259,53 @@ def _scrapy_non_serialization_queue(
     return ScrapyRequestQueue
 
 
+def _scrapy_binary_serialization_queue(
+    queue_class: type[queue.BaseQueue],
+) -> type[queue.BaseQueue]:
+    class ScrapyRequestQueue(queue_class):  # type: ignore[valid-type,misc]
+        def __init__(self, crawler: Crawler, key: str):
+            self.spider = crawler.spider
+            self._codec = _RequestCodec(
+                crawler.settings.get("SCHEDULER_DISK_QUEUE_COMPRESSION")
+            )
+            super().__init__(key, **_write_behind_kwargs(crawler))
+
+        @classmethod
+        def from_crawler(
+            cls, crawler: Crawler, key: str, *args: Any, **kwargs: Any
+        ) -> Self:
+            return cls(crawler, key)
+
+        def push(self, request: Request) -> None:
+            request_dict = request.to_dict(spider=self.spider)
+            super().push(self._codec.encode(request_dict))
+
+        def pop(self) -> Request | None:
+            s = super().pop()
+            if not s:
+                return None
+            return request_from_dict(self._codec.decode(s), spider=self.spider)
+
+        def peek(self) -> Request | None:
+            """Returns the next object to be returned by :meth:`pop`,
+            but without removing it from the queue.
+
+            Raises :exc:`NotImplementedError` if the underlying queue class does
+            not implement a ``peek`` method, which is optional for queues.
+            """
+            try:
+                s = super().peek()
+            except AttributeError as ex:
+                raise NotImplementedError(
+                    "The underlying queue class does not implement 'peek'"
+                ) from ex
+            if not s:
+                return None
+            return request_from_dict(self._codec.decode(s), spider=self.spider)
+
+    return ScrapyRequestQueue
+
+
 def _pickle_serialize(obj: Any) -> bytes:
     try:
         return pickle.dumps(obj, protocol=4)
@@ -145,24 +315,257 @@ def _pickle_serialize(obj: Any) -> bytes:
         raise ValueError(str(e)) from e
 
 
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_bytes(buffer: bytearray, value: bytes) -> None:
+    _write_varint(buffer, len(value))
+    buffer += value
+
+
+def _read_bytes(data: bytes, pos: int) -> tuple[bytes, int]:
+    length, pos = _read_varint(data, pos)
+    end = pos + length
+    return data[pos:end], end
+
+
+def _write_optional_str(buffer: bytearray, value: str | None) -> None:
+    # 0 means None, otherwise the length of the encoded string plus one
+    if value is None:
+        buffer.append(0)
+        return
+    encoded = value.encode()
+    _write_varint(buffer, len(encoded) + 1)
+    buffer += encoded
+
+
+def _read_optional_str(data: bytes, pos: int) -> tuple[str | None, int]:
+    length, pos = _read_varint(data, pos)
+    if not length:
+        return None, pos
+    end = pos + length - 1
+    return sys.intern(data[pos:end].decode()), end
+
+
+# Static tables of frequent values, which are encoded as their index instead
+# of their full value. Values can only be appended, never removed or
+# reordered, to keep existing queue files readable.
+_METHODS = ("GET", "POST", "HEAD", "PUT", "DELETE", "OPTIONS", "PATCH")
+_HEADER_NAMES = (
+    b"Accept",
+    b"Accept-Encoding",
+    b"Accept-Language",
+    b"Authorization",
+    b"Cache-Control",
+    b"Content-Type",
+    b"Cookie",
+    b"If-Modified-Since",
+    b"If-None-Match",
+    b"Origin",
+    b"Pragma",
+    b"Referer",
+    b"User-Agent",
+    b"X-Requested-With",
+)
+_METHOD_INDEX = {method: index for index, method in enumerate(_METHODS)}
+_HEADER_NAME_INDEX = {name: index for index, name in enumerate(_HEADER_NAMES)}
+
+# Request dict keys with a dedicated binary representation. Any other key
+# is stored in a pickled trailer.
+_BINARY_KEYS = frozenset(
+    (
+        "url",
+        "callback",
+        "errback",
+        "method",
+        "headers",
+        "body",
+        "encoding",
+        "priority",
+        "dont_filter",
+        "_class",
+    )
+)
+# Keys omitted from the trailer when empty, as request_from_dict restores
+# the same value for them when missing.
+_OMITTABLE_KEYS = frozenset(("cookies", "meta", "flags", "cb_kwargs"))
+
+_CODEC_VERSION = 1
+_FLAG_ZLIB = 0x1
+_FLAG_ZSTD = 0x2
+
+
+class _RequestCodec:
+    """Compact binary serialization of the dicts returned by
+    :meth:`Request.to_dict() <scrapy.Request.to_dict>`.
+
+    Each record starts with a header byte, which holds the codec version in
+    its upper 4 bits and compression flags in its lower 4 bits, followed by
+    the (optionally compressed) payload. Records are self-contained, so that
+    any record of a queue file can be decoded on its own.
+    """
+
+    def __init__(self, compression: str | None = None, min_size: int = 256):
+        if compression not in (None, "", "zlib", "zstd"):
+            raise ValueError(f"Unsupported disk queue compression: {compression!r}")
+        if compression == "zstd" and "zstandard" not in globals():
+            raise ValueError(
+                "zstd disk queue compression requires the zstandard package"
+            )
+        self.compression: str | None = compression or None
+        self.min_size: int = min_size
+
+    def encode(self, request_dict: dict[str, Any]) -> bytes:
+        try:
+            payload = self._encode_payload(request_dict)
+        # TypeError is raised for values of unexpected types, e.g. a float
+        # priority
+        except TypeError as e:
+            raise ValueError(str(e)) from e
+        flags = 0
+        if self.compression and len(payload) >= self.min_size:
+            if self.compression == "zlib":
+                compressed = zlib.compress(payload)
+                compression_flag = _FLAG_ZLIB
+            else:
+                compressed = zstandard.compress(payload)
+                compression_flag = _FLAG_ZSTD
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags = compression_flag
+        return bytes(((_CODEC_VERSION << 4) | flags,)) + payload
+
+    def decode(self, data: bytes) -> dict[str, Any]:
+        version, flags = data[0] >> 4, data[0] & 0xF
+        if version != _CODEC_VERSION:
+            raise ValueError(f"Unsupported request record version: {version}")
+        payload = data[1:]
+        if flags & _FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        elif flags & _FLAG_ZSTD:
+            if "zstandard" not in globals():
+                raise ValueError(
+                    "Cannot decode a zstd-compressed request record: "
+                    "the zstandard package is not installed"
+                )
+            payload = zstandard.decompress(payload)
+        return self._decode_payload(payload)
+
+    @staticmethod
+    def _encode_payload(d: dict[str, Any]) -> bytes:
+        buffer = bytearray()
+        _write_bytes(buffer, d["url"].encode())
+        method_index = _METHOD_INDEX.get(d["method"])
+        if method_index is None:
+            buffer.append(0xFF)
+            _write_bytes(buffer, d["method"].encode())
+        else:
+            buffer.append(method_index)
+        _write_optional_str(buffer, d["callback"])
+        _write_optional_str(buffer, d["errback"])
+        priority = d["priority"]
+        # zigzag encoding, to keep small negative priorities short
+        _write_varint(buffer, priority * 2 if priority >= 0 else -priority * 2 - 1)
+        buffer.append(1 if d["dont_filter"] else 0)
+        _write_optional_str(buffer, d["encoding"])
+        _write_optional_str(buffer, d.get("_class"))
+        headers = d["headers"]
+        _write_varint(buffer, len(headers))
+        for name, values in headers.items():
+            name_index = _HEADER_NAME_INDEX.get(name)
+            if name_index is None:
+                buffer.append(0)
+                _write_bytes(buffer, name)
+            else:
+                _write_varint(buffer, name_index + 1)
+            _write_varint(buffer, len(values))
+            for value in values:
+                _write_bytes(buffer, value)
+        _write_bytes(buffer, d["body"])
+        extra = {
+            key: value
+            for key, value in d.items()
+            if key not in _BINARY_KEYS and (key not in _OMITTABLE_KEYS or value)
+        }
+        if extra:
+            buffer += _pickle_serialize(extra)
+        return bytes(buffer)
+
+    @staticmethod
+    def _decode_payload(data: bytes) -> dict[str, Any]:
+        url, pos = _read_bytes(data, 0)
+        d: dict[str, Any] = {"url": url.decode()}
+        method_index = data[pos]
+        pos += 1
+        if method_index == 0xFF:
+            method, pos = _read_bytes(data, pos)
+            d["method"] = method.decode()
+        else:
+            d["method"] = _METHODS[method_index]
+        d["callback"], pos = _read_optional_str(data, pos)
+        d["errback"], pos = _read_optional_str(data, pos)
+        zigzag, pos = _read_varint(data, pos)
+        d["priority"] = zigzag >> 1 if not zigzag & 1 else -(zigzag + 1) // 2
+        d["dont_filter"] = bool(data[pos])
+        pos += 1
+        d["encoding"], pos = _read_optional_str(data, pos)
+        request_class, pos = _read_optional_str(data, pos)
+        if request_class is not None:
+            d["_class"] = request_class
+        header_count, pos = _read_varint(data, pos)
+        headers: dict[bytes, list[bytes]] = {}
+        for _ in range(header_count):
+            name_index, pos = _read_varint(data, pos)
+            if name_index:
+                name = _HEADER_NAMES[name_index - 1]
+            else:
+                name, pos = _read_bytes(data, pos)
+            value_count, pos = _read_varint(data, pos)
+            values = []
+            for _ in range(value_count):
+                value, pos = _read_bytes(data, pos)
+                values.append(value)
+            headers[name] = values
+        d["headers"] = headers
+        d["body"], pos = _read_bytes(data, pos)
+        if pos < len(data):
+            d.update(pickle.loads(data[pos:]))  # noqa: S301
+        return d
+
+
 # queue.*Queue aren't subclasses of queue.BaseQueue
 _PickleFifoSerializationDiskQueue = _serializable_queue(
-    _with_mkdir(queue.FifoDiskQueue),  # type: ignore[arg-type]
+    _write_behind(_with_mkdir(queue.FifoDiskQueue)),  # type: ignore[arg-type]
     _pickle_serialize,
     pickle.loads,
 )
 _PickleLifoSerializationDiskQueue = _serializable_queue(
-    _with_mkdir(queue.LifoDiskQueue),  # type: ignore[arg-type]
+    _write_behind(_with_mkdir(queue.LifoDiskQueue)),  # type: ignore[arg-type]
     _pickle_serialize,
     pickle.loads,
 )
 _MarshalFifoSerializationDiskQueue = _serializable_queue(
-    _with_mkdir(queue.FifoDiskQueue),  # type: ignore[arg-type]
+    _write_behind(_with_mkdir(queue.FifoDiskQueue)),  # type: ignore[arg-type]
     marshal.dumps,
     marshal.loads,
 )
 _MarshalLifoSerializationDiskQueue = _serializable_queue(
-    _with_mkdir(queue.LifoDiskQueue),  # type: ignore[arg-type]
+    _write_behind(_with_mkdir(queue.LifoDiskQueue)),  # type: ignore[arg-type]
     marshal.dumps,
     marshal.loads,
 )
@@ -174,3 +577,9 @@ MarshalFifoDiskQueue = _scrapy_serialization_queue(_MarshalFifoSerializationDisk
 MarshalLifoDiskQueue = _scrapy_serialization_queue(_MarshalLifoSerializationDiskQueue)
 FifoMemoryQueue = _scrapy_non_serialization_queue(queue.FifoMemoryQueue)  # type: ignore[arg-type]
 LifoMemoryQueue = _scrapy_non_serialization_queue(queue.LifoMemoryQueue)  # type: ignore[arg-type]
+BinaryFifoDiskQueue = _scrapy_binary_serialization_queue(
+    _write_behind(_with_mkdir(queue.FifoDiskQueue))  # type: ignore[arg-type]
+)
+BinaryLifoDiskQueue = _scrapy_binary_serialization_queue(
+    _write_behind(_with_mkdir(queue.LifoDiskQueue))  # type: ignore[arg-type]
+)
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import contextlib
 import zlib
 from io import BytesIO
+from typing import Any
 from warnings import warn
 
 from scrapy.exceptions import ScrapyDeprecationWarning
@@ -37,6 +40,14 @@ else:
         def _brotli_decompress(decompressor, data):
             return decompressor.process(data)
 
+    # brotli 1.2.0+ can bound the output of each process() call.
+    try:
+        brotli.Decompressor().process(b"", output_buffer_limit=1)
+    except (AttributeError, TypeError):
+        _BROTLI_OUTPUT_BUFFER_LIMIT = False
+    else:
+        _BROTLI_OUTPUT_BUFFER_LIMIT = True
+
 
 with contextlib.suppress(ImportError):
     import zstandard
@@ -49,6 +60,14 @@ class _DecompressionMaxSizeExceeded(ValueError):
     pass
 
 
+#: Exceptions raised by the stream decompressors on corrupt data.
+_DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (zlib.error,)
+if "brotli" in globals():
+    _DECOMPRESSION_ERRORS += (getattr(brotli, "error", None) or brotli.Error,)
+if "zstandard" in globals():
+    _DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+
 def _inflate(data: bytes, *, max_size: int = 0) -> bytes:
     decompressor = zlib.decompressobj()
     raw_decompressor = zlib.decompressobj(wbits=-15)
@@ -122,3 +141,222 @@ def _unzstd(data: bytes, *, max_size: int = 0) -> bytes:
         output_stream.write(output_chunk)
     output_stream.seek(0)
     return output_stream.read()
+
+
+def _zlib_decompress(decompressor: Any, data: bytes, max_size: int) -> bytes:
+    if not max_size:
+        return decompressor.decompress(data)
+    # Never produce more than max_size + 1 bytes, however large the
+    # decompression ratio.
+    output_chunks = []
+    decompressed_size = 0
+    while True:
+        output_chunk = decompressor.decompress(data, max_size - decompressed_size + 1)
+        decompressed_size += len(output_chunk)
+        if decompressed_size > max_size:
+            raise _DecompressionMaxSizeExceeded(
+                f"The number of bytes decompressed so far "
+                f"({decompressed_size} B) exceed the specified maximum "
+                f"({max_size} B)."
+            )
+        output_chunks.append(output_chunk)
+        data = decompressor.unconsumed_tail
+        if not data:
+            return b"".join(output_chunks)
+
+
+class _GzipStreamDecompressor:
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._output = False
+        self._failed = False
+
+    def decompress(self, data: bytes, max_size: int = 0) -> bytes:
+        output_chunks = []
+        while data and not self._failed:
+            try:
+                output_chunk = _zlib_decompress(self._decompressor, data, max_size)
+            except zlib.error:
+                # Like gunzip(), keep the data decompressed so far, if any,
+                # e.g. on CRC checksum errors or trailing garbage.
+                if not self._output:
+                    raise
+                self._failed = True
+                break
+            self._output = self._output or bool(output_chunk)
+            output_chunks.append(output_chunk)
+            if max_size:
+                max_size = max(max_size - len(output_chunk), 1)
+            # Concatenated gzip members.
+            data = self._decompressor.unused_data
+            if data:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        return b"".join(output_chunks)
+
+
+class _DeflateStreamDecompressor:
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj()
+        # Input received until the zlib header is checked.
+        self._head: bytes | None = b""
+
+    def decompress(self, data: bytes, max_size: int = 0) -> bytes:
+        if self._head is None:
+            return _zlib_decompress(self._decompressor, data, max_size)
+        self._head += data
+        try:
+            output = _zlib_decompress(self._decompressor, data, max_size)
+        except zlib.error:
+            # Raw deflate data, see _inflate().
+            self._decompressor = zlib.decompressobj(wbits=-15)
+            data, self._head = self._head, None
+            return _zlib_decompress(self._decompressor, data, max_size)
+        if len(self._head) >= 2:
+            self._head = None
+        return output
+
+
+def _check_max_size(decompressed_size: int, max_size: int) -> None:
+    if max_size and decompressed_size > max_size:
+        raise _DecompressionMaxSizeExceeded(
+            f"The number of bytes decompressed so far "
+            f"({decompressed_size} B) exceed the specified maximum "
+            f"({max_size} B)."
+        )
+
+
+class _BrotliStreamDecompressor:
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_size: int = 0) -> bytes:
+        if not max_size:
+            return _brotli_decompress(self._decompressor, data)
+        output_chunks = []
+        decompressed_size = 0
+        if _BROTLI_OUTPUT_BUFFER_LIMIT:
+            # Never produce much more than max_size + 1 bytes, however large
+            # the decompression ratio.
+            output_chunk = self._decompressor.process(
+                data, output_buffer_limit=max_size + 1
+            )
+            while output_chunk:
+                decompressed_size += len(output_chunk)
+                _check_max_size(decompressed_size, max_size)
+                output_chunks.append(output_chunk)
+                if self._decompressor.is_finished():
+                    break
+                output_chunk = self._decompressor.process(
+                    b"", output_buffer_limit=max_size - decompressed_size + 1
+                )
+            return b"".join(output_chunks)
+        # Like _unbrotli(), check the size after each input chunk.
+        input_stream = BytesIO(data)
+        while input_chunk := input_stream.read(_CHUNK_SIZE):
+            output_chunk = _brotli_decompress(self._decompressor, input_chunk)
+            decompressed_size += len(output_chunk)
+            _check_max_size(decompressed_size, max_size)
+            output_chunks.append(output_chunk)
+        return b"".join(output_chunks)
+
+
+class _BoundedOutput:
+    """Collects the output of a zstandard stream writer, raising
+    _DecompressionMaxSizeExceeded as soon as it exceeds :attr:`max_size`
+    bytes."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.size: int = 0
+        self.max_size: int = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        _check_max_size(self.size, self.max_size)
+        self.chunks.append(data)
+        return len(data)
+
+
+class _ZstdStreamDecompressor:
+    def __init__(self) -> None:
+        self._output = _BoundedOutput()
+        # The writer passes its output to _output in chunks of up to
+        # _CHUNK_SIZE bytes, so that the size is checked as it grows. It only
+        # calls write() on _output, which is therefore not a full IO[bytes].
+        self._writer = zstandard.ZstdDecompressor().stream_writer(
+            self._output,  # type: ignore[arg-type]
+            write_size=_CHUNK_SIZE,
+        )
+
+    def decompress(self, data: bytes, max_size: int = 0) -> bytes:
+        self._output.size = 0
+        self._output.max_size = max_size
+        try:
+            self._writer.write(data)
+            return b"".join(self._output.chunks)
+        finally:
+            self._output.chunks = []
+
+
+_STREAM_DECOMPRESSORS: dict[bytes, type] = {
+    b"gzip": _GzipStreamDecompressor,
+    b"x-gzip": _GzipStreamDecompressor,
+    b"deflate": _DeflateStreamDecompressor,
+}
+if "brotli" in globals():
+    _STREAM_DECOMPRESSORS[b"br"] = _BrotliStreamDecompressor
+if "zstandard" in globals():
+    _STREAM_DECOMPRESSORS[b"zstd"] = _ZstdStreamDecompressor
+
+
+class _StreamDecompressor:
+    """Decompresses a response body chunk by chunk as it is downloaded.
+
+    Raises :exc:`_DecompressionMaxSizeExceeded` as soon as more than
+    *max_size* bytes are decompressed.
+    """
+
+    def __init__(self, encodings: list[bytes], max_size: int = 0):
+        self._decompressors = [
+            _STREAM_DECOMPRESSORS[encoding]() for encoding in reversed(encodings)
+        ]
+        self._max_size = max_size
+        self.size = 0
+
+    @classmethod
+    def from_content_encoding(
+        cls, content_encoding: list[bytes], max_size: int = 0
+    ) -> _StreamDecompressor | None:
+        """Return a decompressor for the given Content-Encoding header values,
+        or ``None`` if there is no encoding or some encoding is not
+        supported."""
+        encodings = [
+            encoding.strip().lower()
+            for encodings in content_encoding
+            for encoding in encodings.split(b",")
+        ]
+        if not encodings or not all(
+            encoding in _STREAM_DECOMPRESSORS for encoding in encodings
+        ):
+            return None
+        return cls(encodings, max_size)
+
+    def decompress(self, data: bytes) -> bytes:
+        *outer, inner = self._decompressors
+        # At least 1, as 0 means no limit.
+        max_size = max(self._max_size - self.size, 1) if self._max_size else 0
+        # Decompression bombs can be nested, so the output of the outer
+        # encodings is bounded too.
+        for decompressor in outer:
+            if not data:
+                return b""
+            data = decompressor.decompress(data, max_size)
+        data = inner.decompress(data, max_size)
+        self.size += len(data)
+        if self._max_size and self.size > self._max_size:
+            raise _DecompressionMaxSizeExceeded(
+                f"The number of bytes decompressed so far "
+                f"({self.size} B) exceed the specified maximum "
+                f"({self._max_size} B)."
+            )
+        return data
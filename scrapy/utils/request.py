@@ -13,16 +13,16 @@ from urllib.parse import urlunparse
 from weakref import WeakKeyDictionary
 
 from w3lib.http import basic_auth_header
-from w3lib.url import canonicalize_url
 
 from scrapy import Request, Spider
 from scrapy.exceptions import ScrapyDeprecationWarning
 from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.misc import load_object
 from scrapy.utils.python import to_bytes, to_unicode
+from scrapy.utils.url import cached_canonicalize_url
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
 
     # typing.Self requires Python 3.11
     from typing_extensions import Self
@@ -89,7 +89,7 @@ def fingerprint(
                     ]
         fingerprint_data = {
             "method": to_unicode(request.method),
-            "url": canonicalize_url(request.url, keep_fragments=keep_fragments),
+            "url": cached_canonicalize_url(request.url, keep_fragments),
             "body": (request.body or b"").hex(),
             "headers": headers,
         }
@@ -100,6 +100,78 @@ def fingerprint(
     return cache[cache_key]
 
 
+_stream_fingerprint_cache: WeakKeyDictionary[
+    Request, dict[tuple[tuple[bytes, ...] | None, bool, str], bytes]
+] = WeakKeyDictionary()
+
+_FINGERPRINT_HASHES: dict[str, Callable[[], Any]] = {
+    "blake2b": lambda: hashlib.blake2b(digest_size=20),
+    "sha1": lambda: hashlib.sha1(usedforsecurity=False),
+}
+
+
+def stream_fingerprint(
+    request: Request,
+    *,
+    include_headers: Iterable[bytes | str] | None = None,
+    keep_fragments: bool = False,
+    algorithm: str = "sha1",
+) -> bytes:
+    """Return the request fingerprint, like :func:`fingerprint`, but faster.
+
+    Instead of serializing the request data to JSON, the method, canonical
+    URL, body and headers are fed, length-prefixed, into an incremental hash,
+    which avoids copies of the request body.
+
+    *algorithm* may be ``"sha1"`` or ``"blake2b"``. Both return 20-byte
+    fingerprints; which one is faster depends on the CPU, as many CPUs
+    accelerate SHA1 in hardware.
+
+    The resulting fingerprints are different from those of
+    :func:`fingerprint`.
+    """
+    processed_include_headers: tuple[bytes, ...] | None = None
+    if include_headers:
+        processed_include_headers = tuple(
+            to_bytes(h.lower()) for h in sorted(include_headers)
+        )
+    cache = _stream_fingerprint_cache.get(request)
+    if cache is None:
+        cache = _stream_fingerprint_cache[request] = {}
+    cache_key = (processed_include_headers, keep_fragments, algorithm)
+    if cache_key in cache:
+        return cache[cache_key]
+    try:
+        hash_ = _FINGERPRINT_HASHES[algorithm]()
+    except KeyError:
+        raise ValueError(
+            f"Unsupported fingerprint algorithm {algorithm!r}, "
+            f"use one of: {', '.join(sorted(_FINGERPRINT_HASHES))}"
+        ) from None
+    update = hash_.update
+    url = cached_canonicalize_url(request.url, keep_fragments).encode()
+    body = request.body or b""
+    for part in (request.method.encode(), url, body):
+        update(len(part).to_bytes(8, "big"))
+        update(part)
+    headers = [
+        header
+        for header in processed_include_headers or ()
+        if header in request.headers
+    ]
+    update(len(headers).to_bytes(8, "big"))
+    for header in headers:
+        values = request.headers.getlist(header)
+        update(len(header).to_bytes(8, "big"))
+        update(header)
+        update(len(values).to_bytes(8, "big"))
+        for value in values:
+            update(len(value).to_bytes(8, "big"))
+            update(value)
+    cache[cache_key] = fp = hash_.digest()
+    return fp
+
+
 class RequestFingerprinterProtocol(Protocol):
     def fingerprint(self, request: Request) -> bytes: ...
 
@@ -139,6 +211,35 @@ class RequestFingerprinter:
         return self._fingerprint(request)
 
 
+class StreamRequestFingerprinter:
+    """Request fingerprinter that uses :func:`stream_fingerprint`.
+
+    It takes into account the same request data as the default
+    :class:`RequestFingerprinter`, but computes fingerprints faster, especially
+    for requests with large bodies. Its hash algorithm is set by
+    :setting:`REQUEST_FINGERPRINTER_ALGORITHM`.
+
+    Its fingerprints are different from those of the default fingerprinter, so
+    switching to it invalidates fingerprints stored by components such as the
+    :setting:`JOBDIR` state and the HTTP cache (:setting:`HTTPCACHE_ENABLED`).
+    """
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        return cls(crawler.settings.get("REQUEST_FINGERPRINTER_ALGORITHM"))
+
+    def __init__(self, algorithm: str = "sha1"):
+        if algorithm not in _FINGERPRINT_HASHES:
+            raise ValueError(
+                f"Unsupported REQUEST_FINGERPRINTER_ALGORITHM value {algorithm!r}, "
+                f"use one of: {', '.join(sorted(_FINGERPRINT_HASHES))}"
+            )
+        self.algorithm = algorithm
+
+    def fingerprint(self, request: Request) -> bytes:
+        return stream_fingerprint(request, algorithm=self.algorithm)
+
+
 def request_authenticate(
     request: Request,
     username: str,
@@ -61,6 +61,12 @@ def get_temp_key_info(ssl_object: Any) -> str | None:
     return ", ".join(key_info)
 
 
+def get_session_reused(ssl_object: Any) -> bool | None:
+    if not hasattr(pyOpenSSLutil.lib, "SSL_session_reused"):
+        return None
+    return bool(pyOpenSSLutil.lib.SSL_session_reused(ssl_object))
+
+
 def get_openssl_version() -> str:
     system_openssl_bytes = OpenSSL.SSL.SSLeay_version(OpenSSL.SSL.SSLEAY_VERSION)
     system_openssl = system_openssl_bytes.decode("ascii", errors="replace")
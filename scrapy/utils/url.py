@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import re
 import warnings
+from functools import lru_cache
 from importlib import import_module
 from typing import TYPE_CHECKING, Union
 from urllib.parse import ParseResult, urldefrag, urlparse, urlunparse
@@ -15,6 +16,7 @@ from warnings import warn
 from w3lib.url import __all__ as _public_w3lib_objects
 from w3lib.url import add_or_replace_parameter as _add_or_replace_parameter
 from w3lib.url import any_to_uri as _any_to_uri
+from w3lib.url import canonicalize_url as _canonicalize_url
 from w3lib.url import parse_url as _parse_url
 
 from scrapy.exceptions import ScrapyDeprecationWarning
@@ -34,6 +36,7 @@ def __getattr__(name: str):
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from functools import _CacheInfo
 
     from scrapy import Spider
 
@@ -202,3 +205,61 @@ def strip_url(
             "" if strip_fragment else parsed_url.fragment,
         )
     )
+
+
+def _canonicalize_url_str(url: str, keep_fragments: bool) -> str:
+    return _canonicalize_url(url, keep_fragments=keep_fragments)
+
+
+class _CanonicalizeUrlCache:
+    """Process-wide state of the :func:`cached_canonicalize_url` cache."""
+
+    def __init__(self, maxsize: int):
+        self.function = lru_cache(maxsize=maxsize)(_canonicalize_url_str)
+        # Whether a crawler has set the cache size, see
+        # _configure_canonicalize_url_cache_size().
+        self.configured: bool = False
+
+
+_canonicalize_url_cache = _CanonicalizeUrlCache(maxsize=10_000)
+
+
+def cached_canonicalize_url(url: UrlT, keep_fragments: bool = False) -> str:
+    """Return :func:`w3lib.url.canonicalize_url` for *url*, using a
+    process-wide LRU cache for string URLs.
+
+    Its size is set by the :setting:`CANONICALIZE_URL_CACHE_SIZE` setting.
+    """
+    if not isinstance(url, str):
+        return _canonicalize_url(url, keep_fragments=keep_fragments)
+    return _canonicalize_url_cache.function(url, keep_fragments)
+
+
+def set_canonicalize_url_cache_size(size: int) -> None:
+    """Set the maximum number of entries of the :func:`cached_canonicalize_url`
+    cache, clearing it if the size changes."""
+    cache = _canonicalize_url_cache
+    if size != cache.function.cache_info().maxsize:
+        cache.function = lru_cache(maxsize=size)(_canonicalize_url_str)
+
+
+def _configure_canonicalize_url_cache_size(size: int) -> bool:
+    """Set the size of the :func:`cached_canonicalize_url` cache from the
+    settings of the first crawler of the process.
+
+    The cache is shared by every crawler of the process, so later crawlers
+    leave it unchanged, and ``False`` is returned if they ask for a different
+    size.
+    """
+    cache = _canonicalize_url_cache
+    if cache.configured:
+        return size == cache.function.cache_info().maxsize
+    set_canonicalize_url_cache_size(size)
+    cache.configured = True
+    return True
+
+
+def canonicalize_url_cache_info() -> _CacheInfo:
+    """Return the hits, misses, maximum size and current size of the
+    :func:`cached_canonicalize_url` cache."""
+    return _canonicalize_url_cache.function.cache_info()
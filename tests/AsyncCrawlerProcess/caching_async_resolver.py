@@ -0,0 +1,25 @@
+import sys
+
+import scrapy
+from scrapy.crawler import AsyncCrawlerProcess
+
+
+class CachingAsyncResolverSpider(scrapy.Spider):
+    name = "caching_async_resolver_spider"
+
+    async def start(self):
+        yield scrapy.Request(self.url)
+
+    def parse(self, response):
+        self.logger.info(f"Got response {response.status}")
+
+
+if __name__ == "__main__":
+    process = AsyncCrawlerProcess(
+        settings={
+            "RETRY_ENABLED": False,
+            "DNS_RESOLVER": "scrapy.resolver.CachingAsyncResolver",
+        }
+    )
+    process.crawl(CachingAsyncResolverSpider, url=sys.argv[1])
+    process.start()
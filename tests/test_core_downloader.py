@@ -4,11 +4,12 @@ import shutil
 import warnings
 from pathlib import Path
 from tempfile import mkdtemp
+from time import time
 from typing import Any, cast
 
 import OpenSSL.SSL
 import pytest
-from twisted.internet.defer import Deferred, inlineCallbacks
+from twisted.internet.defer import CancelledError, Deferred, inlineCallbacks
 from twisted.protocols.policies import WrappingFactory
 from twisted.trial import unittest
 from twisted.web import server, static
@@ -16,12 +17,16 @@ from twisted.web.client import Agent, BrowserLikePolicyForHTTPS, readBody
 from twisted.web.client import Response as TxResponse
 from twisted.web.iweb import IBodyProducer
 
-from scrapy.core.downloader import Slot
+from scrapy import Request, signals
+from scrapy.core.downloader import Downloader, Slot
+from scrapy.core.downloader._body import ResponseBodyBuffer
+from scrapy.core.downloader.bandwidth import BandwidthLimiter
 from scrapy.core.downloader.contextfactory import (
     ScrapyClientContextFactory,
     load_context_factory_from_settings,
 )
 from scrapy.core.downloader.handlers.http11 import _RequestBodyProducer
+from scrapy.http import Response
 from scrapy.settings import Settings
 from scrapy.utils.defer import deferred_f_from_coro_f, maybe_deferred_to_future
 from scrapy.utils.misc import build_from_crawler
@@ -35,6 +40,246 @@ class TestSlot:
         slot = Slot(concurrency=8, delay=0.1, randomize_delay=True)
         assert repr(slot) == "Slot(concurrency=8, delay=0.10, randomize_delay=True)"
 
+    def test_take_token_unlimited(self):
+        slot = Slot(concurrency=8, delay=0, randomize_delay=False)
+        assert all(slot.take_token(100.0) == 0 for _ in range(100))
+
+    def test_take_token(self):
+        slot = Slot(concurrency=8, delay=0, randomize_delay=False, rate=2, burst=3)
+        assert [slot.take_token(100.0) for _ in range(3)] == [0, 0, 0]
+        assert slot.take_token(100.0) == pytest.approx(0.5)
+        assert slot.take_token(100.25) == pytest.approx(0.25)
+        assert slot.take_token(100.5) == 0
+        assert slot.take_token(100.5) == pytest.approx(0.5)
+        # Tokens do not accumulate beyond the burst size.
+        assert [slot.take_token(200.0) for _ in range(4)][-1] == pytest.approx(0.5)
+
+
+class TestBandwidthLimiter:
+    def test_unlimited(self):
+        limiter = BandwidthLimiter()
+        assert all(limiter.consume("a", 10**6, 100.0) == 0 for _ in range(10))
+
+    def test_global_limit(self):
+        limiter = BandwidthLimiter(1000)
+        assert limiter.consume("a", 600, 100.0) == 0
+        assert limiter.consume("b", 600, 100.0) == pytest.approx(0.2)
+        assert limiter.consume("a", 100, 100.2) == pytest.approx(0.1)
+        assert limiter.consume("a", 100, 100.5) == 0
+        # The budget does not accumulate beyond one second of traffic.
+        assert limiter.consume("a", 1500, 200.0) == pytest.approx(0.5)
+
+    def test_slot_limit(self):
+        limiter = BandwidthLimiter(slot_limit=1000, slot_limits={"b": 100})
+        assert limiter.consume("a", 1000, 100.0) == 0
+        assert limiter.consume("a", 500, 100.0) == pytest.approx(0.5)
+        assert limiter.consume("b", 200, 100.0) == pytest.approx(1)
+        assert limiter.consume("c", 1000, 100.0) == 0
+        assert limiter.consume(None, 10**6, 100.0) == 0
+
+    def test_global_and_slot_limits(self):
+        limiter = BandwidthLimiter(1000, 500)
+        assert limiter.consume("a", 1000, 100.0) == pytest.approx(1)
+        assert limiter.consume("b", 500, 100.0) == pytest.approx(0.5)
+
+    def test_remove_slot(self):
+        limiter = BandwidthLimiter(slot_limit=1000)
+        assert limiter.consume("a", 2000, 100.0) == pytest.approx(1)
+        limiter.remove_slot("a")
+        assert limiter.consume("a", 1000, 100.0) == 0
+
+    def test_stats(self):
+        crawler = get_crawler()
+        limiter = BandwidthLimiter(1000, 500, stats=crawler.stats)
+        limiter.consume("a", 500, 100.0)
+        limiter.consume("a", 1000, 100.0)
+        limiter.consume("b", 250, 100.0)
+        assert crawler.stats.get_stats() == {
+            "downloader/bandwidth/global/limit": 1000,
+            "downloader/bandwidth/slot/limit": 500,
+            "downloader/bandwidth/global/pause_count": 2,
+            "downloader/bandwidth/global/pause_time_ms": 1250,
+            "downloader/bandwidth/slot/pause_count": 1,
+            "downloader/bandwidth/slot/pause_time_ms": 2000,
+        }
+
+
+class TestEnqueueRequest:
+    def test_cancel_queued(self):
+        crawler = get_crawler()
+        downloader = Downloader(crawler)
+        slot = Slot(concurrency=1, delay=60, randomize_delay=False)
+        slot.lastseen = time()
+        downloader.slots["example.com"] = slot
+        left: list[Request] = []
+
+        def request_left(request, spider):
+            left.append(request)
+
+        crawler.signals.connect(request_left, signals.request_left_downloader)
+        request = Request("https://example.com")
+        d = downloader._enqueue_request(request, None)
+        assert slot.queue
+        d.addErrback(lambda failure: failure.trap(CancelledError))
+        d.cancel()
+        assert left == [request]
+        assert not slot.queue
+        assert not slot.active
+        downloader.close()
+
+
+class TestCoalesceRequests:
+    def _get_downloader(self, enabled=True):
+        crawler = get_crawler(settings_dict={"DOWNLOADER_COALESCE_REQUESTS": enabled})
+        downloader = Downloader(crawler)
+        downloader._slot_gc_loop.stop()  # Prevent an unclean reactor.
+        self.downloads: list[tuple[Request, Deferred[Response]]] = []
+        self.left: list[Request] = []
+
+        def enqueue_in_slot(slot, request, spider):
+            d: Deferred[Response] = Deferred()
+            self.downloads.append((request, d))
+            return d
+
+        def request_left(request, spider):
+            self.left.append(request)
+
+        downloader._enqueue_in_slot = enqueue_in_slot
+        # Signal handlers are weakly referenced.
+        self.request_left = request_left
+        crawler.signals.connect(request_left, signals.request_left_downloader)
+        return downloader
+
+    @staticmethod
+    def _results(*dfds: Deferred) -> list[Any]:
+        results: list[Any] = [None] * len(dfds)
+
+        def store(result: Any, index: int) -> None:
+            results[index] = result
+
+        for i, d in enumerate(dfds):
+            d.addBoth(store, i)
+        return results
+
+    def test_coalesce(self):
+        downloader = self._get_downloader()
+        request1 = Request("https://example.com", dont_filter=True)
+        request2 = Request("https://example.com", dont_filter=True)
+        results = self._results(
+            downloader._enqueue_request(request1, None),
+            downloader._enqueue_request(request2, None),
+        )
+        assert len(self.downloads) == 1
+        assert downloader.slots["example.com"].active == {request1, request2}
+        response = Response("https://example.com", body=b"foo", request=request1)
+        self.downloads[0][1].callback(response)
+        assert results[0] is response
+        assert results[1] is not response
+        assert results[1].body == b"foo"
+        assert results[1].request is request2
+        assert downloader.stats.get_value("downloader/coalesced_request_count") == 1
+        assert self.left == [request2]
+        assert not downloader.slots["example.com"].active
+        assert not downloader._in_flight
+
+    def test_different_requests(self):
+        downloader = self._get_downloader()
+        downloader._enqueue_request(Request("https://example.com/a"), None)
+        downloader._enqueue_request(Request("https://example.com/b"), None)
+        assert len(self.downloads) == 2
+
+    def test_different_headers(self):
+        downloader = self._get_downloader()
+        downloader._enqueue_request(
+            Request("https://example.com", headers={"Cookie": "a=1"}), None
+        )
+        downloader._enqueue_request(
+            Request("https://example.com", headers={"Cookie": "a=2"}), None
+        )
+        assert len(self.downloads) == 2
+
+    def test_different_proxies(self):
+        downloader = self._get_downloader()
+        downloader._enqueue_request(
+            Request("https://example.com", meta={"proxy": "http://a.example"}), None
+        )
+        downloader._enqueue_request(
+            Request("https://example.com", meta={"proxy": "http://b.example"}), None
+        )
+        assert len(self.downloads) == 2
+
+    def test_disabled(self):
+        downloader = self._get_downloader(enabled=False)
+        downloader._enqueue_request(Request("https://example.com"), None)
+        downloader._enqueue_request(Request("https://example.com"), None)
+        assert len(self.downloads) == 2
+
+    def test_failure(self):
+        downloader = self._get_downloader()
+        request1 = Request("https://example.com")
+        request2 = Request("https://example.com")
+        request3 = Request("https://example.com")
+        results = self._results(
+            downloader._enqueue_request(request1, None),
+            downloader._enqueue_request(request2, None),
+            downloader._enqueue_request(request3, None),
+        )
+        self.downloads[0][1].errback(ValueError())
+        # The waiting requests are downloaded again, coalesced together.
+        assert len(self.downloads) == 2
+        assert self.downloads[1][0] is request2
+        self.downloads[1][1].callback(Response("https://example.com", request=request2))
+        assert results[0].check(ValueError)
+        assert results[1].request is request2
+        assert results[2].request is request3
+        assert downloader.stats.get_value("downloader/coalesced_request_count") == 1
+
+    def test_cancel_waiting(self):
+        downloader = self._get_downloader()
+        request1 = Request("https://example.com")
+        request2 = Request("https://example.com")
+        results = self._results(downloader._enqueue_request(request1, None))
+        d = downloader._enqueue_request(request2, None)
+        d.addErrback(lambda failure: failure.trap(CancelledError))
+        d.cancel()
+        assert self.left == [request2]
+        assert downloader.slots["example.com"].active == {request1}
+        response = Response("https://example.com", request=request1)
+        self.downloads[0][1].callback(response)
+        assert results[0] is response
+        assert not downloader.stats.get_value("downloader/coalesced_request_count")
+
+
+class TestResponseBodyBuffer:
+    def test_getvalue(self):
+        buffer = ResponseBodyBuffer()
+        assert buffer.getvalue() == b""
+        chunk = b"0123"
+        buffer.write(chunk)
+        assert buffer.getvalue() is chunk
+        buffer.write(b"4567")
+        assert buffer.getvalue() == b"01234567"
+        assert buffer.size == 8
+        assert not buffer.spooled
+
+    def test_spool(self):
+        buffer = ResponseBodyBuffer(spoolsize=6)
+        buffer.write(b"0123")
+        buffer.write(b"4567")
+        assert buffer.spooled
+        buffer.write(b"89")
+        body = buffer.getvalue()
+        assert body == b"0123456789"
+        assert not buffer.spooled
+        assert buffer.getvalue() is body
+
+    def test_clear(self):
+        buffer = ResponseBodyBuffer(spoolsize=2)
+        buffer.write(b"0123")
+        buffer.clear()
+        assert not buffer.spooled
+        assert buffer.getvalue() == b""
+
 
 class TestContextFactoryBase(unittest.TestCase):
     context_factory = None
@@ -127,6 +372,50 @@ class TestContextFactory(TestContextFactoryBase):
             )
 
 
+class TestContextFactoryTLSSessionCache(TestContextFactoryBase):
+    async def _get_pages(self, settings_dict: dict[str, Any]) -> Any:
+        crawler = get_crawler(settings_dict=settings_dict)
+        client_context_factory = load_context_factory_from_settings(
+            crawler.settings, crawler
+        )
+        for _ in range(3):
+            body = await self.get_page(self.getURL("file"), client_context_factory)
+            assert body == b"0123456789"
+        return crawler.stats
+
+    @deferred_f_from_coro_f
+    async def test_disabled(self):
+        stats = await self._get_pages({})
+        assert stats.get_value("downloader/tls_handshake/full") is None
+        assert stats.get_value("downloader/tls_handshake/resumed") is None
+
+    @deferred_f_from_coro_f
+    async def test_enabled(self):
+        stats = await self._get_pages({"DOWNLOADER_CLIENT_TLS_SESSION_CACHE": True})
+        assert stats.get_value("downloader/tls_handshake/full") == 1
+        assert stats.get_value("downloader/tls_handshake/resumed") == 2
+
+    @deferred_f_from_coro_f
+    async def test_port(self):
+        crawler = get_crawler(
+            settings_dict={"DOWNLOADER_CLIENT_TLS_SESSION_CACHE": True}
+        )
+        client_context_factory = load_context_factory_from_settings(
+            crawler.settings, crawler
+        )
+        other_port = self._listen(self.wrapper)
+        try:
+            other_url = f"https://127.0.0.1:{other_port.getHost().port}/file"
+            for url in (self.getURL("file"), other_url, self.getURL("file")):
+                body = await self.get_page(url, client_context_factory)
+                assert body == b"0123456789"
+        finally:
+            await maybe_deferred_to_future(other_port.stopListening())
+        # Sessions are not shared between the ports of a host.
+        assert crawler.stats.get_value("downloader/tls_handshake/full") == 2
+        assert crawler.stats.get_value("downloader/tls_handshake/resumed") == 1
+
+
 class TestContextFactoryTLSMethod(TestContextFactoryBase):
     async def _assert_factory_works(
         self, client_context_factory: ScrapyClientContextFactory
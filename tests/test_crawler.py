@@ -34,6 +34,11 @@ from scrapy.utils.defer import deferred_f_from_coro_f, deferred_from_coro
 from scrapy.utils.log import configure_logging, get_scrapy_root_handler
 from scrapy.utils.spider import DefaultSpider
 from scrapy.utils.test import get_crawler, get_reactor_settings
+from scrapy.utils.url import (
+    cached_canonicalize_url,
+    canonicalize_url_cache_info,
+    set_canonicalize_url_cache_size,
+)
 from tests.mockserver import MockServer, get_mockserver_env
 
 BASE_SETTINGS: dict[str, Any] = {}
@@ -838,6 +843,14 @@ class TestCrawlerProcessSubprocessBase(ScriptRunnerMixin, unittest.TestCase):
             assert "TimeoutError" not in log
             assert "twisted.internet.error.DNSLookupError" not in log
 
+    def test_caching_async_resolver_ip_address(self):
+        with MockServer() as mock_server:
+            http_address = mock_server.http_address.replace("0.0.0.0", "127.0.0.1")
+            log = self.run_script("caching_async_resolver.py", http_address)
+            assert "Spider closed (finished)" in log
+            assert "Got response 200" in log
+            assert "DNSLookupError" not in log
+
     def test_twisted_reactor_asyncio(self):
         log = self.run_script("twisted_reactor_asyncio.py")
         assert "Spider closed (finished)" in log
@@ -1173,3 +1186,34 @@ def test_log_scrapy_info(settings, items, caplog):
         f"{item}': '[^']+('\n +'[^']+)*" for item in items
     )
     assert re.search(r"^Versions:\n{'" + expected_items_pattern + "'}$", version_string)
+
+
+@pytest.fixture
+def unconfigured_canonicalize_url_cache():
+    cache = scrapy.utils.url._canonicalize_url_cache
+    configured = cache.configured
+    cache.configured = False
+    yield
+    cache.configured = configured
+    set_canonicalize_url_cache_size(default_settings.CANONICALIZE_URL_CACHE_SIZE)
+
+
+def test_canonicalize_url_cache_size(unconfigured_canonicalize_url_cache, caplog):
+    def ignored_size_warnings():
+        return [
+            record
+            for record in caplog.records
+            if record.levelno == logging.WARNING
+            and "Ignoring CANONICALIZE_URL_CACHE_SIZE" in record.getMessage()
+        ]
+
+    get_crawler(settings_dict={"CANONICALIZE_URL_CACHE_SIZE": 5})
+    cached_canonicalize_url("https://example.com")
+    with caplog.at_level(logging.WARNING):
+        get_crawler(settings_dict={"CANONICALIZE_URL_CACHE_SIZE": 5})
+        assert not ignored_size_warnings()
+        get_crawler(settings_dict={"CANONICALIZE_URL_CACHE_SIZE": 6})
+    (record,) = ignored_size_warnings()
+    assert "CANONICALIZE_URL_CACHE_SIZE=6" in record.getMessage()
+    info = canonicalize_url_cache_info()
+    assert (info.maxsize, info.currsize) == (5, 1)
@@ -0,0 +1,157 @@
+"""Tests for scrapy.core.downloader.handlers.http11_asyncio.AsyncioHTTP11DownloadHandler."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+from twisted.internet import defer
+from twisted.web.client import ResponseFailed
+
+from scrapy.core.downloader.handlers.http11_asyncio import (
+    AsyncioHTTP11DownloadHandler,
+)
+from scrapy.http import Request
+from scrapy.spiders import Spider
+from scrapy.utils.defer import deferred_f_from_coro_f
+from tests.test_downloader_handlers_http_base import (
+    TestHttp11Base,
+    TestHttpMockServerBase,
+    TestHttpProxyBase,
+    TestHttps11Base,
+    TestHttpsCustomCiphersBase,
+    TestHttpsInvalidDNSIdBase,
+    TestHttpsInvalidDNSPatternBase,
+    TestHttpsWrongHostnameBase,
+    TestSimpleHttpsBase,
+)
+
+if TYPE_CHECKING:
+    from scrapy.core.downloader.handlers import DownloadHandlerProtocol
+
+
+pytestmark = pytest.mark.only_asyncio
+
+
+class AsyncioHTTP11DownloadHandlerMixin:
+    @property
+    def download_handler_cls(self) -> type[DownloadHandlerProtocol]:
+        return AsyncioHTTP11DownloadHandler
+
+
+class AsyncioHTTP11DownloadHandlerTestMixin(AsyncioHTTP11DownloadHandlerMixin):
+    @deferred_f_from_coro_f
+    async def test_download_with_maxsize_very_large_file(self):
+        with mock.patch(
+            "scrapy.core.downloader.handlers.http11_asyncio.logger"
+        ) as logger:
+            request = Request(self.getURL("largechunkedfile"))
+            with pytest.raises(defer.CancelledError):
+                await self.download_request(
+                    request, Spider("foo", download_maxsize=1500)
+                )
+            logger.warning.assert_called_once_with(mock.ANY, mock.ANY)
+
+
+class TestHttp11(AsyncioHTTP11DownloadHandlerTestMixin, TestHttp11Base):
+    @deferred_f_from_coro_f
+    async def test_keep_alive(self):
+        request = Request(self.getURL("file"))
+        response1 = await self.download_request(request, Spider("foo"))
+        response2 = await self.download_request(request, Spider("foo"))
+        assert response1.body == response2.body == b"0123456789"
+        key = self.download_handler._get_key(request)
+        assert len(self.download_handler._pool._idle[key]) == 1
+
+    async def _download_raw_response(self, data: bytes) -> Any:
+        """Download a request from a server that replies with *data*."""
+
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(data)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await self.download_request(
+                Request(f"http://127.0.0.1:{port}/"), Spider("foo")
+            )
+        finally:
+            server.close()
+
+    @deferred_f_from_coro_f
+    async def test_header_too_long(self):
+        with pytest.raises(ResponseFailed):
+            await self._download_raw_response(
+                b"HTTP/1.1 200 OK\r\nX-Foo: " + b"a" * 100_000 + b"\r\n\r\n"
+            )
+
+    @deferred_f_from_coro_f
+    async def test_chunk_size_line_too_long(self):
+        with pytest.raises(ResponseFailed):
+            await self._download_raw_response(
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"1;" + b"a" * 100_000 + b"\r\na\r\n0\r\n\r\n"
+            )
+
+
+class TestHttps11(AsyncioHTTP11DownloadHandlerTestMixin, TestHttps11Base):
+    @pytest.mark.skip(reason="TLS verbose logging is implemented with pyOpenSSL")
+    def test_tls_logging(self):
+        pass
+
+    @deferred_f_from_coro_f
+    async def test_certificate(self):
+        request = Request(self.getURL("file"))
+        response = await self.download_request(request, Spider("foo"))
+        assert response.certificate is not None
+        assert response.certificate.getSubject().commonName == b"localhost"
+
+
+class TestSimpleHttps(AsyncioHTTP11DownloadHandlerMixin, TestSimpleHttpsBase):
+    pass
+
+
+class TestHttps11WrongHostname(
+    AsyncioHTTP11DownloadHandlerMixin, TestHttpsWrongHostnameBase
+):
+    pass
+
+
+class TestHttps11InvalidDNSId(
+    AsyncioHTTP11DownloadHandlerMixin, TestHttpsInvalidDNSIdBase
+):
+    pass
+
+
+class TestHttps11InvalidDNSPattern(
+    AsyncioHTTP11DownloadHandlerMixin, TestHttpsInvalidDNSPatternBase
+):
+    pass
+
+
+class TestHttps11CustomCiphers(
+    AsyncioHTTP11DownloadHandlerMixin, TestHttpsCustomCiphersBase
+):
+    pass
+
+
+class TestHttp11MockServer(TestHttpMockServerBase):
+    @property
+    def settings_dict(self) -> dict[str, Any] | None:
+        return {
+            "DOWNLOAD_HANDLERS": {
+                "http": "scrapy.core.downloader.handlers.http11_asyncio.AsyncioHTTP11DownloadHandler",
+                "https": "scrapy.core.downloader.handlers.http11_asyncio.AsyncioHTTP11DownloadHandler",
+            }
+        }
+
+
+class TestHttp11Proxy(AsyncioHTTP11DownloadHandlerMixin, TestHttpProxyBase):
+    pass
@@ -62,6 +62,8 @@ class TestHttp11MockServer(TestHttpMockServerBase):
     def settings_dict(self) -> dict[str, Any] | None:
         return None  # default handler settings
 
+    dns_timing = False
+
 
 class TestHttp11Proxy(HTTP11DownloadHandlerMixin, TestHttpProxyBase):
     pass
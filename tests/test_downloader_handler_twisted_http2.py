@@ -193,6 +193,7 @@ class TestHttp2MockServer(TestHttpMockServerBase):
         }
 
     is_secure = True
+    dns_timing = False
 
 
 class TestHttps2Proxy(H2DownloadHandlerMixin, TestHttpProxyBase):
@@ -167,6 +167,13 @@ class TestHttpBase(unittest.TestCase, ABC):
         r.putChild(b"largechunkedfile", LargeChunkedFileResource())
         r.putChild(b"duplicate-header", DuplicateHeaderResource())
         r.putChild(b"echo", Echo())
+        r.putChild(
+            b"gzip",
+            resource.EncodingResourceWrapper(
+                static.Data(b"0123456789" * 1000, "text/plain"),
+                [server.GzipEncoderFactory()],
+            ),
+        )
         self.site = server.Site(r, timeout=None)
         self.wrapper = WrappingFactory(self.site)
         self.host = "localhost"
@@ -413,6 +420,25 @@ class TestHttp11Base(TestHttpBase):
         )
         assert response.body == b"0123456789"
 
+    @deferred_f_from_coro_f
+    async def test_download_with_spoolsize(self):
+        body = bytes(range(10))
+        (self.tmpname / "file.bin").write_bytes(body)
+        request = Request(self.getURL("file.bin"), meta={"download_spoolsize": 5})
+        response = await self.download_request(request, Spider("foo"))
+        assert isinstance(response.body, bytes)
+        assert response.body == body
+
+        request = Request(self.getURL("file.bin"), meta={"download_spoolsize": 10})
+        response = await self.download_request(request, Spider("foo"))
+        assert response.body == body
+
+    @deferred_f_from_coro_f
+    async def test_download_with_spoolsize_text(self):
+        request = Request(self.getURL("file"), meta={"download_spoolsize": 5})
+        response = await self.download_request(request, Spider("foo"))
+        assert response.body == b"0123456789"
+
     @deferred_f_from_coro_f
     async def test_download_chunked_content(self):
         request = Request(self.getURL("chunked"))
@@ -460,6 +486,45 @@ class TestHttp11Base(TestHttpBase):
             "broken-chunked"
         )
 
+    @deferred_f_from_coro_f
+    async def test_download_compressed(self):
+        request = Request(self.getURL("gzip"), headers={"Accept-Encoding": "gzip"})
+        response = await self.download_request(request, Spider("foo"))
+        assert response.headers[b"Content-Encoding"] == b"gzip"
+        assert "decompressed" not in response.flags
+
+    @deferred_f_from_coro_f
+    async def test_download_compressed_streaming(self):
+        crawler = get_crawler(settings_dict={"COMPRESSION_STREAMING": True})
+        download_handler = build_from_crawler(self.download_handler_cls, crawler)
+        request = Request(self.getURL("gzip"), headers={"Accept-Encoding": "gzip"})
+        try:
+            response = await maybe_deferred_to_future(
+                download_handler.download_request(request, Spider("foo"))
+            )
+        finally:
+            await maybe_deferred_to_future(maybeDeferred(download_handler.close))
+        assert b"Content-Encoding" not in response.headers
+        assert response.flags == ["decompressed"]
+        assert response.body == b"0123456789" * 1000
+
+    @deferred_f_from_coro_f
+    async def test_download_compressed_streaming_maxsize(self):
+        crawler = get_crawler(settings_dict={"COMPRESSION_STREAMING": True})
+        download_handler = build_from_crawler(self.download_handler_cls, crawler)
+        request = Request(
+            self.getURL("gzip"),
+            headers={"Accept-Encoding": "gzip"},
+            meta={"download_maxsize": 5000},
+        )
+        try:
+            with pytest.raises((defer.CancelledError, error.ConnectionAborted)):
+                await maybe_deferred_to_future(
+                    download_handler.download_request(request, Spider("foo"))
+                )
+        finally:
+            await maybe_deferred_to_future(maybeDeferred(download_handler.close))
+
     @deferred_f_from_coro_f
     async def test_protocol(self):
         request = Request(self.getURL("host"), method="GET")
@@ -591,6 +656,8 @@ class TestHttpMockServerBase(unittest.TestCase, ABC):
         raise NotImplementedError
 
     is_secure = False
+    #: Whether the handler records the end of the name resolution.
+    dns_timing = True
 
     @classmethod
     def setUpClass(cls):
@@ -630,6 +697,64 @@ class TestHttpMockServerBase(unittest.TestCase, ABC):
         reason = crawler.spider.meta["close_reason"]
         assert reason == "finished"
 
+    @deferred_f_from_coro_f
+    async def test_download_with_bandwidth_limit(self):
+        settings = {**(self.settings_dict or {}), "DOWNLOAD_BANDWIDTH_LIMIT": 50_000}
+        crawler = get_crawler(SingleRequestSpider, settings)
+        body = b"x" * 100_000
+        await maybe_deferred_to_future(
+            crawler.crawl(
+                seed=Request(
+                    url=self.mockserver.url("/alpayload", is_secure=self.is_secure),
+                    method="POST",
+                    body=body,
+                )
+            )
+        )
+        assert crawler.spider.meta.get("failure") is None
+        assert crawler.spider.meta["responses"][0].body == body
+        assert crawler.stats.get_value("downloader/bandwidth/global/limit") == 50_000
+        assert crawler.stats.get_value("downloader/bandwidth/global/pause_count") > 0
+
+    @deferred_f_from_coro_f
+    async def test_download_timings(self):
+        settings = {**(self.settings_dict or {}), "DOWNLOAD_TIMINGS_ENABLED": True}
+        crawler = get_crawler(SingleRequestSpider, settings)
+        await maybe_deferred_to_future(
+            crawler.crawl(
+                seed=Request(url=self.mockserver.url("/", is_secure=self.is_secure))
+            )
+        )
+        assert crawler.spider.meta.get("failure") is None
+        response = crawler.spider.meta["responses"][0]
+        timings = response.meta["download_timings"]
+        keys = ["start", "dns", "connect", "tls", "headers", "end"]
+        if not self.is_secure:
+            keys.remove("tls")
+        if not self.dns_timing:
+            keys.remove("dns")
+        assert sorted(timings, key=timings.__getitem__) == keys
+        slot = response.meta["download_slot"]
+        stats = crawler.stats.get_stats()
+        for phase in ("connect", "ttfb", "transfer"):
+            assert f"downloader/timings/{slot}/{phase}/time_ms" in stats
+        assert (f"downloader/timings/{slot}/dns/time_ms" in stats) == self.dns_timing
+        assert (f"downloader/timings/{slot}/tls/time_ms" in stats) == self.is_secure
+
+    @deferred_f_from_coro_f
+    async def test_download_timings_disabled(self):
+        crawler = get_crawler(SingleRequestSpider, self.settings_dict)
+        await maybe_deferred_to_future(
+            crawler.crawl(
+                seed=Request(url=self.mockserver.url("/", is_secure=self.is_secure))
+            )
+        )
+        response = crawler.spider.meta["responses"][0]
+        assert "download_timings" not in response.meta
+        assert not any(
+            key.startswith("downloader/timings/") for key in crawler.stats.get_stats()
+        )
+
 
 class UriResource(resource.Resource):
     """Return the full uri that was requested"""
@@ -1,3 +1,4 @@
+import tracemalloc
 from gzip import GzipFile
 from io import BytesIO
 from logging import WARNING
@@ -15,6 +16,10 @@ from scrapy.exceptions import IgnoreRequest, NotConfigured
 from scrapy.http import HtmlResponse, Request, Response
 from scrapy.responsetypes import responsetypes
 from scrapy.spiders import Spider
+from scrapy.utils._compression import (
+    _DecompressionMaxSizeExceeded,
+    _StreamDecompressor,
+)
 from scrapy.utils.gz import gunzip
 from scrapy.utils.test import get_crawler
 from tests import tests_datadir
@@ -122,6 +127,16 @@ class TestHttpCompression:
         self.assertStatsEqual("httpcompression/response_count", 1)
         self.assertStatsEqual("httpcompression/response_bytes", 74837)
 
+    def test_process_response_decompressed(self):
+        response = Response(
+            "http://scrapytest.org/", body=b"0123456789", flags=["decompressed"]
+        )
+        request = Request("http://scrapytest.org")
+        newresponse = self.mw.process_response(request, response, self.spider)
+        assert newresponse is response
+        self.assertStatsEqual("httpcompression/response_count", 1)
+        self.assertStatsEqual("httpcompression/response_bytes", 10)
+
     def test_process_response_br(self):
         try:
             try:
@@ -753,3 +768,67 @@ class TestHttpCompression:
         except ImportError:
             pytest.skip("no zstd support (zstandard)")
         self._test_download_warnsize_request_meta("zstd")
+
+
+def _skip_unsupported(compression_id):
+    if compression_id.endswith("br") and b"br" not in ACCEPTED_ENCODINGS:
+        pytest.skip("no brotli")
+    if "zstd" in compression_id and b"zstd" not in ACCEPTED_ENCODINGS:
+        pytest.skip("no zstd support (zstandard)")
+
+
+@pytest.mark.parametrize(
+    "compression_id",
+    [compression_id for compression_id in FORMAT if "bomb" not in compression_id],
+)
+@pytest.mark.parametrize("chunk_size", [1, 1000, 1_000_000])
+def test_stream_decompressor(compression_id, chunk_size):
+    _skip_unsupported(compression_id)
+    samplefile, contentencoding = FORMAT[compression_id]
+    body = (SAMPLEDIR / samplefile).read_bytes()
+    expected, _ = HttpCompressionMiddleware()._handle_encoding(
+        body, [contentencoding.encode()], 0
+    )
+    decompressor = _StreamDecompressor.from_content_encoding([contentencoding.encode()])
+    assert decompressor is not None
+    decompressed = b"".join(
+        decompressor.decompress(body[i : i + chunk_size])
+        for i in range(0, len(body), chunk_size)
+    )
+    assert decompressed == expected
+
+
+@pytest.mark.parametrize("compression_id", ["br", "deflate", "gzip", "zstd"])
+def test_stream_decompressor_bomb(compression_id):
+    _skip_unsupported(compression_id)
+    body = (SAMPLEDIR / f"bomb-{compression_id}.bin").read_bytes()
+    decompressor = _StreamDecompressor.from_content_encoding(
+        [compression_id.encode()], max_size=10_000_000
+    )
+    with pytest.raises(_DecompressionMaxSizeExceeded):
+        decompressor.decompress(body)
+
+
+@pytest.mark.parametrize("compression_id", ["br", "deflate", "gzip", "zstd"])
+def test_stream_decompressor_bomb_memory(compression_id):
+    """A bomb received in a single chunk is not fully decompressed before
+    the maximum size is checked."""
+    _skip_unsupported(compression_id)
+    body = (SAMPLEDIR / f"bomb-{compression_id}.bin").read_bytes()
+    decompressor = _StreamDecompressor.from_content_encoding(
+        [compression_id.encode()], max_size=1_000_000
+    )
+    tracemalloc.start()
+    try:
+        with pytest.raises(_DecompressionMaxSizeExceeded):
+            decompressor.decompress(body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The bombs decompress to more than 10 MB.
+    assert peak < 5_000_000
+
+
+def test_stream_decompressor_unsupported():
+    assert _StreamDecompressor.from_content_encoding([]) is None
+    assert _StreamDecompressor.from_content_encoding([b"gzip, foo"]) is None
@@ -1,3 +1,4 @@
+from scrapy.core.downloader.timings import get_phase_durations
 from scrapy.downloadermiddlewares.stats import DownloaderStats
 from scrapy.http import Request, Response
 from scrapy.spiders import Spider
@@ -32,6 +33,36 @@ class TestDownloaderStats:
         self.mw.process_response(self.req, self.res, self.spider)
         self.assertStatsEqual("downloader/response_count", 1)
 
+    def test_process_response_timings(self):
+        self.req.meta["download_slot"] = "scrapytest.org"
+        self.req.meta["download_timings"] = {
+            "start": 100.0,
+            "dns": 100.005,
+            "connect": 100.025,
+            "headers": 100.525,
+            "end": 112.525,
+        }
+        self.mw.process_response(self.req, self.res, self.spider)
+        prefix = "downloader/timings/scrapytest.org"
+        self.assertStatsEqual(f"{prefix}/dns/<10ms", 1)
+        self.assertStatsEqual(f"{prefix}/connect/<50ms", 1)
+        self.assertStatsEqual(f"{prefix}/ttfb/<1s", 1)
+        self.assertStatsEqual(f"{prefix}/transfer/>=10s", 1)
+        ttfb_time = self.crawler.stats.get_value(f"{prefix}/ttfb/time_ms")
+        assert ttfb_time == 500
+        assert not any(
+            key.startswith(f"{prefix}/tls/") for key in self.crawler.stats.get_stats()
+        )
+
+    def test_process_request_drops_timings(self):
+        self.req.meta["download_timings"] = {"start": 100.0, "end": 101.0}
+        self.mw.process_request(self.req, self.spider)
+        self.mw.process_response(self.req, self.res, self.spider)
+        assert not any(
+            key.startswith("downloader/timings/")
+            for key in self.crawler.stats.get_stats()
+        )
+
     def test_process_exception(self):
         self.mw.process_exception(self.req, MyException(), self.spider)
         self.assertStatsEqual("downloader/exception_count", 1)
@@ -42,3 +73,14 @@ class TestDownloaderStats:
 
     def teardown_method(self):
         self.crawler.stats.close_spider(self.spider, "")
+
+
+def test_get_phase_durations():
+    assert not get_phase_durations({})
+    assert get_phase_durations(
+        {"start": 10.0, "connect": 10.5, "tls": 11.0, "headers": 13.0, "end": 13.25}
+    ) == {"connect": 0.5, "tls": 0.5, "ttfb": 2.0, "transfer": 0.25}
+    # Phases of a connection opened before the request started are left out
+    assert get_phase_durations(
+        {"start": 10.0, "dns": 9.5, "connect": 10.5, "headers": 11.0, "end": 11.5}
+    ) == {"connect": 0.5, "ttfb": 0.5, "transfer": 0.5}
@@ -1,6 +1,6 @@
 import time
 
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import DeferredList, inlineCallbacks, succeed
 from twisted.trial.unittest import TestCase
 
 from scrapy import Request
@@ -84,6 +84,8 @@ def test_params():
         "concurrency": 1,
         "delay": 2,
         "randomize_delay": False,
+        "rate": 4,
+        "burst": 2,
     }
     settings = {
         "DOWNLOAD_SLOTS": {
@@ -100,3 +102,108 @@ def test_params():
         assert getattr(expected, param) == getattr(actual, param), (
             f"Slot.{param}: {getattr(expected, param)!r} != {getattr(actual, param)!r}"
         )
+
+
+def test_rate_settings():
+    settings = {
+        "DOWNLOAD_RATE": 5,
+        "DOWNLOAD_BURST": 3,
+        "DOWNLOAD_SLOTS": {"example.com": {"rate": 1}},
+    }
+    crawler = get_crawler(settings_dict=settings)
+    downloader = Downloader(crawler)
+    downloader._slot_gc_loop.stop()  # Prevent an unclean reactor.
+    _, slot = downloader._get_slot(Request("https://example.org"), spider=None)
+    assert (slot.rate, slot.burst) == (5, 3)
+    _, slot = downloader._get_slot(Request("https://example.com"), spider=None)
+    assert (slot.rate, slot.burst) == (1, 3)
+    # Per-request overrides do not change the slot.
+    request = Request(
+        "https://example.com", meta={"download_rate": 0.5, "download_burst": 1}
+    )
+    _, slot = downloader._get_slot(request, spider=None)
+    assert (slot.rate, slot.burst) == (1, 3)
+
+
+def test_bandwidth_settings():
+    crawler = get_crawler()
+    downloader = Downloader(crawler)
+    downloader._slot_gc_loop.stop()  # Prevent an unclean reactor.
+    assert downloader.bandwidth is None
+
+    settings = {
+        "DOWNLOAD_SLOT_BANDWIDTH_LIMIT": 2000,
+        "DOWNLOAD_SLOTS": {"example.com": {"bandwidth_limit": 1000}},
+    }
+    crawler = get_crawler(settings_dict=settings)
+    downloader = Downloader(crawler)
+    downloader._slot_gc_loop.stop()
+    assert downloader.bandwidth is not None
+    assert downloader.bandwidth.limit == 0
+    assert downloader.bandwidth.slot_limit == 2000
+    assert downloader.bandwidth.slot_limits == {"example.com": 1000}
+
+
+class TestRateLimit(TestCase):
+    def _get_downloader(self, settings=None):
+        crawler = get_crawler(settings_dict=settings)
+        downloader = Downloader(crawler)
+        downloader._slot_gc_loop.stop()  # Prevent an unclean reactor.
+        self.times = {}
+
+        def download(slot, request, spider):
+            self.times.setdefault(request.meta["download_slot"], []).append(time.time())
+            return succeed(request)
+
+        downloader._download = download
+        return downloader
+
+    def assert_spacing(self, slot_times, spacing):
+        # Allow for the resolution of the reactor timer.
+        for previous, current in zip(slot_times, slot_times[1:]):
+            assert current - previous >= spacing - 0.005
+
+    @inlineCallbacks
+    def test_shared_timer(self):
+        downloader = self._get_downloader({"DOWNLOAD_RATE": 20})
+        dfds = [
+            downloader._enqueue_request(Request(f"https://{domain}/{i}"), None)
+            for domain in ("a.example", "b.example")
+            for i in range(3)
+        ]
+        slots = list(downloader.slots.values())
+        assert all(slot.waiting_tokens for slot in slots)
+        assert all(slot.latercall is None for slot in slots)
+        assert len(downloader._token_waits) == 2
+        assert downloader._token_call is not None
+        yield DeferredList(dfds, fireOnOneErrback=True)
+        for slot_times in self.times.values():
+            assert len(slot_times) == 3
+            self.assert_spacing(slot_times, 0.05)
+        assert downloader._token_call is None
+        downloader.close()
+
+    @inlineCallbacks
+    def test_request_rate(self):
+        downloader = self._get_downloader({"DOWNLOAD_RATE": 20})
+        dfds = [
+            downloader._enqueue_request(
+                Request(f"https://a.example/{i}", meta={"download_rate": 10}), None
+            )
+            for i in range(3)
+        ]
+        yield DeferredList(dfds, fireOnOneErrback=True)
+        self.assert_spacing(self.times["a.example"], 0.1)
+        slot = downloader.slots["a.example"]
+        assert (slot.rate, slot.burst) == (20, 1)
+
+        start = len(self.times["a.example"])
+        dfds = [
+            downloader._enqueue_request(Request(f"https://a.example/x{i}"), None)
+            for i in range(3)
+        ]
+        yield DeferredList(dfds, fireOnOneErrback=True)
+        slot_times = self.times["a.example"][start:]
+        assert slot_times[-1] - slot_times[0] < 0.2
+        self.assert_spacing(slot_times, 0.05)
+        downloader.close()
@@ -1,14 +1,25 @@
 import hashlib
+import math
 import shutil
 import sys
 import tempfile
 from pathlib import Path
 from warnings import catch_warnings
 
+import pytest
 from testfixtures import LogCapture
+from twisted.internet.defer import inlineCallbacks
+from twisted.trial import unittest
 
 from scrapy.core.scheduler import Scheduler
-from scrapy.dupefilters import BaseDupeFilter, RFPDupeFilter
+from scrapy.dupefilters import (
+    BaseDupeFilter,
+    BloomDupeFilter,
+    ExpiringDupeFilter,
+    LSMDupeFilter,
+    MmapDupeFilter,
+    RFPDupeFilter,
+)
 from scrapy.exceptions import ScrapyDeprecationWarning
 from scrapy.http import Request
 from scrapy.utils.python import to_bytes
@@ -255,6 +266,271 @@ class TestRFPDupeFilter:
             dupefilter.close("finished")
 
 
+class TestMmapDupeFilter:
+    settings = {"DUPEFILTER_CLASS": MmapDupeFilter}
+
+    def test_filter(self):
+        dupefilter = _get_dupefilter(settings=self.settings)
+        assert isinstance(dupefilter, MmapDupeFilter)
+        r1 = Request("http://scrapytest.org/1")
+        r2 = Request("http://scrapytest.org/2")
+
+        assert not dupefilter.request_seen(r1)
+        assert dupefilter.request_seen(r1)
+        assert not dupefilter.request_seen(r2)
+        assert dupefilter.request_seen(Request("http://scrapytest.org/2"))
+
+        dupefilter.close("finished")
+
+    def test_dupefilter_path(self, tmp_path):
+        settings = {**self.settings, "JOBDIR": str(tmp_path)}
+        requests = [Request(f"http://scrapytest.org/{i}") for i in range(50000)]
+        df = _get_dupefilter(settings=settings)
+        assert not any(df.request_seen(r) for r in requests)
+        assert len(df.table) == len(requests)
+        df.close("finished")
+        assert not Path(tmp_path, "requests.seen").exists()
+        assert Path(tmp_path, "requests.seen.bin").exists()
+
+        df2 = _get_dupefilter(settings=settings)
+        assert not isinstance(df2.table, set)
+        assert len(df2.table) == len(requests)
+        assert all(df2.request_seen(r) for r in requests)
+        assert not df2.request_seen(Request("http://scrapytest.org/new"))
+        df2.close("finished")
+
+    def test_import_text_file(self, tmp_path):
+        r1 = Request("http://scrapytest.org/1")
+        r2 = Request("http://scrapytest.org/2")
+        df = _get_dupefilter(settings={"JOBDIR": str(tmp_path)})
+        assert isinstance(df, RFPDupeFilter)
+        assert not df.request_seen(r1)
+        df.close("finished")
+        text = Path(tmp_path, "requests.seen").read_text(encoding="utf-8")
+
+        df = _get_dupefilter(settings={**self.settings, "JOBDIR": str(tmp_path)})
+        assert df.request_seen(r1)
+        assert not df.request_seen(r2)
+        df.close("finished")
+        assert Path(tmp_path, "requests.seen").read_text(encoding="utf-8") == text
+
+
+class TestBloomDupeFilter:
+    settings = {"DUPEFILTER_CLASS": BloomDupeFilter}
+
+    def test_filter(self):
+        dupefilter = _get_dupefilter(settings=self.settings)
+        assert isinstance(dupefilter, BloomDupeFilter)
+        r1 = Request("http://scrapytest.org/1")
+        r2 = Request("http://scrapytest.org/2")
+
+        assert not dupefilter.request_seen(r1)
+        assert dupefilter.request_seen(r1)
+        assert not dupefilter.request_seen(r2)
+        assert dupefilter.request_seen(Request("http://scrapytest.org/2"))
+
+        dupefilter.close("finished")
+
+    def test_scaling(self):
+        settings = {
+            **self.settings,
+            "DUPEFILTER_BLOOM_CAPACITY": 100,
+            "DUPEFILTER_BLOOM_ERROR_RATE": 0.01,
+        }
+        crawler = get_crawler(settings_dict=settings)
+        dupefilter = _get_dupefilter(crawler=crawler)
+        requests = [Request(f"http://scrapytest.org/{i}") for i in range(1000)]
+        false_positives = sum(dupefilter.request_seen(r) for r in requests)
+        assert false_positives < 20
+        assert all(dupefilter.request_seen(r) for r in requests)
+        assert len(dupefilter.filters) == 4
+        assert dupefilter.estimated_error_rate < 0.01
+        dupefilter.close("finished")
+
+        stats = crawler.stats
+        assert stats.get_value("dupefilter/bloom/filters") == 4
+        assert stats.get_value("dupefilter/bloom/count") == 1000 - false_positives
+        assert 0 < stats.get_value("dupefilter/bloom/fill_ratio") < 1
+        assert stats.get_value(
+            "dupefilter/bloom/estimated_error_rate"
+        ) == pytest.approx(dupefilter.estimated_error_rate)
+
+    def test_dupefilter_path(self, tmp_path):
+        settings = {
+            **self.settings,
+            "JOBDIR": str(tmp_path),
+            "DUPEFILTER_BLOOM_CAPACITY": 10,
+        }
+        requests = [Request(f"http://scrapytest.org/{i}") for i in range(50)]
+        df = _get_dupefilter(settings=settings)
+        for r in requests[:25]:
+            df.request_seen(r)
+        count = sum(bloom.count for bloom in df.filters)
+        df.close("finished")
+        assert len(list(Path(tmp_path, "requests.bloom").iterdir())) == 2
+
+        df2 = _get_dupefilter(settings=settings)
+        assert sum(bloom.count for bloom in df2.filters) == count
+        assert all(df2.request_seen(r) for r in requests[:25])
+        assert not df2.request_seen(requests[-1])
+        assert df2.request_seen(requests[-1])
+        df2.close("finished")
+
+    @pytest.mark.parametrize(
+        ("capacity", "error_rate"), [(0, 0.01), (10, 0.0), (10, 1.0)]
+    )
+    def test_invalid_settings(self, capacity, error_rate):
+        with pytest.raises(ValueError, match="Bloom filter"):
+            BloomDupeFilter(capacity=capacity, error_rate=error_rate)
+
+
+class TestLSMDupeFilter(unittest.TestCase):
+    settings = {
+        "DUPEFILTER_CLASS": LSMDupeFilter,
+        "DUPEFILTER_LSM_MEMTABLE_SIZE": 10,
+        "DUPEFILTER_LSM_FANOUT": 2,
+    }
+
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.tmp_path = tmp_path
+
+    @inlineCallbacks
+    def test_filter(self):
+        crawler = get_crawler(settings_dict=self.settings)
+        dupefilter = _get_dupefilter(crawler=crawler)
+        assert isinstance(dupefilter, LSMDupeFilter)
+        tmpdir = dupefilter.path
+        requests = [Request(f"http://scrapytest.org/{i}") for i in range(100)]
+        assert not any(dupefilter.request_seen(r) for r in requests)
+        # Runs are written and merged in threads; until then, fingerprints are
+        # looked up in the tables being written.
+        assert all(dupefilter.request_seen(r) for r in requests)
+        yield dupefilter._tasks
+        assert not dupefilter.flushing
+        assert all(dupefilter.request_seen(r) for r in requests)
+        assert sorted(run.level for run in dupefilter.runs) == [1, 3]
+        assert sum(len(run) for run in dupefilter.runs) == len(requests)
+        assert not dupefilter.request_seen(Request("http://scrapytest.org/new"))
+
+        yield dupefilter.close("finished")
+        assert not tmpdir.exists()
+        assert crawler.stats.get_value("dupefilter/lsm/flushes") == 11
+        assert crawler.stats.get_value("dupefilter/lsm/merges") == 8
+        assert crawler.stats.get_value("dupefilter/lsm/runs") == 3
+
+    @inlineCallbacks
+    def test_dupefilter_path(self):
+        tmp_path = self.tmp_path
+        settings = {**self.settings, "JOBDIR": str(tmp_path)}
+        requests = [Request(f"http://scrapytest.org/{i}") for i in range(25)]
+        df = _get_dupefilter(settings=settings)
+        assert not any(df.request_seen(r) for r in requests)
+        yield df.close("finished")
+        runs = sorted(p.name for p in Path(tmp_path, "requests.lsm").iterdir())
+        assert runs == [
+            "0-00000004.bloom",
+            "0-00000004.run",
+            "1-00000003.bloom",
+            "1-00000003.run",
+        ]
+
+        df2 = _get_dupefilter(settings=settings)
+        assert all(df2.request_seen(r) for r in requests)
+        assert not df2.request_seen(Request("http://scrapytest.org/new"))
+        yield df2.close("finished")
+        runs = sorted(p.name for p in Path(tmp_path, "requests.lsm").iterdir())
+        assert runs == ["2-00000007.bloom", "2-00000007.run"]
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError, match="memtable size"):
+            LSMDupeFilter(memtable_size=0)
+        with pytest.raises(ValueError, match="fanout"):
+            LSMDupeFilter(fanout=1)
+
+
+class TestExpiringDupeFilter:
+    settings = {"DUPEFILTER_CLASS": ExpiringDupeFilter, "DUPEFILTER_TTL": 60}
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = [1_000_000.0]
+        monkeypatch.setattr("scrapy.dupefilters.time", lambda: clock[0])
+        return clock
+
+    def test_filter(self, clock):
+        crawler = get_crawler(settings_dict=self.settings)
+        dupefilter = _get_dupefilter(crawler=crawler)
+        assert isinstance(dupefilter, ExpiringDupeFilter)
+        r1 = Request("http://scrapytest.org/1")
+        r2 = Request("http://scrapytest.org/2", meta={"dupefilter_ttl": 10})
+        r3 = Request("http://scrapytest.org/3", meta={"dupefilter_ttl": 0})
+
+        assert not dupefilter.request_seen(r1)
+        assert not dupefilter.request_seen(r2)
+        assert not dupefilter.request_seen(r3)
+        clock[0] += 30
+        assert dupefilter.request_seen(r1)
+        assert not dupefilter.request_seen(r2)
+        assert dupefilter.request_seen(r2)
+        assert dupefilter.request_seen(r3)
+        clock[0] += 31
+        assert not dupefilter.request_seen(r1)
+        assert dupefilter.request_seen(r1)
+        assert dupefilter.request_seen(r3)
+        assert crawler.stats.get_value("dupefilter/expired") == 3
+        dupefilter.close("finished")
+
+    def test_eviction(self, clock):
+        dupefilter = _get_dupefilter(settings=self.settings)
+        for i in range(250):
+            dupefilter.request_seen(Request(f"http://scrapytest.org/{i}"))
+        assert len(dupefilter.expiration) == 250
+        clock[0] += 61
+        r = Request("http://scrapytest.org/new")
+        dupefilter.request_seen(r)
+        assert len(dupefilter.expiration) == 151
+        dupefilter.request_seen(r)
+        dupefilter.request_seen(r)
+        assert len(dupefilter.expiration) == 1
+        dupefilter.close("finished")
+
+    def test_dupefilter_path(self, clock, tmp_path):
+        settings = {**self.settings, "JOBDIR": str(tmp_path)}
+        r1 = Request("http://scrapytest.org/1")
+        r2 = Request("http://scrapytest.org/2", meta={"dupefilter_ttl": 120})
+        df = _get_dupefilter(settings=settings)
+        assert not df.request_seen(r1)
+        assert not df.request_seen(r2)
+        df.close("finished")
+
+        clock[0] += 90
+        df2 = _get_dupefilter(settings=settings)
+        assert len(df2.expiration) == 1
+        assert not df2.request_seen(r1)
+        assert df2.request_seen(r2)
+        df2.close("finished")
+
+    def test_large_ttl(self, clock, tmp_path):
+        settings = {**self.settings, "JOBDIR": str(tmp_path)}
+        r1 = Request("http://scrapytest.org/1", meta={"dupefilter_ttl": 2**32})
+        r2 = Request("http://scrapytest.org/2", meta={"dupefilter_ttl": math.inf})
+        r3 = Request("http://scrapytest.org/3", meta={"dupefilter_ttl": -60})
+        df = _get_dupefilter(settings=settings)
+        assert not df.request_seen(r1)
+        assert not df.request_seen(r2)
+        assert not df.request_seen(r3)
+        assert not df.request_seen(r3)
+        df.close("finished")
+
+        clock[0] += 2**31
+        df2 = _get_dupefilter(settings=settings)
+        assert df2.request_seen(r1)
+        assert df2.request_seen(r2)
+        assert not df2.request_seen(r3)
+        df2.close("finished")
+
+
 class TestBaseDupeFilter:
     def test_log_deprecation(self):
         dupefilter = _get_dupefilter(
@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+import pytest
+from twisted.internet.defer import Deferred
+
+from scrapy import Request
+from scrapy.exceptions import NotConfigured
+from scrapy.extensions.dnsprefetch import DNSPrefetch
+from scrapy.resolver import dnscache
+from scrapy.utils.misc import build_from_crawler
+from scrapy.utils.test import get_crawler
+
+
+@pytest.fixture
+def lookups():
+    lookups = {}
+
+    def resolve(hostname):
+        d = Deferred()
+        lookups[hostname] = d
+        return d
+
+    with patch("twisted.internet.reactor.resolve", resolve, create=True):
+        yield lookups
+    for hostname in lookups:
+        dnscache.pop(hostname, None)
+
+
+def get_extension(settings=None):
+    settings = {"DNS_PREFETCH_ENABLED": True, **(settings or {})}
+    crawler = get_crawler(settings_dict=settings)
+    return build_from_crawler(DNSPrefetch, crawler)
+
+
+def resolved(lookups, hostname, ip="127.0.0.1"):
+    dnscache[hostname] = ip
+    lookups[hostname].callback(ip)
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"DNS_PREFETCH_ENABLED": False},
+        {"DNSCACHE_ENABLED": False},
+        {"DNS_PREFETCH_CONCURRENCY": 0},
+        {"DNS_PREFETCH_QUEUE_SIZE": 0},
+    ],
+)
+def test_not_configured(settings):
+    with pytest.raises(NotConfigured):
+        get_extension(settings)
+
+
+def test_prefetch(lookups):
+    ext = get_extension()
+    ext._request_scheduled(Request("https://a.example/1"), None)
+    ext._request_scheduled(Request("https://a.example/2"), None)
+    assert list(lookups) == ["a.example"]
+    resolved(lookups, "a.example")
+    ext._request_scheduled(Request("https://a.example/3"), None)
+    assert list(lookups) == ["a.example"]
+    ext._request_reached_downloader(Request("https://a.example/1"), None)
+    ext._request_reached_downloader(Request("https://a.example/2"), None)
+    assert ext.stats.get_value("dnsprefetch/requests") == 1
+    assert ext.stats.get_value("dnsprefetch/resolved") == 1
+    assert ext.stats.get_value("dnsprefetch/hits") == 1
+
+
+def test_skipped(lookups):
+    ext = get_extension()
+    dnscache["cached.example"] = "127.0.0.1"
+    try:
+        for url in (
+            "https://cached.example",
+            "https://127.0.0.1",
+            "https://[::1]",
+            "data:,foo",
+            "file:///etc/hosts",
+        ):
+            ext._request_scheduled(Request(url), None)
+    finally:
+        del dnscache["cached.example"]
+    assert not lookups
+
+
+def test_concurrency(lookups):
+    ext = get_extension({"DNS_PREFETCH_CONCURRENCY": 2})
+    for domain in ("a", "b", "c", "d"):
+        ext._request_scheduled(Request(f"https://{domain}.example"), None)
+    assert list(lookups) == ["a.example", "b.example"]
+    resolved(lookups, "b.example")
+    assert list(lookups) == ["a.example", "b.example", "c.example"]
+    lookups["a.example"].errback(OSError())
+    assert list(lookups) == ["a.example", "b.example", "c.example", "d.example"]
+    assert ext.stats.get_value("dnsprefetch/failed") == 1
+    assert ext.stats.get_value("dnsprefetch/resolved") == 1
+    # Failed lookups can be retried.
+    ext._request_scheduled(Request("https://a.example/2"), None)
+    assert ext.stats.get_value("dnsprefetch/requests") == 4
+    resolved(lookups, "c.example")
+    assert ext.stats.get_value("dnsprefetch/requests") == 5
+
+
+def test_cached_while_queued(lookups):
+    ext = get_extension({"DNS_PREFETCH_CONCURRENCY": 1})
+    ext._request_scheduled(Request("https://a.example"), None)
+    ext._request_scheduled(Request("https://b.example"), None)
+    ext._request_scheduled(Request("https://c.example"), None)
+    dnscache["b.example"] = "127.0.0.1"
+    try:
+        resolved(lookups, "a.example")
+    finally:
+        del dnscache["b.example"]
+    assert list(lookups) == ["a.example", "c.example"]
+
+
+def test_queue_size(lookups):
+    ext = get_extension({"DNS_PREFETCH_CONCURRENCY": 1, "DNS_PREFETCH_QUEUE_SIZE": 2})
+    for domain in ("a", "b", "c"):
+        ext._request_scheduled(Request(f"https://{domain}.example"), None)
+    assert ext.stats.get_value("dnsprefetch/skipped") == 1
+    resolved(lookups, "a.example")
+    resolved(lookups, "b.example")
+    assert list(lookups) == ["a.example", "b.example"]
+    # Prefetched hostnames count until a request for them is downloaded.
+    ext._request_scheduled(Request("https://c.example"), None)
+    assert ext.stats.get_value("dnsprefetch/skipped") == 2
+    ext._request_reached_downloader(Request("https://a.example"), None)
+    ext._request_scheduled(Request("https://c.example"), None)
+    assert list(lookups) == ["a.example", "b.example", "c.example"]
+    resolved(lookups, "c.example")
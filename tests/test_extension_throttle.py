@@ -4,8 +4,9 @@ from unittest.mock import Mock
 import pytest
 
 from scrapy import Request, Spider
+from scrapy.core.downloader import Slot
 from scrapy.exceptions import NotConfigured
-from scrapy.extensions.throttle import AutoThrottle
+from scrapy.extensions.throttle import AdaptiveConcurrency, AutoThrottle
 from scrapy.http.response import Response
 from scrapy.settings.default_settings import (
     AUTOTHROTTLE_MAX_DELAY,
@@ -343,3 +344,126 @@ def test_debug_disabled(caplog):
         at._response_downloaded(response, request, spider)
 
     assert caplog.record_tuples == []
+
+
+def get_adaptive_crawler(settings=None):
+    settings = {"ADAPTIVE_CONCURRENCY_ENABLED": True, **(settings or {})}
+    crawler = _get_crawler(settings_dict=settings)
+    crawler.engine = Mock()
+    crawler.engine.downloader = Mock()
+    crawler.engine.downloader.slots = {"foo": Slot(8, 0, False)}
+    return crawler
+
+
+def _respond(ac, latency=1.0, status=200, queued=False):
+    request = Request(
+        "https://example.com",
+        meta={"download_latency": latency, "download_slot": "foo"},
+    )
+    slot = ac.crawler.engine.downloader.slots["foo"]
+    slot.queue.clear()
+    if queued:
+        slot.queue.append((request, None))
+    ac._response_downloaded(Response(request.url, status=status), request, None)
+    ac._request_left_downloader(request, None)
+    return slot
+
+
+@pytest.mark.parametrize(
+    ("settings", "enabled"),
+    [
+        ({}, False),
+        ({"ADAPTIVE_CONCURRENCY_ENABLED": True}, True),
+        (
+            {
+                "ADAPTIVE_CONCURRENCY_ENABLED": True,
+                "ADAPTIVE_CONCURRENCY_MIN": 0,
+            },
+            False,
+        ),
+        (
+            {
+                "ADAPTIVE_CONCURRENCY_ENABLED": True,
+                "ADAPTIVE_CONCURRENCY_MIN": 4,
+                "ADAPTIVE_CONCURRENCY_MAX": 2,
+            },
+            False,
+        ),
+    ],
+)
+def test_adaptive_enabled(settings, enabled):
+    crawler = _get_crawler(settings_dict=settings)
+    if enabled:
+        build_from_crawler(AdaptiveConcurrency, crawler)
+    else:
+        with pytest.raises(NotConfigured):
+            build_from_crawler(AdaptiveConcurrency, crawler)
+
+
+def test_adaptive_increase():
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler())
+    for _ in range(AdaptiveConcurrency.window - 1):
+        slot = _respond(ac, queued=True)
+    assert slot.concurrency == 8
+    slot = _respond(ac, queued=True)
+    assert slot.concurrency == 9
+    # No increase without requests waiting for the slot.
+    for _ in range(AdaptiveConcurrency.window):
+        slot = _respond(ac)
+    assert slot.concurrency == 9
+
+
+def test_adaptive_increase_max():
+    settings = {"ADAPTIVE_CONCURRENCY_MAX": 10}
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler(settings))
+    for _ in range(AdaptiveConcurrency.window * 5):
+        slot = _respond(ac, queued=True)
+    assert slot.concurrency == 10
+
+
+def test_adaptive_latency_decrease():
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler())
+    for _ in range(AdaptiveConcurrency.window):
+        slot = _respond(ac, latency=1.0)
+    assert slot.concurrency == 8
+    for _ in range(AdaptiveConcurrency.window):
+        slot = _respond(ac, latency=2.5, queued=True)
+    assert slot.concurrency == 4
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_adaptive_backoff_status(status):
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler())
+    slot = _respond(ac, status=status)
+    assert slot.concurrency == 4
+    # Responses to requests sent before the decrease do not decrease it again.
+    for _ in range(3):
+        slot = _respond(ac, status=status)
+    assert slot.concurrency == 4
+    slot = _respond(ac, status=status)
+    assert slot.concurrency == 2
+    for _ in range(10):
+        slot = _respond(ac, status=status)
+    assert slot.concurrency == 1
+
+
+def test_adaptive_download_error():
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler())
+    request = Request("https://example.com", meta={"download_slot": "foo"})
+    ac._request_left_downloader(request, None)
+    assert ac.crawler.engine.downloader.slots["foo"].concurrency == 4
+
+
+def test_adaptive_debug(caplog):
+    settings = {"ADAPTIVE_CONCURRENCY_DEBUG": True}
+    ac = build_from_crawler(AdaptiveConcurrency, get_adaptive_crawler(settings))
+    caplog.clear()
+    with caplog.at_level(INFO):
+        _respond(ac, status=503)
+    assert caplog.record_tuples == [
+        (
+            "scrapy.extensions.throttle",
+            INFO,
+            "slot: foo | concurrency: 8 -> 4 (HTTP 503)",
+        ),
+    ]
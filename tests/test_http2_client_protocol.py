@@ -20,7 +20,7 @@ from twisted.internet.defer import (
     inlineCallbacks,
 )
 from twisted.internet.endpoints import SSL4ClientEndpoint, SSL4ServerEndpoint
-from twisted.internet.error import TimeoutError
+from twisted.internet.error import ConnectionLost, TimeoutError
 from twisted.internet.ssl import Certificate, PrivateCertificate, optionsForClientTLS
 from twisted.trial.unittest import TestCase
 from twisted.web.client import URI, ResponseFailed
@@ -428,6 +428,35 @@ class TestHttps2ClientProtocol(TestCase):
         assert response.status == 499
         assert response.request == request
 
+    @inlineCallbacks
+    def test_cancel_request_delayed_acknowledgement(self):
+        from scrapy.core.downloader.bandwidth import BandwidthLimiter
+        from scrapy.core.http2 import stream as stream_module
+
+        request = Request(url=self.get_url("/get-data-html-large"))
+        delayed_acks = []
+
+        def call_later(delay, func, *args):
+            result = original_call_later(delay, func, *args)
+            if not delayed_acks:
+                original_call_later(0, d.cancel)
+            delayed_acks.append(result)
+            return result
+
+        original_call_later = stream_module.call_later
+        with mock.patch.object(stream_module, "call_later", call_later):
+            d = self.client.request(
+                request, DummySpider(), bandwidth=BandwidthLimiter(10_000)
+            )
+            (stream,) = self.client.streams.values()
+            response = yield d
+        assert response.status == 499
+        assert delayed_acks
+        assert stream._delayed_ack is None
+        for result in delayed_acks:
+            assert result._timer_handle is None
+            assert result._delayed_call is None
+
     @deferred_f_from_coro_f
     async def test_download_maxsize_exceeded(self):
         request = Request(
@@ -657,3 +686,137 @@ class TestHttps2ClientProtocol(TestCase):
             k, v = str(k, "utf-8"), str(v[0], "utf-8")
             assert k in response_headers
             assert v == response_headers[k]
+
+    @deferred_f_from_coro_f
+    async def test_stream_stats(self):
+        await self._check_GET(
+            Request(self.get_url("/get-data-html-small")), Data.HTML_SMALL, 200
+        )
+        stats = self.client.stream_stats
+        assert stats["active"] == 0
+        assert stats["pending"] == 0
+        assert stats["total"] == 1
+        assert stats["max_concurrent"] == self.client.allowed_max_concurrent_streams
+
+    @inlineCallbacks
+    def test_window_size(self):
+        from twisted.internet import reactor
+
+        from scrapy.core.http2.protocol import H2ClientFactory
+
+        client_options = optionsForClientTLS(
+            hostname=self.hostname,
+            trustRoot=self.client_certificate,
+            acceptableProtocols=[b"h2"],
+        )
+        uri = URI.fromBytes(bytes(self.get_url("/"), "utf-8"))
+        factory = H2ClientFactory(uri, Settings({"H2_WINDOW_SIZE": 2**20}), Deferred())
+        client_endpoint = SSL4ClientEndpoint(
+            reactor, self.hostname, self.port_number, client_options
+        )
+        client = yield client_endpoint.connect(factory)
+        try:
+            assert client.conn.inbound_flow_control_window == 2**20
+            response = yield client.request(
+                Request(self.get_url("/get-data-html-large")), DummySpider()
+            )
+            assert response.body == Data.HTML_LARGE
+            assert client.conn.local_settings.initial_window_size == 2**20
+        finally:
+            client.transport.abortConnection()
+
+
+class TestH2ConnectionPool:
+    key = (b"https", b"example.com", 443)
+
+    def setup_method(self):
+        from twisted.internet import reactor
+
+        from scrapy.core.http2.agent import H2ConnectionPool
+
+        self.pool = H2ConnectionPool(reactor, Settings({"H2_MAX_CONNECTIONS": 2}))
+        self.uri = URI.fromBytes(b"https://example.com/")
+        self.connecting: list[tuple[Deferred, Any]] = []
+        self.endpoint = mock.Mock()
+        self.endpoint.connect.side_effect = self._connect
+
+    def _connect(self, factory):
+        d = Deferred()
+        self.connecting.append((d, factory))
+        return d
+
+    @staticmethod
+    def _connection(open_streams, max_concurrent_streams=2):
+        return mock.Mock(
+            open_streams=open_streams,
+            allowed_max_concurrent_streams=max_concurrent_streams,
+        )
+
+    def _get_connection(self):
+        results = []
+        d = self.pool.get_connection(self.key, self.uri, self.endpoint)
+        d.addBoth(results.append)
+        return results
+
+    def test_reuse_connection(self):
+        first, second = self._get_connection(), self._get_connection()
+        assert len(self.connecting) == 1
+        conn = self._connection(0)
+        self.connecting[0][0].callback(conn)
+        assert first == second == [conn]
+        assert self._get_connection() == [conn]
+        assert len(self.connecting) == 1
+
+    def test_least_busy_connection(self):
+        busy, idle = self._connection(1), self._connection(0)
+        self.pool.put_connection(busy, self.key)
+        self.pool.put_connection(idle, self.key)
+        assert self._get_connection() == [idle]
+        assert not self.connecting
+
+    def test_new_connection_when_saturated(self):
+        conn1 = self._connection(2)
+        self.pool.put_connection(conn1, self.key)
+        result = self._get_connection()
+        assert len(self.connecting) == 1
+        conn2 = self._connection(0)
+        self.connecting[0][0].callback(conn2)
+        assert result == [conn2]
+
+        # H2_MAX_CONNECTIONS is reached, the least busy connection queues
+        # the request
+        conn2.open_streams = 3
+        assert self._get_connection() == [conn1]
+        assert len(self.connecting) == 1
+
+    def test_connection_failed(self):
+        result = self._get_connection()
+        self.connecting[0][0].errback(ConnectionRefusedError())
+        assert len(result) == 1
+        assert result[0].check(ResponseFailed)
+        assert result[0].value.reasons[0].check(ConnectionRefusedError)
+        self._get_connection()
+        assert len(self.connecting) == 2
+
+    def test_connection_lost(self):
+        self._get_connection()
+        d, factory = self.connecting[0]
+        conn = self._connection(0)
+        d.callback(conn)
+        assert self.pool.get_stats() == {self.key: [conn.stream_stats]}
+        factory.conn_lost_deferred.callback([])
+        assert self.pool.get_stats() == {}
+        self._get_connection()
+        assert len(self.connecting) == 2
+
+    def test_connection_lost_while_connecting(self):
+        result = self._get_connection()
+        d, factory = self.connecting[0]
+        factory.conn_lost_deferred.callback([ConnectionLost()])
+        assert len(result) == 1
+        assert result[0].check(ResponseFailed)
+        # A late connection attempt result does not affect the pool.
+        d.callback(self._connection(0))
+        assert self.pool.get_stats() == {}
+        self._get_connection()
+        assert len(self.connecting) == 2
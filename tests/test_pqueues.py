@@ -1,10 +1,16 @@
 import tempfile
+from unittest import mock
 
 import pytest
 import queuelib
 
+from scrapy import signals
 from scrapy.http.request import Request
-from scrapy.pqueues import DownloaderAwarePriorityQueue, ScrapyPriorityQueue
+from scrapy.pqueues import (
+    DelayAwarePriorityQueue,
+    DownloaderAwarePriorityQueue,
+    ScrapyPriorityQueue,
+)
 from scrapy.spiders import Spider
 from scrapy.squeues import FifoMemoryQueue
 from scrapy.utils.misc import build_from_crawler, load_object
@@ -94,11 +100,32 @@ class TestPriorityQueue:
         assert dequeued.priority == req3.priority
         assert queue.close() == [-1, -2]
 
+    def test_queue_push_pop_many_priorities(self):
+        temp_dir = tempfile.mkdtemp()
+        queue = ScrapyPriorityQueue.from_crawler(
+            self.crawler, FifoMemoryQueue, temp_dir
+        )
+        priorities = [(i * 7919) % 1000 for i in range(1000)]
+        for priority in priorities:
+            queue.push(Request(f"https://example.org/{priority}", priority=priority))
+        # Pushing to a higher priority in between pops must take effect.
+        popped = [queue.pop().priority for _ in range(500)]
+        queue.push(Request("https://example.org/top", priority=2000))
+        queue.push(Request("https://example.org/low", priority=-1))
+        popped.append(queue.pop().priority)
+        while (request := queue.pop()) is not None:
+            popped.append(request.priority)
+        assert popped == [*range(999, 499, -1), 2000, *range(499, -2, -1)]
+        assert len(queue) == 0
+        assert queue.curprio is None
+        assert not queue.close()
+
 
 class TestDownloaderAwarePriorityQueue:
     def setup_method(self):
         crawler = get_crawler(Spider)
         crawler.engine = MockEngine(downloader=MockDownloader())
+        self.crawler = crawler
         self.queue = DownloaderAwarePriorityQueue.from_crawler(
             crawler=crawler,
             downstream_queue_cls=FifoMemoryQueue,
@@ -157,6 +184,103 @@ class TestDownloaderAwarePriorityQueue:
         assert self.queue.pop().url == req3.url
         assert self.queue.peek() is None
 
+    def test_active_downloads(self):
+        requests = {
+            slot: [Request(f"https://{slot}.example/{i}") for i in range(3)]
+            for slot in ("a", "b", "c")
+        }
+        for slot_requests in requests.values():
+            for request in slot_requests:
+                self.queue.push(request)
+
+        def reached(request):
+            self.crawler.signals.send_catch_log(
+                signals.request_reached_downloader, request=request, spider=None
+            )
+
+        def left(request):
+            self.crawler.signals.send_catch_log(
+                signals.request_left_downloader, request=request, spider=None
+            )
+
+        # Ties are broken by slot name.
+        first = self.queue.pop()
+        assert first.url == "https://a.example/0"
+        reached(first)
+        reached(Request("https://b.example/x"))
+        reached(Request("https://b.example/y"))
+        # a: 1 active, b: 2 active, c: 0 active
+        assert self.queue.pop().url == "https://c.example/0"
+        reached(requests["c"][0])
+        # a: 1, b: 2, c: 1
+        assert self.queue.pop().url == "https://a.example/1"
+        reached(requests["a"][1])
+        left(requests["a"][1])
+        left(first)
+        # a: 0, b: 2, c: 1
+        assert self.queue.pop().url == "https://a.example/2"
+        # a is no longer pending
+        assert self.queue.pop().url == "https://c.example/1"
+        assert len(self.queue) == 4
+
+
+class TestDelayAwarePriorityQueue:
+    def setup_method(self):
+        crawler = get_crawler(
+            Spider,
+            {"DOWNLOAD_DELAY": 1.0, "DOWNLOAD_SLOTS": {"c.example": {"delay": 0}}},
+        )
+        crawler.engine = MockEngine(downloader=MockDownloader())
+        self.queue = DelayAwarePriorityQueue.from_crawler(
+            crawler=crawler,
+            downstream_queue_cls=FifoMemoryQueue,
+            key="foo/bar",
+        )
+
+    def teardown_method(self):
+        self.queue.close()
+
+    def test_delay(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("scrapy.pqueues.time", lambda: now)
+        for slot in ("a", "b", "c"):
+            for i in range(2):
+                self.queue.push(Request(f"https://{slot}.example/{i}"))
+        assert len(self.queue) == 6
+        urls = [self.queue.pop().url for _ in range(4)]
+        assert urls == [
+            "https://c.example/0",
+            "https://a.example/0",
+            "https://b.example/0",
+            "https://c.example/1",
+        ]
+        # a.example and b.example must wait for their download delay.
+        assert self.queue.pop() is None
+        assert self.queue._wakeup is not None
+        assert self.queue._wakeup_time == 1001.0
+        assert len(self.queue) == 2
+        now = 1001.0
+        assert self.queue.pop().url == "https://a.example/1"
+        assert self.queue.pop().url == "https://b.example/1"
+        assert self.queue.pop() is None
+        assert len(self.queue) == 0
+
+    def test_pop_empty(self):
+        assert self.queue.pop() is None
+        assert self.queue._wakeup is None
+
+    def test_wake_up_engine(self, monkeypatch):
+        monkeypatch.setattr("scrapy.pqueues.time", lambda: 1000.0)
+        self.queue.crawler.engine = engine = mock.Mock()
+        self.queue.push(Request("https://a.example/0"))
+        self.queue.push(Request("https://a.example/1"))
+        assert self.queue.pop() is not None
+        assert self.queue.pop() is None
+        self.queue._wakeup.cancel()
+        self.queue._wake_up_engine()
+        engine.wake_up.assert_called_once_with()
+        assert self.queue._wakeup is None
+
 
 @pytest.mark.parametrize(
     ("input", "output"),
@@ -0,0 +1,143 @@
+import pytest
+from twisted.internet import defer
+from twisted.internet.error import DNSLookupError
+from twisted.internet.task import deferLater
+from twisted.names import dns, error, server
+from twisted.trial import unittest
+
+from scrapy.resolver import (
+    CachingAsyncResolver,
+    _in_dnscache,
+    _parse_dns_server,
+    dnscache,
+)
+from scrapy.utils.misc import build_from_crawler
+from scrapy.utils.test import get_crawler
+
+
+class StubResolver:
+    """Answers A queries from a ``{name: (address, ttl)}`` dict."""
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    def query(self, query, timeout=None):
+        name = query.name.name.decode()
+        self.queries.append(name)
+        if name not in self.records:
+            return defer.fail(error.DomainError(name))
+        address, ttl = self.records[name]
+        answer = dns.RRHeader(
+            name=query.name.name,
+            type=dns.A,
+            ttl=ttl,
+            payload=dns.Record_A(address, ttl),
+            auth=True,
+        )
+        return defer.succeed(([answer], [], []))
+
+
+@pytest.mark.parametrize(
+    ("server", "expected"),
+    [
+        ("127.0.0.1", ("127.0.0.1", 53)),
+        ("127.0.0.1:5353", ("127.0.0.1", 5353)),
+        ("[::1]:5353", ("::1", 5353)),
+    ],
+)
+def test_parse_dns_server(server, expected):
+    assert _parse_dns_server(server) == expected
+
+
+class TestCachingAsyncResolver(unittest.TestCase):
+    def setUp(self):
+        from twisted.internet import reactor
+
+        self.stub = StubResolver(
+            {
+                "a.example": ("10.0.0.1", 3600),
+                "b.example": ("10.0.0.2", 0),
+                "c.example": ("10.0.0.3", 1),
+            }
+        )
+        factory = server.DNSServerFactory(clients=[self.stub])
+        self.port = reactor.listenUDP(
+            0, dns.DNSDatagramProtocol(factory), interface="127.0.0.1"
+        )
+        crawler = get_crawler(
+            settings_dict={
+                "DNS_SERVERS": [f"127.0.0.1:{self.port.getHost().port}"],
+                "DNS_TIMEOUT": 5,
+                "DNSCACHE_NEGATIVE_TTL": 1,
+            }
+        )
+        self.resolver = build_from_crawler(
+            CachingAsyncResolver, crawler, reactor=reactor
+        )
+
+    def tearDown(self):
+        for name in ("a.example", "b.example", "c.example"):
+            dnscache.pop(name, None)
+        return self.port.stopListening()
+
+    @defer.inlineCallbacks
+    def test_cache(self):
+        address = yield self.resolver.getHostByName("a.example")
+        assert address == "10.0.0.1"
+        address = yield self.resolver.getHostByName("a.example")
+        assert address == "10.0.0.1"
+        assert self.stub.queries == ["a.example"]
+
+    @defer.inlineCallbacks
+    def test_zero_ttl(self):
+        yield self.resolver.getHostByName("b.example")
+        yield self.resolver.getHostByName("b.example")
+        assert self.stub.queries == ["b.example", "b.example"]
+        assert "b.example" not in dnscache
+
+    @defer.inlineCallbacks
+    def test_ttl_expiration(self):
+        from twisted.internet import reactor
+
+        yield self.resolver.getHostByName("c.example")
+        yield self.resolver.getHostByName("c.example")
+        assert self.stub.queries == ["c.example"]
+        assert _in_dnscache("c.example")
+        yield deferLater(reactor, 1.1, lambda: None)
+        # Expired entries are evicted instead of being reported as cached.
+        assert not _in_dnscache("c.example")
+        assert "c.example" not in dnscache
+        self.stub.records["c.example"] = ("10.0.0.4", 1)
+        address = yield self.resolver.getHostByName("c.example")
+        assert address == "10.0.0.4"
+        assert self.stub.queries == ["c.example", "c.example"]
+
+    @defer.inlineCallbacks
+    def test_ip_address(self):
+        for address in ("127.0.0.1", "::1"):
+            result = yield self.resolver.getHostByName(address)
+            assert result == address
+        assert not self.stub.queries
+
+    @defer.inlineCallbacks
+    def test_coalescing(self):
+        addresses = yield defer.gatherResults(
+            [self.resolver.getHostByName("a.example") for _ in range(3)]
+        )
+        assert addresses == ["10.0.0.1"] * 3
+        assert self.stub.queries == ["a.example"]
+
+    @defer.inlineCallbacks
+    def test_negative_cache(self):
+        from twisted.internet import reactor
+
+        for _ in range(2):
+            with pytest.raises(DNSLookupError):
+                yield self.resolver.getHostByName("missing.example")
+        assert self.stub.queries == ["missing.example"]
+        yield deferLater(reactor, 1.1, lambda: None)
+        self.stub.records["missing.example"] = ("10.0.0.5", 0)
+        address = yield self.resolver.getHostByName("missing.example")
+        assert address == "10.0.0.5"
+        assert self.stub.queries == ["missing.example", "missing.example"]
@@ -4,12 +4,14 @@ import shutil
 import tempfile
 from abc import ABC, abstractmethod
 from collections import deque
+from pathlib import Path
 from typing import Any, NamedTuple
 
 import pytest
 from twisted.internet.defer import inlineCallbacks
 from twisted.trial.unittest import TestCase
 
+from scrapy import signals
 from scrapy.core.downloader import Downloader
 from scrapy.core.scheduler import BaseScheduler, Scheduler
 from scrapy.crawler import Crawler
@@ -84,8 +86,9 @@ class MockDownloader:
 
 
 class MockCrawler(Crawler):
-    def __init__(self, priority_queue_cls, jobdir):
+    def __init__(self, priority_queue_cls, jobdir, settings=None):
         settings = {
+            **(settings or {}),
             "SCHEDULER_DEBUG": False,
             "SCHEDULER_DISK_QUEUE": "scrapy.squeues.PickleLifoDiskQueue",
             "SCHEDULER_MEMORY_QUEUE": "scrapy.squeues.LifoMemoryQueue",
@@ -100,6 +103,7 @@ class MockCrawler(Crawler):
 
 class SchedulerHandler(ABC):
     jobdir = None
+    settings: dict[str, Any] = {}
 
     @property
     @abstractmethod
@@ -107,7 +111,9 @@ class SchedulerHandler(ABC):
         raise NotImplementedError
 
     def create_scheduler(self):
-        self.mock_crawler = MockCrawler(self.priority_queue_cls, self.jobdir)
+        self.mock_crawler = MockCrawler(
+            self.priority_queue_cls, self.jobdir, self.settings
+        )
         self.scheduler = Scheduler.from_crawler(self.mock_crawler)
         self.spider = Spider(name="spider")
         self.scheduler.open(self.spider)
@@ -231,6 +237,62 @@ class TestSchedulerOnDisk(TestSchedulerOnDiskBase):
         return "scrapy.pqueues.ScrapyPriorityQueue"
 
 
+class TestSchedulerOnDiskBuffered(TestSchedulerOnDisk):
+    settings = {"SCHEDULER_DISK_QUEUE_BUFFER_SIZE": 2}
+
+
+class TestSchedulerHybrid(TestSchedulerInMemory):
+    settings = {"SCHEDULER_MEMORY_WINDOW_SIZE": 2}
+
+    def test_spill_refill(self):
+        stats = self.mock_crawler.stats
+        spill_dir = self.scheduler.dqdir
+        assert spill_dir is not None
+        for i in range(6):
+            self.scheduler.enqueue_request(Request(f"http://foo.com/{i}"))
+        assert len(self.scheduler.mqs) == 2
+        assert len(self.scheduler.dqs) == 4
+        assert stats.get_value("scheduler/spilled") == 4
+        urls = []
+        while self.scheduler.has_pending_requests():
+            urls.append(self.scheduler.next_request().url)
+            assert len(self.scheduler.mqs) <= 2
+        assert sorted(urls) == [f"http://foo.com/{i}" for i in range(6)]
+        assert stats.get_value("scheduler/refilled") == 4
+        assert stats.get_value("scheduler/dequeued") == 6
+        self.close_scheduler()
+        assert not Path(spill_dir).exists()
+        self.create_scheduler()
+
+
+class TestSchedulerHybridBytes(TestSchedulerInMemory):
+    settings = {
+        "SCHEDULER_MEMORY_WINDOW_SIZE": 100,
+        "SCHEDULER_MEMORY_WINDOW_BYTES": 40,
+    }
+
+    def test_spill_bytes(self):
+        for i in range(4):
+            self.scheduler.enqueue_request(Request(f"http://foo.com/{i}", body="x"))
+        # Each request is estimated at 18 bytes
+        assert len(self.scheduler.mqs) == 3
+        assert len(self.scheduler.dqs) == 1
+
+
+class TestSchedulerHybridOnDisk(TestSchedulerOnDisk):
+    settings = {"SCHEDULER_MEMORY_WINDOW_SIZE": 2}
+
+    def test_close_spills_memory(self):
+        for i in range(3):
+            self.scheduler.enqueue_request(Request(f"http://foo.com/{i}"))
+        assert len(self.scheduler.mqs) == 2
+        self.close_scheduler()
+        assert self.mock_crawler.stats.get_value("scheduler/spilled") == 3
+        self.create_scheduler()
+        assert len(self.scheduler.dqs) == 3
+        assert len(self.scheduler) == 3
+
+
 _URLS_WITH_SLOTS = [
     ("http://foo.com/a", "a"),
     ("http://foo.com/b", "a"),
@@ -321,11 +383,17 @@ class DownloaderAwareSchedulerTestMixin:
             slot = downloader.get_slot_key(request)
             dequeued_slots.append(slot)
             downloader.increment(slot)
+            self.mock_crawler.signals.send_catch_log(
+                signals.request_reached_downloader, request=request, spider=self.spider
+            )
             requests.append(request)
 
         for request in requests:
             slot = downloader.get_slot_key(request)
             downloader.decrement(slot)
+            self.mock_crawler.signals.send_catch_log(
+                signals.request_left_downloader, request=request, spider=self.spider
+            )
 
         assert _is_scheduling_fair([s for u, s in _URLS_WITH_SLOTS], dequeued_slots)
         assert sum(len(s.active) for s in downloader.slots.values()) == 0
@@ -377,10 +445,38 @@ class TestIntegrationWithDownloaderAwareInMemory(TestCase):
             )
 
 
+class TestIntegrationWithDelayAwareInMemory(TestCase):
+    def setUp(self):
+        self.crawler = get_crawler(
+            spidercls=StartUrlsSpider,
+            settings_dict={
+                "SCHEDULER_PRIORITY_QUEUE": "scrapy.pqueues.DelayAwarePriorityQueue",
+                "DUPEFILTER_CLASS": "scrapy.dupefilters.BaseDupeFilter",
+                "DOWNLOAD_DELAY": 0.1,
+                "RANDOMIZE_DOWNLOAD_DELAY": False,
+            },
+        )
+
+    @inlineCallbacks
+    def tearDown(self):
+        yield self.crawler.stop()
+
+    @inlineCallbacks
+    def test_integration_delay_aware_priority_queue(self):
+        with MockServer() as mockserver:
+            url = mockserver.url("/status?n=200", is_secure=False)
+            start_urls = [url] * 6
+            yield self.crawler.crawl(start_urls)
+            assert self.crawler.stats.get_value("downloader/response_count") == len(
+                start_urls
+            )
+            assert self.crawler.stats.get_value("scheduler/dequeued") == len(start_urls)
+
+
 class TestIncompatibility:
-    def _incompatible(self):
+    def _incompatible(self, priority_queue_cls):
         settings = {
-            "SCHEDULER_PRIORITY_QUEUE": "scrapy.pqueues.DownloaderAwarePriorityQueue",
+            "SCHEDULER_PRIORITY_QUEUE": priority_queue_cls,
             "CONCURRENT_REQUESTS_PER_IP": 1,
         }
         crawler = get_crawler(Spider, settings)
@@ -388,8 +484,15 @@ class TestIncompatibility:
         spider = Spider(name="spider")
         scheduler.open(spider)
 
-    def test_incompatibility(self):
+    @pytest.mark.parametrize(
+        "priority_queue_cls",
+        [
+            "scrapy.pqueues.DownloaderAwarePriorityQueue",
+            "scrapy.pqueues.DelayAwarePriorityQueue",
+        ],
+    )
+    def test_incompatibility(self, priority_queue_cls):
         with pytest.raises(
             ValueError, match="does not support CONCURRENT_REQUESTS_PER_IP"
         ):
-            self._incompatible()
+            self._incompatible(priority_queue_cls)
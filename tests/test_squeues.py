@@ -1,5 +1,6 @@
 import pickle
 import sys
+from unittest import mock
 
 import pytest
 from queuelib.tests import test_queue as t
@@ -149,6 +150,109 @@ class ChunkSize4PickleFifoDiskQueueTest(PickleFifoDiskQueueTest):
     chunksize = 4
 
 
+class BufferedPickleFifoDiskQueueTest(PickleFifoDiskQueueTest):
+    def queue(self, **kwargs):
+        return _PickleFifoSerializationDiskQueue(
+            self.qpath, chunksize=self.chunksize, buffer_size=3, **kwargs
+        )
+
+    def test_not_szhdr(self):
+        q = self.queue()
+        q.push(b"something")
+        q.flush()
+        with (
+            self.tempfilename().open("w+", encoding="utf-8") as empty_file,
+            mock.patch.object(q, "tailf", empty_file),
+        ):
+            assert q.peek() is None
+            assert q.pop() is None
+        q.close()
+
+    def test_chunks(self):
+        q = self.queue()
+        for x in range(5):
+            q.push(x)
+        assert len(list(self.qpath.glob("q*"))) == 3 // self.chunksize + 1
+        q.flush()
+        assert len(list(self.qpath.glob("q*"))) == 5 // self.chunksize + 1
+        for _ in range(5):
+            q.pop()
+        assert len(list(self.qpath.glob("q*"))) == 1
+        q.close()
+
+    def test_buffered_order(self):
+        q = self.queue()
+        for i in range(5):
+            q.push(i)
+        # 3 strings were flushed to disk, 2 are buffered
+        assert len(q) == 5
+        assert q.pop() == 0
+        q.push(5)
+        assert [q.pop() for _ in range(6)] == [1, 2, 3, 4, 5, None]
+        q.close()
+
+    def test_buffered_close(self):
+        q = self.queue()
+        q.push("a")
+        q.push("b")
+        q.close()
+        q = self.queue()
+        assert len(q) == 2
+        assert q.pop() == "a"
+        assert q.pop() == "b"
+        q.close()
+
+    def test_buffer_time(self):
+        with (
+            mock.patch("scrapy.squeues.call_later") as call_later,
+            mock.patch("scrapy.squeues.monotonic", return_value=100.0) as monotonic,
+        ):
+            q = self.queue(buffer_time=5)
+            q.push("a")
+            call_later.assert_called_once_with(5, q.flush)
+            assert q._buffer
+            monotonic.return_value = 105.0
+            assert len(q) == 1
+            assert q._buffer
+            q.push("b")
+            assert not q._buffer
+            call_later.return_value.cancel.assert_called_once()
+
+            assert q.pop() == "a"
+            q.push("c")
+            assert call_later.call_count == 2
+            monotonic.return_value = 110.0
+            assert q.pop() == "b"
+            assert not q._buffer
+            assert call_later.return_value.cancel.call_count == 2
+            assert q.pop() == "c"
+            q.close()
+
+    def test_buffer_time_timer(self):
+        q = self.queue(buffer_time=5)
+        with mock.patch("scrapy.squeues.call_later") as call_later:
+            q.push("a")
+            q.push("b")
+        ((delay, flush), _) = call_later.call_args
+        assert delay == 5
+        flush()
+        assert not q._buffer
+        assert len(q) == 2
+        q.close()
+        q = self.queue()
+        assert q.pop() == "a"
+        assert q.pop() == "b"
+        q.close()
+
+
+class ChunkSize1BufferedPickleFifoDiskQueueTest(BufferedPickleFifoDiskQueueTest):
+    chunksize = 1
+
+
+class ChunkSize2BufferedPickleFifoDiskQueueTest(BufferedPickleFifoDiskQueueTest):
+    chunksize = 2
+
+
 class LifoDiskQueueTestMixin:
     def test_serialize(self):
         q = self.queue()
@@ -197,3 +301,29 @@ class PickleLifoDiskQueueTest(t.LifoDiskQueueTest, LifoDiskQueueTestMixin):
         assert isinstance(r2, Request)
         assert r.url == r2.url
         assert r2.meta["request"] is r2
+
+
+class BufferedPickleLifoDiskQueueTest(PickleLifoDiskQueueTest):
+    def queue(self):
+        return _PickleLifoSerializationDiskQueue(self.qpath, buffer_size=3)
+
+    def test_buffered_order(self):
+        q = self.queue()
+        for i in range(5):
+            q.push(i)
+        assert len(q) == 5
+        assert q.pop() == 4
+        q.push(5)
+        assert [q.pop() for _ in range(6)] == [5, 3, 2, 1, 0, None]
+        q.close()
+
+    def test_buffered_close(self):
+        q = self.queue()
+        q.push("a")
+        q.push("b")
+        q.close()
+        q = self.queue()
+        assert len(q) == 2
+        assert q.pop() == "b"
+        assert q.pop() == "a"
+        q.close()
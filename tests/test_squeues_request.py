@@ -7,9 +7,11 @@ from pathlib import Path
 import pytest
 import queuelib
 
-from scrapy.http import Request
+from scrapy.http import FormRequest, Request
 from scrapy.spiders import Spider
 from scrapy.squeues import (
+    BinaryFifoDiskQueue,
+    BinaryLifoDiskQueue,
     FifoMemoryQueue,
     LifoMemoryQueue,
     MarshalFifoDiskQueue,
@@ -206,6 +208,76 @@ class TestMarshalLifoDiskQueueRequest(LifoQueueMixin, TestBaseQueue):
         )
 
 
+class TestBinaryFifoDiskQueueRequest(FifoQueueMixin, TestBaseQueue):
+    def queue(self, base_path):
+        return BinaryFifoDiskQueue.from_crawler(
+            crawler=self.crawler, key=str(base_path / "binary" / "fifo")
+        )
+
+
+class TestBinaryLifoDiskQueueRequest(LifoQueueMixin, TestBaseQueue):
+    def queue(self, base_path):
+        return BinaryLifoDiskQueue.from_crawler(
+            crawler=self.crawler, key=str(base_path / "binary" / "lifo")
+        )
+
+
+class BinarySpider(Spider):
+    name = "binary"
+
+    def parse_item(self, response):
+        pass
+
+    def handle_error(self, failure):
+        pass
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "zstd"])
+def test_binary_disk_queue_roundtrip(compression, tmp_path):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    crawler = get_crawler(
+        BinarySpider, {"SCHEDULER_DISK_QUEUE_COMPRESSION": compression}
+    )
+    crawler.spider = crawler._create_spider()
+    q = BinaryFifoDiskQueue.from_crawler(crawler=crawler, key=str(tmp_path / "q"))
+    requests = [
+        Request("http://www.example.com"),
+        Request(
+            "http://www.example.com/ä?a=1",
+            method="PUT",
+            headers={"Referer": "http://www.example.com", "X-Custom": ["a", "b"]},
+            body=b"x" * 1024,
+            cookies={"session": "1"},
+            meta={"depth": 2, "nested": {"a": [1, 2]}},
+            encoding="latin-1",
+            priority=-7,
+            dont_filter=True,
+            callback=crawler.spider.parse_item,
+            errback=crawler.spider.handle_error,
+            flags=["flag"],
+            cb_kwargs={"key": "value"},
+        ),
+        Request("http://www.example.com", method="PROPFIND", priority=2**40),
+        FormRequest("http://www.example.com", formdata={"a": "b"}),
+    ]
+    for request in requests:
+        q.push(request)
+    for request in requests:
+        dequeued = q.pop()
+        assert type(dequeued) is type(request)
+        for attr in request.attributes:
+            assert getattr(dequeued, attr) == getattr(request, attr)
+    assert q.pop() is None
+    q.close()
+
+
+def test_binary_disk_queue_unsupported_compression(tmp_path):
+    crawler = get_crawler(Spider, {"SCHEDULER_DISK_QUEUE_COMPRESSION": "lzma"})
+    with pytest.raises(ValueError, match="Unsupported disk queue compression"):
+        BinaryFifoDiskQueue.from_crawler(crawler=crawler, key=str(tmp_path / "q"))
+
+
 class TestFifoMemoryQueueRequest(FifoQueueMixin, TestBaseQueue):
     def queue(self, base_path):
         return FifoMemoryQueue.from_crawler(crawler=self.crawler)
@@ -5,6 +5,7 @@ from scrapy.extensions.corestats import CoreStats
 from scrapy.spiders import Spider
 from scrapy.statscollectors import DummyStatsCollector, StatsCollector
 from scrapy.utils.test import get_crawler
+from scrapy.utils.url import cached_canonicalize_url
 
 
 class TestCoreStatsExtension:
@@ -32,8 +33,22 @@ class TestCoreStatsExtension:
             "item_dropped_reasons_count/ZeroDivisionError": 1,
             "finish_reason": "finished",
             "elapsed_time_seconds": 0.0,
+            "canonicalize_url/cache_hits": 0,
+            "canonicalize_url/cache_misses": 0,
         }
 
+    def test_core_stats_canonicalize_url_cache(self):
+        self.crawler.stats = StatsCollector(self.crawler)
+        ext = CoreStats.from_crawler(self.crawler)
+        cached_canonicalize_url("http://example.com/?b=1&a=2")
+        ext.spider_opened(self.spider)
+        cached_canonicalize_url("http://example.com/?b=1&a=2")
+        cached_canonicalize_url("http://example.com/?b=1&a=2")
+        cached_canonicalize_url("http://example.com/?b=1&a=3")
+        ext.spider_closed(self.spider, "finished")
+        assert ext.stats.get_value("canonicalize_url/cache_hits") == 2
+        assert ext.stats.get_value("canonicalize_url/cache_misses") == 1
+
     def test_core_stats_dummy_stats_collector(self):
         self.crawler.stats = DummyStatsCollector(self.crawler)
         ext = CoreStats.from_crawler(self.crawler)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import warnings
+from functools import partial
 from hashlib import sha1
 from weakref import WeakKeyDictionary
 
@@ -11,11 +12,14 @@ from scrapy.exceptions import ScrapyDeprecationWarning
 from scrapy.http import Request
 from scrapy.utils.python import to_bytes
 from scrapy.utils.request import (
+    StreamRequestFingerprinter,
     _fingerprint_cache,
+    _stream_fingerprint_cache,
     fingerprint,
     request_authenticate,
     request_httprepr,
     request_to_curl,
+    stream_fingerprint,
 )
 from scrapy.utils.test import get_crawler
 
@@ -63,8 +67,11 @@ class TestFingerprint:
     cache: (
         WeakKeyDictionary[Request, dict[tuple[tuple[bytes, ...] | None, bool], bytes]]
         | WeakKeyDictionary[Request, dict[tuple[tuple[bytes, ...] | None, bool], str]]
+        | WeakKeyDictionary[
+            Request, dict[tuple[tuple[bytes, ...] | None, bool, str], bytes]
+        ]
     ) = _fingerprint_cache
-    default_cache_key = (None, False)
+    default_cache_key: tuple[None, bool] | tuple[None, bool, str] = (None, False)
     known_hashes: tuple[tuple[Request, bytes | str, dict], ...] = (
         (
             Request("http://example.org"),
@@ -229,6 +236,181 @@ class TestFingerprint:
         assert actual == expected
 
 
+class TestStreamFingerprint(TestFingerprint):
+    function: staticmethod = staticmethod(stream_fingerprint)
+    cache = _stream_fingerprint_cache
+    default_cache_key = (None, False, "sha1")
+    known_hashes = (
+        (
+            Request("http://example.org"),
+            b"\xa8G&\xd7\xb0\xd9\x92\xb6\xe4{\xec\xba\x10\xbd0\xd3)@\xc37",
+            {},
+        ),
+        (
+            Request("https://example.org"),
+            b"h\xddY\xa5;\xa6\x9d\xd65\xff\x96|y`b\x9a\x9b\x9d\x83a",
+            {},
+        ),
+        (
+            Request("https://example.org?a"),
+            b"\x8e\xf1Qv\x8dN\x13\x1cL\x07\xf4JsYH\xe7\xbe \x00\xa4",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b"),
+            b"\xc7\xc1\xd6\xde\x96\xf0\x91\x14\x08\xf8\xf0\xcc\xab\xa0\xc2\x0e\x7f\xb2\x82@",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b&a"),
+            b"\x1c\xaeq&qg\xc4\x9a\x19;1\xfe\x0c\xf3\x99\xb9\xd0\xca\xc5\xda",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b&a=c"),
+            b"\xd5\xfb\xb6\xee#\xc1D\xef\xa7 \x12\xc6B\xd9\xed\xbeM\xde(\x19",
+            {},
+        ),
+        (
+            Request("https://example.org", method="POST"),
+            b"e\xffQ\xea\xe3\xdb\x0f\x98\xd1g\xca4\xa1\x81M\xc8\xdd\xabb\xa6",
+            {},
+        ),
+        (
+            Request("https://example.org", body=b"a"),
+            b"\x95\x01=r\xc5\xc6k\xd1\xb5\x12S/|\xad\x1d\x0e\xde\xe3\xc9\x04",
+            {},
+        ),
+        (
+            Request("https://example.org", method="POST", body=b"a"),
+            b"a[1\xe5\x17\x1f\xb3\xdb\xa4\x19\xe3\xae\x91M:\x89\x91\x86\xe0\xbc",
+            {},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"h\xddY\xa5;\xa6\x9d\xd65\xff\x96|y`b\x9a\x9b\x9d\x83a",
+            {},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b":\xe5&\xca\xaf\x93-\xbd\xd9~K\xd0\x9c\xe1kp\x1c\xef\xf56",
+            {"include_headers": ["A"]},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"\xeb\xae\x04\xcc\x95e\xb9\xd7\xbe\x9eg\x1bo\x18\xf9\x95\x18\x99\x8b\x1c",
+            {"keep_fragments": True},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"d\x8d\x83\xb9\x7fE\x91<\xd6X'\xaeT\xac\\ANv\x1dq",
+            {"include_headers": ["A"], "keep_fragments": True},
+        ),
+        (
+            Request("https://example.org/ab"),
+            b"\x9f^\xcf\x85\xaa\x9fV\xd2\x9d\x10\x13\x19\xf0fz\x9b\xbfM<\x95",
+            {},
+        ),
+        (
+            Request("https://example.org/a", body=b"b"),
+            b"\xf9\xdc\xb2)\xb5m\xab\xc3\xd6@v\xcf\xc1e\xccc\x14\xb7\t\x1f",
+            {},
+        ),
+    )
+
+    def test_algorithm(self):
+        r1 = Request("http://www.example.com")
+        fp1 = stream_fingerprint(r1, algorithm="blake2b")
+        assert len(fp1) == 20
+        assert fp1 != stream_fingerprint(r1)
+        with pytest.raises(ValueError, match="Unsupported fingerprint algorithm"):
+            stream_fingerprint(r1, algorithm="md5")
+
+
+class TestStreamFingerprintBlake2b(TestStreamFingerprint):
+    function: staticmethod = staticmethod(
+        partial(stream_fingerprint, algorithm="blake2b")
+    )
+    default_cache_key = (None, False, "blake2b")
+    known_hashes = (
+        (
+            Request("http://example.org"),
+            b"WD\xe6&,z\xf5\x9e\x86\xf8\xc1R\x07e\xec\x15\x10\xd8 \xb5",
+            {},
+        ),
+        (
+            Request("https://example.org"),
+            b"\xc4\x19\xdb\xea\xc4lg\x0c)\x16\xdd\xfd\x07\xba\xba\xa1\xc2\xb4\x16%",
+            {},
+        ),
+        (
+            Request("https://example.org?a"),
+            b"|\xd5\xda\x07\xc1\x9e\x81\xa1#\xab\xa2\xdc\xdf\xc6\x1b\xfbu\xcc/\xa8",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b"),
+            b"v\xce\xba!\xcc\x1a\xe0\x1a\x97\x13\xe7)gz\x7f\xa3@XJ\xc5",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b&a"),
+            b"\xf0\xc6\x7f\xb3\xa6o\x1e\xb1\x08\xf7\x1e/\x02\xfc\xc9\x036\xc2\xa4\n",
+            {},
+        ),
+        (
+            Request("https://example.org?a=b&a=c"),
+            b"\xeb*)\xc8\xf1G\x9aQ\xe4\xcb\xd0;h\xec>&\x8e\xea!\xdf",
+            {},
+        ),
+        (
+            Request("https://example.org", method="POST"),
+            b"?v\xfe\xbf\x8a\xdd\xa5\xc6\x17\xe9\xd5nH\x1a\xfa\xb6\n\xe0t&",
+            {},
+        ),
+        (
+            Request("https://example.org", body=b"a"),
+            b"\x88\xb4\xbd?1\x02\x8c\x01$'\xe7\x7f9\xb5\xf8\xbd\xb6/@\xf0",
+            {},
+        ),
+        (
+            Request("https://example.org", method="POST", body=b"a"),
+            b"\xb0W\xdcr\x8e\xb70Xpf\x8e<\x15b:\xd4\xecZ\xe6-",
+            {},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"\xc4\x19\xdb\xea\xc4lg\x0c)\x16\xdd\xfd\x07\xba\xba\xa1\xc2\xb4\x16%",
+            {},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"\xc40\xc8\\P\x9b\xbb\t\xd0s\x15\xb3\xba\xd2\x80\x83\x99\xbb\x8f\x80",
+            {"include_headers": ["A"]},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"n\xc1\x95\xe6?g\x17Fo\xa2\xdb\xf8\xfc/\xd8\xce\x9e\x150I",
+            {"keep_fragments": True},
+        ),
+        (
+            Request("https://example.org#a", headers={"A": b"B"}),
+            b"\xff\x05\xd3w\x9bO\\\xd4mNc\xdd\x8b\xe8\r\x88\xa4\xa0\x03Y",
+            {"include_headers": ["A"], "keep_fragments": True},
+        ),
+        (
+            Request("https://example.org/ab"),
+            b"\xd8\x1a\xcd\x84\xb8\xeaB\xd5jb\x1e\rG\n\xa2\xf7.\x876\x85",
+            {},
+        ),
+        (
+            Request("https://example.org/a", body=b"b"),
+            b"'\xb5\xea\x8f\x9c\x99\x05l\xca\xc9t\xbcVz\x88%\xf8H\xfa^",
+            {},
+        ),
+    )
+
+
 REQUEST_OBJECTS_TO_TEST = (
     Request("http://www.example.com/"),
     Request("http://www.example.com/query?id=111&cat=222"),
@@ -279,6 +461,24 @@ class TestRequestFingerprinter:
         assert logged_warnings
 
 
+class TestStreamRequestFingerprinter:
+    @pytest.mark.parametrize("algorithm", ["sha1", "blake2b"])
+    def test_algorithm(self, algorithm):
+        settings = {
+            "REQUEST_FINGERPRINTER_CLASS": StreamRequestFingerprinter,
+            "REQUEST_FINGERPRINTER_ALGORITHM": algorithm,
+        }
+        crawler = get_crawler(settings_dict=settings)
+        request = Request("https://example.com")
+        assert crawler.request_fingerprinter.fingerprint(request) == stream_fingerprint(
+            request, algorithm=algorithm
+        )
+
+    def test_invalid_algorithm(self):
+        with pytest.raises(ValueError, match="REQUEST_FINGERPRINTER_ALGORITHM"):
+            StreamRequestFingerprinter("md5")
+
+
 class TestCustomRequestFingerprinter:
     def test_include_headers(self):
         class RequestFingerprinter:
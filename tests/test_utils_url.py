@@ -1,6 +1,8 @@
 import warnings
+from urllib.parse import urlparse
 
 import pytest
+from w3lib.url import canonicalize_url
 
 from scrapy.linkextractors import IGNORED_EXTENSIONS
 from scrapy.spiders import Spider
@@ -9,7 +11,10 @@ from scrapy.utils.url import (  # type: ignore[attr-defined]
     _is_filesystem_path,
     _public_w3lib_objects,
     add_http_if_no_scheme,
+    cached_canonicalize_url,
+    canonicalize_url_cache_info,
     guess_scheme,
+    set_canonicalize_url_cache_size,
     strip_url,
     url_has_any_extension,
     url_is_from_any_domain,
@@ -541,6 +546,47 @@ class TestIsPath:
             assert _is_filesystem_path(input_value) == output_value, input_value
 
 
+class TestCachedCanonicalizeUrl:
+    def setup_method(self):
+        set_canonicalize_url_cache_size(0)
+        set_canonicalize_url_cache_size(2)
+
+    def teardown_method(self):
+        set_canonicalize_url_cache_size(10_000)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://www.example.com/do?b=2&a=1#frag",
+            urlparse("http://www.example.com/do?b=2&a=1#frag"),
+        ],
+    )
+    @pytest.mark.parametrize("keep_fragments", [False, True])
+    def test_result(self, url, keep_fragments):
+        expected = canonicalize_url(url, keep_fragments=keep_fragments)
+        assert cached_canonicalize_url(url, keep_fragments) == expected
+        assert cached_canonicalize_url(url, keep_fragments) == expected
+
+    def test_cache(self):
+        url = "http://www.example.com/do?b=2&a=1#frag"
+        cached_canonicalize_url(url)
+        cached_canonicalize_url(url)
+        cached_canonicalize_url(url, keep_fragments=True)
+        info = canonicalize_url_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+        cached_canonicalize_url("http://www.example.com/")
+        cached_canonicalize_url(url)
+        info = canonicalize_url_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+    def test_size(self):
+        set_canonicalize_url_cache_size(0)
+        cached_canonicalize_url("http://www.example.com/")
+        cached_canonicalize_url("http://www.example.com/")
+        info = canonicalize_url_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (0, 2, 0)
+
+
 @pytest.mark.parametrize(
     "obj_name",
     [